@@ -6,7 +6,7 @@ from app.core.config import settings
 from app.db.base import Base
 
 # Import models so metadata is registered
-from app.models import user, team, equipment, request  # noqa: F401
+from app.models import user, team, team_member, equipment, request, tombstone  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,36 @@
+"""keyset pagination indexes
+
+Revision ID: 0002_keyset_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "0002_keyset_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs used as keyset sort keys; "id" is the tie-breaker.
+KEYSET_INDEXES = [
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("teams", "created_at"),
+    ("teams", "updated_at"),
+    ("equipment", "created_at"),
+    ("equipment", "updated_at"),
+    ("maintenance_requests", "created_at"),
+    ("maintenance_requests", "updated_at"),
+]
+
+
+def upgrade() -> None:
+    for table, column in KEYSET_INDEXES:
+        op.create_index(f"ix_{table}_{column}_id", table, [column, "id"], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in reversed(KEYSET_INDEXES):
+        op.drop_index(f"ix_{table}_{column}_id", table_name=table)
@@ -0,0 +1,60 @@
+"""trigram and full-text search indexes
+
+Revision ID: 0003_search_indexes
+Revises: 0002_keyset_indexes
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+revision = "0003_search_indexes"
+down_revision = "0002_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+# GIN trigram indexes serve both `ILIKE '%x%'` and the `%` similarity operator.
+TRGM_INDEXES = [
+    ("equipment", "name"),
+    ("equipment", "serial_number"),
+    ("equipment", "owner_employee_name"),
+    ("maintenance_requests", "subject"),
+    ("maintenance_requests", "description"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, column in TRGM_INDEXES:
+        op.create_index(
+            f"ix_{table}_{column}_trgm",
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+    op.execute(
+        """
+        ALTER TABLE maintenance_requests
+        ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(subject, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_maintenance_requests_search_vector",
+        "maintenance_requests",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_maintenance_requests_search_vector", table_name="maintenance_requests")
+    op.drop_column("maintenance_requests", "search_vector")
+
+    for table, column in reversed(TRGM_INDEXES):
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
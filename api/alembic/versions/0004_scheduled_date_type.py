@@ -0,0 +1,80 @@
+"""scheduled_date as DATE with team/date index
+
+Revision ID: 0004_scheduled_date_type
+Revises: 0003_search_indexes
+Create Date: 2026-10-18
+
+"""
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_scheduled_date_type"
+down_revision = "0003_search_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+requests = sa.table(
+    "maintenance_requests",
+    sa.column("id", sa.String),
+    sa.column("scheduled_date", sa.String),
+    sa.column("scheduled_on", sa.Date),
+)
+
+
+def _parse(value: str | None) -> date | None:
+    # Stored values are ISO dates, sometimes with a time part; anything unparsable becomes NULL.
+    try:
+        return date.fromisoformat(value.strip()[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def upgrade() -> None:
+    op.add_column("maintenance_requests", sa.Column("scheduled_on", sa.Date(), nullable=True))
+
+    # Backfill in keyset-ordered batches so large tables are never loaded at once.
+    bind = op.get_bind()
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(requests.c.id, requests.c.scheduled_date)
+            .where(requests.c.id > last_id, requests.c.scheduled_date.isnot(None))
+            .order_by(requests.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = [{"b_id": r.id, "b_on": d} for r in rows if (d := _parse(r.scheduled_date)) is not None]
+        if updates:
+            bind.execute(
+                requests.update()
+                .where(requests.c.id == sa.bindparam("b_id"))
+                .values(scheduled_on=sa.bindparam("b_on")),
+                updates,
+            )
+
+    op.drop_column("maintenance_requests", "scheduled_date")
+    op.alter_column("maintenance_requests", "scheduled_on", new_column_name="scheduled_date")
+    op.create_index(
+        "ix_maintenance_requests_team_scheduled_date",
+        "maintenance_requests",
+        ["maintenance_team_id", "scheduled_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_maintenance_requests_team_scheduled_date", table_name="maintenance_requests")
+    op.alter_column(
+        "maintenance_requests",
+        "scheduled_date",
+        type_=sa.String(length=20),
+        postgresql_using="to_char(scheduled_date, 'YYYY-MM-DD')",
+    )
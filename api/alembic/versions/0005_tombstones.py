@@ -0,0 +1,32 @@
+"""tombstones for delta sync
+
+Revision ID: 0005_tombstones
+Revises: 0004_scheduled_date_type
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_tombstones"
+down_revision = "0004_scheduled_date_type"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("entity", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.String(length=36), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_tombstones_deleted_at_id", "tombstones", ["deleted_at", "id"], unique=False)
+    # The (updated_at, id) indexes the sync scans rely on already exist (0002_keyset_indexes).
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstones_deleted_at_id", table_name="tombstones")
+    op.drop_table("tombstones")
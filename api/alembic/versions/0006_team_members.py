@@ -0,0 +1,46 @@
+"""team_members join table and technician queue index
+
+Revision ID: 0006_team_members
+Revises: 0005_tombstones
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_team_members"
+down_revision = "0005_tombstones"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "team_members",
+        sa.Column("team_id", sa.String(length=36), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), primary_key=True),
+    )
+    op.create_index("ix_team_members_user_id_team_id", "team_members", ["user_id", "team_id"], unique=False)
+
+    # Backfill from the JSONB arrays; crud.team keeps both in step from here on.
+    op.execute(
+        """
+        INSERT INTO team_members (team_id, user_id)
+        SELECT DISTINCT t.id, m.user_id
+        FROM teams t CROSS JOIN LATERAL jsonb_array_elements_text(t.member_ids) AS m(user_id)
+        """
+    )
+
+    op.create_index(
+        "ix_maintenance_requests_assigned_to_stage",
+        "maintenance_requests",
+        ["assigned_to_id", "stage"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_maintenance_requests_assigned_to_stage", table_name="maintenance_requests")
+    op.drop_index("ix_team_members_user_id_team_id", table_name="team_members")
+    op.drop_table("team_members")
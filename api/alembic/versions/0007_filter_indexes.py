@@ -0,0 +1,52 @@
+"""composite and partial indexes for the list filters, built concurrently
+
+Revision ID: 0007_filter_indexes
+Revises: 0006_team_members
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_filter_indexes"
+down_revision = "0006_team_members"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial-index predicate). Filters are equality-matched first, then the
+# (sort column, id) keyset order, so a filtered page is one index range scan.
+INDEXES = [
+    ("ix_maintenance_requests_equipment_updated_at", "maintenance_requests", ["equipment_id", "updated_at", "id"], None),
+    ("ix_maintenance_requests_team_updated_at", "maintenance_requests", ["maintenance_team_id", "updated_at", "id"], None),
+    ("ix_maintenance_requests_stage_updated_at", "maintenance_requests", ["stage", "updated_at", "id"], None),
+    ("ix_maintenance_requests_type_updated_at", "maintenance_requests", ["type", "updated_at", "id"], None),
+    # The calendar without teamId; with it, 0004's (maintenance_team_id, scheduled_date) serves.
+    ("ix_maintenance_requests_scheduled_date", "maintenance_requests", ["scheduled_date", "id"], None),
+    ("ix_equipment_category_created_at", "equipment", ["category", "created_at", "id"], None),
+    ("ix_equipment_department_created_at", "equipment", ["department", "created_at", "id"], None),
+    ("ix_equipment_active_created_at", "equipment", ["created_at", "id"], "is_scrapped = false"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; building this way does not block writes,
+    # so the migration can be applied to a live database. A build that fails part-way leaves an
+    # INVALID index behind which IF NOT EXISTS would then skip: drop it before re-running.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -1,17 +1,31 @@
-from fastapi import Depends, HTTPException, status
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt, JWTError
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import SessionLocal
-from app.crud.user import get as get_user
+from app.core.security import token_subject
+from app.db.replicas import PIN_COOKIE, PIN_HEADER, pinned
+from app.db.session import AsyncSessionLocal, SessionLocal, replicas, run_db
+from app.crud.user import claims_trusted, from_snapshot, get as get_user, principal_cache, snapshot
 from app.models.user import User
 
 security = HTTPBearer(auto_error=False)
 
 
-def get_db():
+def _read_replica(request: Request):
+    if not replicas:
+        return None
+    token = request.headers.get(PIN_HEADER) or request.cookies.get(PIN_COOKIE)
+    if token and pinned(token_subject(request.headers.get("authorization", "")) or "", token):
+        replicas.pinned_reads += 1
+        return None
+    return replicas.choose()
+
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -19,14 +33,86 @@ def get_db():
         db.close()
 
 
-def get_current_user(
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_sync_read_db(request: Request):
+    replica = _read_replica(request)
+    db = replica.sessionmaker() if replica else SessionLocal()
+    if replica is not None:
+        try:
+            db.connection()  # check out now, so a dead replica fails over to the primary here
+        except DBAPIError as e:
+            db.close()
+            replicas.mark_down(replica, type(e).__name__)
+            replica, db = None, SessionLocal()
+    db.info["replica"] = replica
+    try:
+        yield db
+    except DBAPIError as e:
+        if replica is not None and e.connection_invalidated:
+            replicas.mark_down(replica, type(e).__name__)
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    replica = _read_replica(request)
+    db = replica.async_sessionmaker() if replica else AsyncSessionLocal()
+    if replica is not None:
+        try:
+            await db.connection()  # check out now, so a dead replica fails over to the primary here
+        except DBAPIError as e:
+            await db.close()
+            replicas.mark_down(replica, type(e).__name__)
+            replica, db = None, AsyncSessionLocal()
+    db.info["replica"] = replica
+    try:
+        yield db
+    except DBAPIError as e:
+        if replica is not None and e.connection_invalidated:
+            replicas.mark_down(replica, type(e).__name__)
+        raise
+    finally:
+        await db.close()
+
+
+# Routes take whichever session the configured mode provides and call CRUD through run_db.
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+# Read-only GET routes: a healthy replica when DATABASE_REPLICA_URLS is set, else the primary.
+# Never use it for a route that writes.
+get_read_db = get_async_read_db if settings.DB_ASYNC else get_sync_read_db
+
+
+@asynccontextmanager
+async def db_session():
+    """A short-lived session outside dependency injection (e.g. for long-lived streams)."""
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def get_current_user(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
 ) -> User:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return await user_from_token(db, credentials.credentials)
+
+
+async def user_from_token(db: Session, token: str) -> User:
+    from jose import JWTError, jwt  # deferred to the first request (see app.core.startup)
 
-    token = credentials.credentials
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         sub = payload.get("sub")
@@ -35,14 +121,31 @@ def get_current_user(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = get_user(db, sub)
+    cached = principal_cache.get(sub)
+    if cached is not None:
+        return from_snapshot(cached)
+
+    # Captured before the trust check and the lookup: an update or delete committed meanwhile
+    # bumps the generation, so the principal built here is not cached over it.
+    generation = principal_cache.generation
+    if (
+        settings.AUTH_TRUST_TOKEN_CLAIMS
+        and all(payload.get(k) for k in ("role", "name", "email"))
+        and await claims_trusted(db, sub)
+    ):
+        principal = {"id": sub, "name": payload["name"], "email": payload["email"], "role": payload["role"]}
+        principal_cache.set(sub, principal, generation=generation)
+        return from_snapshot(principal)
+
+    user = await run_db(db, get_user, sub)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal_cache.set(sub, snapshot(user), generation=generation)
     return user
 
 
 def require_roles(*roles: str):
-    def _checker(user: User = Depends(get_current_user)) -> User:
+    async def _checker(user: User = Depends(get_current_user)) -> User:
         if user.role.value not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return user
@@ -0,0 +1,52 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.crud import expand as crud_expand
+from app.db.session import run_db
+from app.schemas.equipment import EquipmentOut
+from app.schemas.request import RequestOut
+from app.schemas.team import TeamOut
+from app.schemas.user import UserOut
+from app.utils.serialization import Expanded
+
+# Embedded representation of each relation name.
+SCHEMAS = {
+    "team": TeamOut,
+    "technician": UserOut,
+    "assignee": UserOut,
+    "requests": RequestOut,
+    "equipment": EquipmentOut,
+}
+
+EXPAND_HELP = {
+    "equipment": f"Comma-separated relations to embed: team,technician,requests (the {crud_expand.MANY_LIMIT} most recent)",
+    "requests": "Comma-separated relations to embed: team,assignee,equipment",
+}
+
+
+def parse_expand(kind: str, expand: str | None) -> tuple[str, ...]:
+    try:
+        return crud_expand.parse_expand(kind, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def require_page(kind: str, relations: tuple[str, ...], paged: bool) -> None:
+    """One-to-many expansions multiply the rows loaded, so they are refused on unpaged lists."""
+    many = [n for n in relations if crud_expand.RELATIONS[kind][n].many]
+    if many and not paged:
+        raise HTTPException(status_code=400, detail=f"expand={','.join(many)} on a list needs limit or cursor")
+
+
+def with_keys(kind: str, columns: tuple[str, ...], relations: tuple[str, ...]) -> tuple[str, ...]:
+    """`columns` plus the foreign keys `relations` are resolved through."""
+    return tuple(dict.fromkeys((*columns, *crud_expand.key_columns(kind, relations))))
+
+
+async def resolve(db: Session, kind: str, rows: list, relations: tuple[str, ...]) -> Expanded | None:
+    """Load every relation for the whole page of `rows` (one query per relation)."""
+    if not relations:
+        return None
+    loaded = await run_db(db, crud_expand.load, kind, rows, relations)
+    spec = crud_expand.RELATIONS[kind]
+    return {n: (spec[n].key, SCHEMAS[n], loaded[n], spec[n].many) for n in relations}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import FastAPI
 
 from app.api.v1.auth import router as auth_router
 from app.api.v1.users import router as users_router
@@ -6,11 +6,28 @@ from app.api.v1.teams import router as teams_router
 from app.api.v1.equipment import router as equipment_router
 from app.api.v1.requests import router as requests_router
 from app.api.v1.public import router as public_router
+from app.api.v1.reports import router as reports_router
+from app.api.v1.sync import router as sync_router
+from app.api.v1.events import router as events_router
+from app.api.v1.me import router as me_router
 
-api_router = APIRouter()
-api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
-api_router.include_router(users_router, prefix="/users", tags=["users"])
-api_router.include_router(teams_router, prefix="/teams", tags=["teams"])
-api_router.include_router(equipment_router, prefix="/equipment", tags=["equipment"])
-api_router.include_router(requests_router, prefix="/requests", tags=["requests"])
-api_router.include_router(public_router, prefix="/public", tags=["public"])
+# (router, path prefix, tag) for every v1 router, in the order they are matched.
+ROUTERS = [
+    (auth_router, "/auth", "auth"),
+    (users_router, "/users", "users"),
+    (teams_router, "/teams", "teams"),
+    (equipment_router, "/equipment", "equipment"),
+    (requests_router, "/requests", "requests"),
+    (public_router, "/public", "public"),
+    (reports_router, "/reports", "reports"),
+    (sync_router, "/sync", "sync"),
+    (events_router, "/events", "events"),
+    (me_router, "/me", "me"),
+]
+
+
+def include_routers(app: FastAPI, prefix: str) -> None:
+    # Straight onto the app: include_router rebuilds every route it copies, so nesting the
+    # routers in an intermediate APIRouter would analyse each endpoint once more at startup.
+    for router, path, tag in ROUTERS:
+        app.include_router(router, prefix=prefix + path, tags=[tag])
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
-from app.core.security import create_access_token
-from app.crud.user import authenticate
+from app.api.deps import get_db, get_current_user, require_roles
+from app.core import reference_cache
+from app.core.security import PasswordHashBusy, create_access_token
+from app.crud.user import authenticate_async, principal_cache
 from app.schemas.auth import LoginIn, TokenOut
 from app.schemas.user import UserOut
 from app.models.user import User
@@ -12,14 +13,30 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=TokenOut)
-def login(payload: LoginIn, db: Session = Depends(get_db)):
-    user = authenticate(db, payload.email, payload.password)
+async def login(payload: LoginIn, db: Session = Depends(get_db)):
+    try:
+        user = await authenticate_async(db, payload.email, payload.password)
+    except PasswordHashBusy:
+        raise HTTPException(status_code=503, detail="Login is busy, please retry", headers={"Retry-After": "1"})
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
-    token = create_access_token(subject=user.id)
+    token = create_access_token(
+        subject=user.id,
+        extra={"role": user.role.value, "name": user.name, "email": user.email},
+    )
     return TokenOut(access_token=token, user=UserOut.model_validate(user))
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: User = Depends(get_current_user)):
     return UserOut.model_validate(current_user)
+
+
+@router.get("/principal-cache")
+async def principal_cache_stats(_: User = Depends(require_roles("admin"))):
+    return principal_cache.stats()
+
+
+@router.get("/reference-cache")
+async def reference_cache_stats(_: User = Depends(require_roles("admin"))):
+    return reference_cache.stats()
@@ -1,92 +1,258 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user, require_roles
+from app.api.deps import get_db, get_read_db, get_current_user, require_roles
+from app.api.expand import EXPAND_HELP, parse_expand, require_page, resolve, with_keys
+from app.db.session import read_sessionmaker, run_db
 from app.crud import equipment as crud_equipment
-from app.schemas.equipment import EquipmentOut, EquipmentCreate, EquipmentUpdate
+from app.schemas.common import ImportResult, Page, SearchHit
+from app.schemas.equipment import EquipmentBatchUpdate, EquipmentOut, EquipmentCreate, EquipmentUpdate, LabelSheetIn
 from app.models.user import User
+from app.utils.bulk_import import detect_format, records, run_import
+from app.utils.http import conditional, list_etag, make_etag, page_etag, stamped
+from app.utils.labels import stream_pdf, stream_zip
+from app.utils.pagination import SORT_PATTERN
+from app.utils.serialization import FIELDS_HELP, dump_rows, json_response, list_response, page_response, parse_fields
+from app.utils.streaming import MEDIA_TYPES, STREAM_PATTERN, encode_rows, streamed
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[EquipmentOut])
-def equipment_list(
-    db: Session = Depends(get_db),
+@router.get("", response_model=list[EquipmentOut] | Page[EquipmentOut])
+async def equipment_list(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_user),
     search: str | None = Query(default=None),
     category: str | None = Query(default=None),
     department: str | None = Query(default=None),
     status: str | None = Query(default="all"),  # active|scrapped|all
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    sort: str = Query(default="-created_at", pattern=SORT_PATTERN),
+    stream: str | None = Query(default=None, pattern=STREAM_PATTERN),
+    fields: str | None = Query(default=None, description=FIELDS_HELP),
+    expand: str | None = Query(default=None, description=EXPAND_HELP["equipment"]),
 ):
-    eqs = crud_equipment.list_equipment(db, search=search, category=category, department=department, status=status)
-    return [EquipmentOut.model_validate(e) for e in eqs]
+    filters = dict(search=search, category=category, department=department, status=status)
+    try:
+        columns = parse_fields(fields, EquipmentOut)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    relations = parse_expand("equipment", expand)
+
+    # Export mode: every matching row, streamed from a server-side cursor.
+    if stream:
+        if fields or expand:
+            raise HTTPException(status_code=400, detail="fields and expand cannot be combined with stream")
+        rows = streamed(crud_equipment.iter_equipment, sort=sort, **filters, session_factory=read_sessionmaker(db))
+        headers = dict(response.headers)
+        if stream == "csv":
+            headers["Content-Disposition"] = f'attachment; filename="equipment.{stream}"'
+        return StreamingResponse(encode_rows(rows, EquipmentOut, stream), media_type=MEDIA_TYPES[stream], headers=headers)
+
+    # Cursor mode is opt-in; without limit/cursor the full list is returned as before.
+    if limit is None and cursor is None:
+        require_page("equipment", relations, paged=False)
+        # Embedded rows change independently of the listed ones, so expanded lists carry no validators.
+        # Pages and exports skip the count: it would aggregate the whole filtered set on every call.
+        if not relations:
+            count, last_modified = await run_db(db, crud_equipment.list_stamp, **filters)
+            not_modified = conditional(request, response, list_etag(request, count, last_modified), last_modified)
+            if not_modified:
+                return not_modified
+        eqs = await run_db(db, crud_equipment.list_equipment, columns=with_keys("equipment", columns, relations), **filters)
+        return list_response(eqs, EquipmentOut, response, columns, await resolve(db, "equipment", eqs, relations))
+
+    try:
+        eqs, next_cursor = await run_db(
+            db,
+            crud_equipment.page_equipment,
+            limit=limit or 50,
+            cursor=cursor,
+            sort=sort,
+            columns=stamped(with_keys("equipment", columns, relations)),
+            **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not relations:
+        not_modified = conditional(request, response, page_etag(request, eqs, next_cursor), None)
+        if not_modified:
+            return not_modified
+    return page_response(eqs, EquipmentOut, next_cursor, response, columns, await resolve(db, "equipment", eqs, relations))
+
+
+@router.get("/search", response_model=list[SearchHit[EquipmentOut]])
+async def equipment_search(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    search: str = Query(min_length=1),
+    category: str | None = Query(default=None),
+    department: str | None = Query(default=None),
+    status: str | None = Query(default="all"),  # active|scrapped|all
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    hits = await run_db(
+        db, crud_equipment.search_equipment, search, limit=limit, category=category, department=department, status=status
+    )
+    return [
+        SearchHit[EquipmentOut](item=EquipmentOut.model_validate(e), score=score, snippet=snippet)
+        for e, score, snippet in hits
+    ]
 
 
 @router.post("", response_model=EquipmentOut)
-def equipment_create(
+async def equipment_create(
     payload: EquipmentCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    eq = crud_equipment.create(db, payload.model_dump(by_alias=False))
+    eq = await run_db(db, crud_equipment.create, payload.model_dump(by_alias=False))
     return EquipmentOut.model_validate(eq)
 
 
+@router.post("/import", response_model=ImportResult)
+async def equipment_import(
+    request: Request,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin", "manager")),
+    format: str | None = Query(default=None, pattern="^(csv|ndjson)$"),
+    dry_run: bool = Query(default=False, alias="dryRun"),
+):
+    """Stream a CSV (header row of field names) or NDJSON body into equipment."""
+    fmt = detect_format(format, request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=csv|ndjson")
+
+    async def insert(rows: list[dict]) -> None:
+        await run_db(db, crud_equipment.bulk_create, rows)
+
+    result = await run_import(records(request.stream(), fmt), EquipmentCreate, insert, dry_run=dry_run)
+    return ImportResult(**result)
+
+
+@router.patch("/batch", response_model=list[EquipmentOut])
+async def equipment_batch_update(
+    payload: EquipmentBatchUpdate,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin", "manager")),
+):
+    """Reassign many equipment rows to a team and/or default technician atomically."""
+    data = payload.model_dump(exclude_unset=True, exclude={"ids"}, by_alias=False)
+    if not data:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    if any(v is None for v in data.values()):
+        raise HTTPException(status_code=400, detail="maintenanceTeamId/defaultTechnicianId cannot be null")
+
+    items, missing = await run_db(db, crud_equipment.batch_update, payload.ids, data)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Equipment not found: {', '.join(missing)}")
+    return [EquipmentOut.model_validate(e) for e in items]
+
+@router.post("/labels")
+async def equipment_labels(
+    payload: LabelSheetIn,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin", "manager")),
+):
+    rows = await run_db(
+        db,
+        crud_equipment.label_rows,
+        ids=payload.ids,
+        search=payload.search,
+        category=payload.category,
+        department=payload.department,
+        status=payload.status,
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="No equipment matches the filter")
+
+    if payload.format == "zip":
+        body, media_type = stream_zip(rows, mode=payload.mode), "application/zip"
+    else:
+        body = stream_pdf(rows, mode=payload.mode, columns=payload.columns, rows_per_page=payload.rows)
+        media_type = "application/pdf"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="equipment-labels.{payload.format}"'},
+    )
+
+
 @router.get("/{equipment_id}", response_model=EquipmentOut)
-def equipment_get(
+async def equipment_get(
     equipment_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_user),
+    expand: str | None = Query(default=None, description=EXPAND_HELP["equipment"]),
 ):
-    eq = crud_equipment.get(db, equipment_id)
+    relations = parse_expand("equipment", expand)
+    last_modified = await run_db(db, crud_equipment.get_stamp, equipment_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    if not relations:
+        not_modified = conditional(request, response, make_etag(equipment_id, last_modified.isoformat()), last_modified)
+        if not_modified:
+            return not_modified
+
+    eq = await run_db(db, crud_equipment.get, equipment_id)
     if not eq:
         raise HTTPException(status_code=404, detail="Equipment not found")
+    if relations:
+        expanded = await resolve(db, "equipment", [eq], relations)
+        return json_response(dump_rows([eq], EquipmentOut, expanded=expanded)[0], response)
     return EquipmentOut.model_validate(eq)
 
 
 @router.put("/{equipment_id}", response_model=EquipmentOut)
-def equipment_update(
+async def equipment_update(
     equipment_id: str,
     payload: EquipmentUpdate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    eq = crud_equipment.get(db, equipment_id)
+    eq = await run_db(db, crud_equipment.get, equipment_id)
     if not eq:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
     data = payload.model_dump(exclude_unset=True, by_alias=False)
     # If scrapped and reason provided
     if data.get("is_scrapped") is True:
-        eq = crud_equipment.scrap(db, eq, reason=data.get("scrapped_reason"))
+        eq = await run_db(db, crud_equipment.scrap, eq, reason=data.get("scrapped_reason"))
         return EquipmentOut.model_validate(eq)
 
-    eq = crud_equipment.update(db, eq, data)
+    eq = await run_db(db, crud_equipment.update, eq, data)
     return EquipmentOut.model_validate(eq)
 
 
 @router.post("/{equipment_id}/scrap", response_model=EquipmentOut)
-def equipment_scrap(
+async def equipment_scrap(
     equipment_id: str,
     reason: str | None = None,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    eq = crud_equipment.get(db, equipment_id)
+    eq = await run_db(db, crud_equipment.get, equipment_id)
     if not eq:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    eq = crud_equipment.scrap(db, eq, reason=reason)
+    eq = await run_db(db, crud_equipment.scrap, eq, reason=reason)
     return EquipmentOut.model_validate(eq)
 
 
 @router.delete("/{equipment_id}")
-def equipment_delete(
+async def equipment_delete(
     equipment_id: str,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin")),
 ):
-    eq = crud_equipment.get(db, equipment_id)
+    eq = await run_db(db, crud_equipment.get, equipment_id)
     if not eq:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    crud_equipment.delete(db, eq)
+    await run_db(db, crud_equipment.delete, eq)
     return {"ok": True}
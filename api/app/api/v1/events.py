@@ -0,0 +1,118 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.deps import db_session, require_roles, security, user_from_token
+from app.core import events
+from app.core.config import settings
+from app.models.user import User
+
+router = APIRouter()
+
+# Close code for a client dropped for falling behind ("try again later").
+WS_OVERFLOW = 1013
+
+
+async def _principal(credentials: HTTPAuthorizationCredentials | None, access_token: str | None) -> User:
+    """Resolve the caller on a short session so a long-lived feed does not hold a connection.
+
+    Browsers' EventSource and WebSocket cannot set headers, hence the `access_token` fallback.
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    async with db_session() as db:
+        return await user_from_token(db, token)
+
+
+def _subscribe(team_id: str | None) -> events.Subscription:
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Live events are disabled")
+    return events.broker.subscribe(team_id)
+
+
+def _encode(ev: dict) -> str:
+    return f"event: {ev['type']}\ndata: {events.dumps(ev)}\n\n"
+
+
+@router.get("")
+async def event_stream(
+    request: Request,
+    team_id: str | None = Query(default=None, alias="teamId"),
+    access_token: str | None = Query(default=None),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+):
+    """Server-sent events for request and equipment changes, optionally for one team.
+
+    Events: request.created, request.updated, request.stage_changed, equipment.scrapped,
+    requests.imported. A client that falls too far behind gets an `overflow` event and the
+    stream ends; reconnect and catch up through /api/v1/sync.
+    """
+    await _principal(credentials, access_token)
+    sub = _subscribe(team_id)
+    heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+
+    async def body():
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    ev = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from timing out an idle stream.
+                    yield ": keepalive\n\n"
+                    continue
+                if ev is events.OVERFLOW:
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                yield _encode(ev)
+        finally:
+            events.broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def event_socket(
+    websocket: WebSocket,
+    team_id: str | None = Query(default=None, alias="teamId"),
+    access_token: str | None = Query(default=None),
+):
+    """The same feed over a WebSocket: one JSON message per event."""
+    auth = websocket.headers.get("authorization", "")
+    bearer = auth[7:] if auth.lower().startswith("bearer ") else None
+    try:
+        await _principal(None, bearer or access_token)
+        sub = _subscribe(team_id)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                ev = await asyncio.wait_for(sub.queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Writing is how a vanished client is noticed.
+                await websocket.send_text('{"type":"keepalive"}')
+                continue
+            if ev is events.OVERFLOW:
+                await websocket.close(code=WS_OVERFLOW, reason="overflow")
+                return
+            await websocket.send_text(events.dumps(ev))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        events.broker.unsubscribe(sub)
+
+
+@router.get("/stats")
+async def event_stats(_: User = Depends(require_roles("admin"))):
+    return events.broker.stats()
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_read_db, get_current_user
+from app.db.session import run_db
+from app.crud import request as crud_request
+from app.schemas.request import RequestOut
+from app.models.user import User
+from app.utils.serialization import FIELDS_HELP, list_response, parse_fields
+
+router = APIRouter()
+
+
+@router.get("/queue", response_model=list[RequestOut])
+async def my_queue(
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    limit: int = Query(default=200, ge=1, le=1000),
+    fields: str | None = Query(default=None, description=FIELDS_HELP),
+):
+    """The caller's open requests (assigned to them, or unassigned in their teams), most urgent first."""
+    try:
+        columns = parse_fields(fields, RequestOut)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    items = await run_db(db, crud_request.work_queue, current_user.id, limit=limit, columns=columns)
+    return list_response(items, RequestOut, response, columns)
@@ -1,39 +1,56 @@
-import io
-from fastapi import APIRouter, HTTPException, Response, Query
+from fastapi import APIRouter, Header, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
-from app.api.deps import get_db
+from app.api.deps import get_read_db
 from app.core.config import settings
+from app.db.session import run_db
 from app.crud import equipment as crud_equipment
 from app.schemas.equipment import EquipmentOut
-from app.utils.qr import make_qr_png
+from app.utils.http import conditional, etag_matches, make_etag
+from app.utils.qr import MEDIA_TYPES, equipment_payload, qr_etag, render_qr_async
 
 router = APIRouter()
 
 
 @router.get("/equipment/{equipment_id}", response_model=EquipmentOut)
-def public_equipment_get(equipment_id: str, db: Session = Depends(get_db)):
-    eq = crud_equipment.get(db, equipment_id)
+async def public_equipment_get(equipment_id: str, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    last_modified = await run_db(db, crud_equipment.get_stamp, equipment_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    not_modified = conditional(request, response, make_etag(equipment_id, last_modified.isoformat()), last_modified)
+    if not_modified:
+        return not_modified
+
+    eq = await run_db(db, crud_equipment.get, equipment_id)
     if not eq:
         raise HTTPException(status_code=404, detail="Equipment not found")
     return EquipmentOut.model_validate(eq)
 
 
 @router.get("/equipment/{equipment_id}/qr")
-def public_equipment_qr(
+async def public_equipment_qr(
     equipment_id: str,
     mode: str = Query(default="link", pattern="^(link|json)$"),
-    db: Session = Depends(get_db),
+    format: str = Query(default="png", pattern="^(png|svg)$"),
+    box_size: int = Query(default=10, ge=1, le=40),
+    border: int = Query(default=4, ge=0, le=16),
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_read_db),
 ):
-    eq = crud_equipment.get(db, equipment_id)
-    if not eq:
+    # The code encodes only the id, so an existence probe (updated_at, as for the detail route's
+    # validators) is all the 304 and the render need; the row itself is never loaded.
+    if await run_db(db, crud_equipment.get_stamp, equipment_id) is None:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    if mode == "link":
-        payload = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/scan/{equipment_id}"
-    else:
-        payload = {"equipmentId": equipment_id}
+    payload = equipment_payload(equipment_id, mode)
+
+    headers = {
+        "ETag": qr_etag(payload, format, box_size, border),
+        "Cache-Control": f"public, max-age={settings.QR_CACHE_MAX_AGE}",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
 
-    png_bytes = make_qr_png(payload)
-    return Response(content=png_bytes, media_type="image/png")
+    content, _ = await render_qr_async(payload, format, box_size, border)
+    return Response(content=content, media_type=MEDIA_TYPES[format], headers=headers)
@@ -0,0 +1,64 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_read_db, get_current_user
+from app.db.session import run_db
+from app.crud import report as crud_report
+from app.schemas.report import CountsOut, TimeseriesOut, DurationStatsOut, SummaryOut
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=SummaryOut)
+async def reports_summary(db: Session = Depends(get_read_db), _: User = Depends(get_current_user)):
+    return SummaryOut(**await run_db(db, crud_report.summary))
+
+
+@router.get("/requests/counts", response_model=CountsOut)
+async def reports_request_counts(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    group_by: str = Query(default="team", alias="groupBy", pattern="^(team|category|stage|type)$"),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+    team_id: str | None = Query(default=None, alias="teamId"),
+):
+    rows = await run_db(db, crud_report.request_counts, group_by, start=start, end=end, team_id=team_id)
+    return CountsOut(group_by=group_by, keys=[k for k, _ in rows], counts=[n for _, n in rows])
+
+
+@router.get("/requests/timeseries", response_model=TimeseriesOut)
+async def reports_request_timeseries(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    bucket: str = Query(default="day", pattern="^(day|week|month)$"),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+    team_id: str | None = Query(default=None, alias="teamId"),
+):
+    rows = await run_db(db, crud_report.request_timeseries, bucket, start=start, end=end, team_id=team_id)
+    return TimeseriesOut(bucket=bucket, buckets=[b for b, _ in rows], counts=[n for _, n in rows])
+
+
+@router.get("/requests/durations", response_model=DurationStatsOut)
+async def reports_request_durations(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    group_by: str = Query(default="team", alias="groupBy", pattern="^(team|category)$"),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+    team_id: str | None = Query(default=None, alias="teamId"),
+):
+    rows = await run_db(db, crud_report.duration_stats, group_by, start=start, end=end, team_id=team_id)
+    return DurationStatsOut(
+        group_by=group_by,
+        keys=[r[0] for r in rows],
+        counts=[r[1] for r in rows],
+        avg=[round(r[2], 2) for r in rows],
+        p50=[round(r[3][0], 2) for r in rows],
+        p90=[round(r[3][1], 2) for r in rows],
+        p95=[round(r[3][2], 2) for r in rows],
+    )
@@ -1,38 +1,146 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user, require_roles
+from app.api.deps import get_db, get_read_db, get_current_user, require_roles
+from app.api.expand import EXPAND_HELP, parse_expand, resolve, with_keys
+from app.db.session import read_sessionmaker, run_db
 from app.crud import request as crud_request
 from app.crud import equipment as crud_equipment
-from app.schemas.request import RequestOut, RequestCreate, RequestUpdate
+from app.schemas.common import ImportResult, Page, SearchHit
+from app.schemas.request import RequestBatchUpdate, RequestOut, RequestCreate, RequestUpdate
 from app.models.user import User
+from app.utils.bulk_import import detect_format, records, run_import
+from app.utils.http import conditional, list_etag, make_etag, page_etag, stamped
+from app.utils.pagination import SORT_PATTERN
+from app.utils.serialization import FIELDS_HELP, dump_rows, json_response, list_response, page_response, parse_fields
+from app.utils.streaming import MEDIA_TYPES, STREAM_PATTERN, encode_rows, streamed
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[RequestOut])
-def requests_list(
-    db: Session = Depends(get_db),
+@router.get("", response_model=list[RequestOut] | Page[RequestOut])
+async def requests_list(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_user),
     equipment_id: str | None = Query(default=None),
     type: str | None = Query(default=None),
     team_id: str | None = Query(default=None),
     stage: str | None = Query(default=None),
     search: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    sort: str = Query(default="-updated_at", pattern=SORT_PATTERN),
+    stream: str | None = Query(default=None, pattern=STREAM_PATTERN),
+    fields: str | None = Query(default=None, description=FIELDS_HELP),
+    expand: str | None = Query(default=None, description=EXPAND_HELP["requests"]),
 ):
-    items = crud_request.list_requests(
-        db,
+    try:
+        columns = parse_fields(fields, RequestOut)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    relations = parse_expand("requests", expand)
+
+    filters = dict(
         equipment_id=equipment_id,
         type_=type,
         team_id=team_id,
         stage=stage,
         search=search,
     )
+
+    # Export mode: every matching row, streamed from a server-side cursor.
+    if stream:
+        if fields or expand:
+            raise HTTPException(status_code=400, detail="fields and expand cannot be combined with stream")
+        rows = streamed(crud_request.iter_requests, sort=sort, **filters, session_factory=read_sessionmaker(db))
+        headers = dict(response.headers)
+        if stream == "csv":
+            headers["Content-Disposition"] = f'attachment; filename="requests.{stream}"'
+        return StreamingResponse(encode_rows(rows, RequestOut, stream), media_type=MEDIA_TYPES[stream], headers=headers)
+
+    # Cursor mode is opt-in; without limit/cursor the full list is returned as before.
+    if limit is None and cursor is None:
+        # Embedded rows change independently of the listed ones, so expanded lists carry no validators.
+        # Pages and exports skip the count: it would aggregate the whole filtered set on every call.
+        if not relations:
+            count, last_modified = await run_db(db, crud_request.list_stamp, **filters)
+            not_modified = conditional(request, response, list_etag(request, count, last_modified), last_modified)
+            if not_modified:
+                return not_modified
+        items = await run_db(db, crud_request.list_requests, columns=with_keys("requests", columns, relations), **filters)
+        return list_response(items, RequestOut, response, columns, await resolve(db, "requests", items, relations))
+
+    try:
+        items, next_cursor = await run_db(
+            db,
+            crud_request.page_requests,
+            limit=limit or 50,
+            cursor=cursor,
+            sort=sort,
+            columns=stamped(with_keys("requests", columns, relations)),
+            **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not relations:
+        not_modified = conditional(request, response, page_etag(request, items, next_cursor), None)
+        if not_modified:
+            return not_modified
+    return page_response(items, RequestOut, next_cursor, response, columns, await resolve(db, "requests", items, relations))
+
+
+@router.get("/calendar", response_model=list[RequestOut])
+async def requests_calendar(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    start: date = Query(),
+    end: date = Query(),
+    team_id: str | None = Query(default=None, alias="teamId"),
+    type: str | None = Query(default=None),
+):
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days > 366:
+        raise HTTPException(status_code=400, detail="Calendar window is limited to one year")
+
+    items = await run_db(db, crud_request.list_scheduled, start, end, team_id=team_id, type_=type)
     return [RequestOut.model_validate(r) for r in items]
 
 
+@router.get("/search", response_model=list[SearchHit[RequestOut]])
+async def requests_search(
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    search: str = Query(min_length=1),
+    equipment_id: str | None = Query(default=None),
+    type: str | None = Query(default=None),
+    team_id: str | None = Query(default=None),
+    stage: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    hits = await run_db(
+        db,
+        crud_request.search_requests,
+        search,
+        limit=limit,
+        equipment_id=equipment_id,
+        type_=type,
+        team_id=team_id,
+        stage=stage,
+    )
+    return [
+        SearchHit[RequestOut](item=RequestOut.model_validate(r), score=score, snippet=snippet)
+        for r, score, snippet in hits
+    ]
+
+
 @router.post("", response_model=RequestOut)
-def requests_create(
+async def requests_create(
     payload: RequestCreate,
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
@@ -41,36 +149,110 @@ def requests_create(
     if payload.type == "preventive" and not payload.scheduled_date:
         raise HTTPException(status_code=400, detail="scheduledDate is required for preventive requests")
 
-    req = crud_request.create(db, payload.model_dump(by_alias=False))
+    req = await run_db(db, crud_request.create, payload.model_dump(by_alias=False))
     return RequestOut.model_validate(req)
 
 
+@router.post("/import", response_model=ImportResult)
+async def requests_import(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin", "manager")),
+    format: str | None = Query(default=None, pattern="^(csv|ndjson)$"),
+    dry_run: bool = Query(default=False, alias="dryRun"),
+):
+    """Stream a CSV (header row of field names) or NDJSON body into maintenance requests."""
+    fmt = detect_format(format, request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=csv|ndjson")
+
+    async def insert(rows: list[dict]) -> None:
+        await run_db(db, crud_request.bulk_create, rows)
+
+    def prepare(row: dict) -> dict:
+        # Rows without a creator are attributed to the importing user.
+        if "createdById" not in row and "created_by_id" not in row:
+            row["createdById"] = current_user.id
+        return row
+
+    def check(item: RequestCreate) -> str | None:
+        if item.type == "preventive" and not item.scheduled_date:
+            return "scheduledDate is required for preventive requests"
+        return None
+
+    result = await run_import(records(request.stream(), fmt), RequestCreate, insert, dry_run=dry_run, check=check, prepare=prepare)
+    return ImportResult(**result)
+
+
+@router.patch("/batch", response_model=list[RequestOut])
+async def requests_batch_update(
+    payload: RequestBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Apply one set of stage / assignee / team changes to many requests atomically."""
+    data = payload.model_dump(exclude_unset=True, exclude={"ids"}, by_alias=False)
+    if not data:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    for field in ("stage", "maintenance_team_id"):
+        if field in data and data[field] is None:
+            raise HTTPException(status_code=400, detail=f"{field} cannot be null")
+
+    if data.get("stage") == "scrap" and current_user.role.value not in ("admin", "manager"):
+        raise HTTPException(status_code=403, detail="Only admin/manager can scrap equipment via request")
+
+    try:
+        items, missing = await run_db(db, crud_request.batch_update, payload.ids, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Requests not found: {', '.join(missing)}")
+    return [RequestOut.model_validate(r) for r in items]
+
+
 @router.get("/{request_id}", response_model=RequestOut)
-def requests_get(
+async def requests_get(
     request_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_user),
+    expand: str | None = Query(default=None, description=EXPAND_HELP["requests"]),
 ):
-    req = crud_request.get(db, request_id)
+    relations = parse_expand("requests", expand)
+    last_modified = await run_db(db, crud_request.get_stamp, request_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if not relations:
+        not_modified = conditional(request, response, make_etag(request_id, last_modified.isoformat()), last_modified)
+        if not_modified:
+            return not_modified
+
+    req = await run_db(db, crud_request.get, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
+    if relations:
+        expanded = await resolve(db, "requests", [req], relations)
+        return json_response(dump_rows([req], RequestOut, expanded=expanded)[0], response)
     return RequestOut.model_validate(req)
 
 
 @router.put("/{request_id}", response_model=RequestOut)
-def requests_update(
+async def requests_update(
     request_id: str,
     payload: RequestUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    req = crud_request.get(db, request_id)
+    req = await run_db(db, crud_request.get, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
 
     data = payload.model_dump(exclude_unset=True, by_alias=False)
 
-    # Business rule: duration required if marking repaired
+    # Business rule: duration required if marking repaired (and not cleared by an explicit null)
+    if data.get("stage") == "repaired" and "duration_hours" in data and data["duration_hours"] is None:
+        raise HTTPException(status_code=400, detail="durationHours cannot be null when marking as repaired")
     if data.get("stage") == "repaired" and not (data.get("duration_hours") or req.duration_hours):
         raise HTTPException(status_code=400, detail="durationHours is required to mark as repaired")
 
@@ -78,22 +260,22 @@ def requests_update(
     if data.get("stage") == "scrap":
         if current_user.role.value not in ("admin", "manager"):
             raise HTTPException(status_code=403, detail="Only admin/manager can scrap equipment via request")
-        eq = crud_equipment.get(db, req.equipment_id)
+        eq = await run_db(db, crud_equipment.get, req.equipment_id)
         if eq and not eq.is_scrapped:
-            crud_equipment.scrap(db, eq, reason=f"Scrap request: {req.subject}")
+            await run_db(db, crud_equipment.scrap, eq, reason=f"Scrap request: {req.subject}")
 
-    req = crud_request.update(db, req, data)
+    req = await run_db(db, crud_request.update, req, data)
     return RequestOut.model_validate(req)
 
 
 @router.delete("/{request_id}")
-def requests_delete(
+async def requests_delete(
     request_id: str,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    req = crud_request.get(db, request_id)
+    req = await run_db(db, crud_request.get, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
-    crud_request.delete(db, req)
+    await run_db(db, crud_request.delete, req)
     return {"ok": True}
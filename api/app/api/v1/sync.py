@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_user
+from app.db.session import run_db
+from app.crud import sync as crud_sync
+from app.schemas.sync import SyncOut
+from app.models.user import User
+
+router = APIRouter()
+
+# users are only listed to admins/managers, so only they receive user changes.
+USER_ROLES = ("admin", "manager")
+
+
+@router.get("", response_model=SyncOut)
+async def sync(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    since: str | None = Query(default=None),
+    limit: int = Query(default=1000, ge=1, le=5000),
+):
+    """Rows created or updated since `since` (everything when omitted) plus deletions, and the next token."""
+    entities = tuple(e for e in crud_sync.ENTITIES if e != "users" or current_user.role.value in USER_ROLES)
+    try:
+        data = await run_db(db, crud_sync.changes, since, limit=limit, entities=entities)
+    except crud_sync.TokenExpired:
+        raise HTTPException(status_code=410, detail="Sync token expired, resync without `since`")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SyncOut.model_validate(data)
@@ -1,59 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, require_roles, get_current_user
+from app.api.deps import get_db, get_read_db, require_roles, get_current_user
+from app.db.session import run_db
 from app.crud import team as crud_team
+from app.schemas.common import Page
 from app.schemas.team import TeamOut, TeamCreate, TeamUpdate
 from app.models.user import User
+from app.utils.http import conditional, list_etag, make_etag, page_etag, stamped
+from app.utils.pagination import SORT_PATTERN
+from app.utils.serialization import FIELDS_HELP, list_response, page_response, parse_fields
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[TeamOut])
-def list_teams(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    return [TeamOut.model_validate(t) for t in crud_team.list_teams(db)]
+@router.get("", response_model=list[TeamOut] | Page[TeamOut])
+async def list_teams(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    sort: str = Query(default="-created_at", pattern=SORT_PATTERN),
+    fields: str | None = Query(default=None, description=FIELDS_HELP),
+):
+    try:
+        columns = parse_fields(fields, TeamOut)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if limit is None and cursor is None:
+        count, last_modified = await run_db(db, crud_team.list_stamp)
+        not_modified = conditional(request, response, list_etag(request, count, last_modified), last_modified)
+        if not_modified:
+            return not_modified
+        return list_response(await run_db(db, crud_team.list_teams, columns=columns), TeamOut, response, columns)
+
+    try:
+        teams, next_cursor = await run_db(
+            db, crud_team.page_teams, limit=limit or 50, cursor=cursor, sort=sort, columns=stamped(columns)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    not_modified = conditional(request, response, page_etag(request, teams, next_cursor), None)
+    if not_modified:
+        return not_modified
+    return page_response(teams, TeamOut, next_cursor, response, columns)
 
 
 @router.post("", response_model=TeamOut)
-def create_team(
+async def create_team(
     payload: TeamCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    t = crud_team.create(db, payload.name, payload.member_ids)
+    t = await run_db(db, crud_team.create, payload.name, payload.member_ids)
     return TeamOut.model_validate(t)
 
 
 @router.get("/{team_id}", response_model=TeamOut)
-def get_team(team_id: str, db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    t = crud_team.get(db, team_id)
+async def get_team(
+    team_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+):
+    last_modified = await run_db(db, crud_team.get_stamp, team_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    not_modified = conditional(request, response, make_etag(team_id, last_modified.isoformat()), last_modified)
+    if not_modified:
+        return not_modified
+
+    t = await run_db(db, crud_team.get, team_id)
     if not t:
         raise HTTPException(status_code=404, detail="Team not found")
     return TeamOut.model_validate(t)
 
 
 @router.put("/{team_id}", response_model=TeamOut)
-def update_team(
+async def update_team(
     team_id: str,
     payload: TeamUpdate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    t = crud_team.get(db, team_id)
+    t = await run_db(db, crud_team.get, team_id)
     if not t:
         raise HTTPException(status_code=404, detail="Team not found")
-    t = crud_team.update(db, t, name=payload.name, member_ids=payload.member_ids)
+    t = await run_db(db, crud_team.update, t, name=payload.name, member_ids=payload.member_ids)
     return TeamOut.model_validate(t)
 
 
 @router.delete("/{team_id}")
-def delete_team(
+async def delete_team(
     team_id: str,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin")),
 ):
-    t = crud_team.get(db, team_id)
+    t = await run_db(db, crud_team.get, team_id)
     if not t:
         raise HTTPException(status_code=404, detail="Team not found")
-    crud_team.delete(db, t)
+    await run_db(db, crud_team.delete, t)
     return {"ok": True}
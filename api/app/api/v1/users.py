@@ -1,49 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, require_roles, get_current_user
-from app.crud.user import list_users, create_user, get as get_user, update_user
+from app.api.deps import get_db, get_read_db, require_roles, get_current_user
+from app.db.session import run_db
+from app.core.security import PasswordHashBusy, get_password_hash_async
+from app.crud.user import get_by_email, list_stamp, list_users, page_users, create_user, delete_user, get as get_user, update_user
+from app.schemas.common import Page
 from app.schemas.user import UserOut, UserCreate, UserUpdate
 from app.models.user import User
+from app.utils.http import conditional, list_etag, page_etag, stamped
+from app.utils.pagination import SORT_PATTERN
+from app.utils.serialization import FIELDS_HELP, list_response, page_response, parse_fields
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[UserOut])
-def users_list(
-    db: Session = Depends(get_db),
+@router.get("", response_model=list[UserOut] | Page[UserOut])
+async def users_list(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles("admin", "manager")),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    sort: str = Query(default="-created_at", pattern=SORT_PATTERN),
+    fields: str | None = Query(default=None, description=FIELDS_HELP),
 ):
-    return [UserOut.model_validate(u) for u in list_users(db)]
+    try:
+        columns = parse_fields(fields, UserOut)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if limit is None and cursor is None:
+        count, last_modified = await run_db(db, list_stamp)
+        not_modified = conditional(request, response, list_etag(request, count, last_modified), last_modified)
+        if not_modified:
+            return not_modified
+        return list_response(await run_db(db, list_users, columns=columns), UserOut, response, columns)
+
+    try:
+        users, next_cursor = await run_db(
+            db, page_users, limit=limit or 50, cursor=cursor, sort=sort, columns=stamped(columns)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    not_modified = conditional(request, response, page_etag(request, users, next_cursor), None)
+    if not_modified:
+        return not_modified
+    return page_response(users, UserOut, next_cursor, response, columns)
 
 
 @router.post("", response_model=UserOut)
-def users_create(
+async def users_create(
     payload: UserCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin")),
 ):
-    existing = db.query(User).filter(User.email == payload.email).first()
+    existing = await run_db(db, get_by_email, payload.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already exists")
-    u = create_user(db, payload.name, payload.email, payload.role, payload.password)
+    try:
+        password_hash = await get_password_hash_async(payload.password)
+        u = await run_db(db, create_user, payload.name, payload.email, payload.role, password_hash=password_hash)
+    except PasswordHashBusy:
+        raise HTTPException(status_code=503, detail="Password hashing is busy, please retry", headers={"Retry-After": "1"})
     return UserOut.model_validate(u)
 
 
 @router.put("/{user_id}", response_model=UserOut)
-def users_update(
+async def users_update(
     user_id: str,
     payload: UserUpdate,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("admin", "manager")),
 ):
-    u = get_user(db, user_id)
+    u = await run_db(db, get_user, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
-    u = update_user(db, u, name=payload.name, role=payload.role, password=payload.password)
+    try:
+        password_hash = await get_password_hash_async(payload.password) if payload.password is not None else None
+        u = await run_db(db, update_user, u, name=payload.name, role=payload.role, password_hash=password_hash)
+    except PasswordHashBusy:
+        raise HTTPException(status_code=503, detail="Password hashing is busy, please retry", headers={"Retry-After": "1"})
     return UserOut.model_validate(u)
 
 
+@router.delete("/{user_id}")
+async def users_delete(
+    user_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin")),
+):
+    if user_id == current_user.id:
+        raise HTTPException(status_code=400, detail="You cannot delete your own account")
+    u = await run_db(db, get_user, user_id)
+    if not u:
+        raise HTTPException(status_code=404, detail="User not found")
+    await run_db(db, delete_user, u)
+    return {"ok": True}
+
+
 @router.get("/me", response_model=UserOut)
-def users_me(current_user: User = Depends(get_current_user)):
+async def users_me(current_user: User = Depends(get_current_user)):
     return UserOut.model_validate(current_user)
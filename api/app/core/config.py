@@ -2,6 +2,18 @@ from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+def async_url(url: str) -> str:
+    """`url` with the async driver (asyncpg / aiosqlite) swapped in."""
+    for sync, async_ in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync):
+            return async_ + url[len(sync):]
+    return url
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -11,18 +23,91 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
 
     DATABASE_URL: str
+    # Serve requests through an AsyncEngine/AsyncSession instead of the sync engine.
+    DB_ASYNC: bool = False
+    # Defaults to DATABASE_URL with the async driver (asyncpg / aiosqlite) swapped in.
+    ASYNC_DATABASE_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+
+    # Comma-separated read replica URLs (async URLs are derived as above). Read-only GET routes
+    # read from them; writes, and a user's reads for REPLICA_READ_YOUR_WRITES_SECONDS after their
+    # last write, use the primary. See app/db/replicas.py.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5
+    REPLICA_MAX_LAG_SECONDS: float = 10  # a replica further behind counts as unhealthy
+
+    # Prometheus-format /metrics plus per-route latency / SQL accounting middleware.
+    METRICS_ENABLED: bool = True
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Password hashing (bcrypt) on a dedicated process pool
+    BCRYPT_ROUNDS: int = 12  # raising it rehashes users transparently on their next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued + running; beyond this requests get 503
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
+
+    # Resolved principals for get_current_user
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # Build the principal from token claims (role/name/email) on a cache miss instead of querying users.
+    # Role changes then take effect only for newly issued tokens.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
     FRONTEND_BASE_URL: str = "http://localhost:5173"
     CORS_ORIGINS: str = "http://localhost:5173"
 
+    QR_CACHE_SIZE: int = 1024  # rendered images kept in memory per worker
+    QR_CACHE_DIR: str | None = None  # optional on-disk cache shared by workers
+    QR_CACHE_MAX_AGE: int = 60 * 60 * 24  # seconds, for Cache-Control
+    QR_RENDER_WORKERS: int = 4
+    QR_PROCESS_WORKERS: int = 2  # process pool for bulk label sheets
+
+    # Live change feed (/api/v1/events). "auto" uses Postgres LISTEN/NOTIFY when the
+    # database is Postgres, else an in-process broker (single worker only).
+    EVENTS_ENABLED: bool = True
+    EVENTS_BACKEND: str = "auto"  # auto|postgres|local
+    EVENTS_QUEUE_SIZE: int = 256  # per subscriber; a client further behind is disconnected
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Read-through cache for teams and users (app.core.reference_cache). Writes bump a generation
+    # that other workers hear about over Postgres NOTIFY ("auto" on Postgres), a generation file in
+    # REFERENCE_CACHE_DIR ("file"; "auto" elsewhere when the directory is set) or not at all ("local").
+    REFERENCE_CACHE_ENABLED: bool = True
+    REFERENCE_CACHE_TTL_SECONDS: int = 300  # backstop; writes invalidate immediately
+    REFERENCE_CACHE_MAX_ENTRIES: int = 1024  # per namespace
+    REFERENCE_CACHE_MAX_ROWS: int = 50000  # per namespace; a list counts one per row
+    REFERENCE_CACHE_BROADCAST: str = "auto"  # auto|postgres|file|local
+    REFERENCE_CACHE_DIR: str | None = None
+
+    # Delta sync: rows changed within this many seconds before a token are sent again,
+    # so transactions that commit late are not missed.
+    SYNC_OVERLAP_SECONDS: int = 5
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Run demo seeding, tombstone pruning and warm-up on a background thread once the app is
+    # serving, instead of before it accepts requests (see app.core.startup).
+    DEFER_STARTUP_TASKS: bool = True
+
     INIT_DEMO_DATA: bool = True
     DEMO_ADMIN_EMAIL: str = "admin@gearguard.dev"
     DEMO_ADMIN_PASSWORD: str = "Admin@12345"
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return async_url(self.DATABASE_URL)
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [u.strip() for u in (self.DATABASE_REPLICA_URLS or "").split(",") if u.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [o.strip() for o in (self.CORS_ORIGINS or "").split(",") if o.strip()]
@@ -0,0 +1,245 @@
+"""Change events for the live feed (/api/v1/events).
+
+CRUD functions `emit()` events into the session; they are published only once the
+transaction commits. On Postgres they travel as NOTIFY on EVENTS_CHANNEL (sent inside the
+transaction, so delivered exactly on commit) and every worker's LISTEN thread hands them to
+its in-process broker. Elsewhere (SQLite, tests, single node) the broker is fed directly.
+
+The broker gives each subscriber a bounded queue. A subscriber that falls EVENTS_QUEUE_SIZE
+events behind is cut off with an "overflow" marker instead of slowing the fan-out down;
+the client reconnects and catches up through /api/v1/sync.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "gearguard_events"
+
+# Queue marker telling a subscriber it was dropped for falling behind.
+OVERFLOW = object()
+
+
+def _value(v: Any) -> Any:
+    if hasattr(v, "value"):  # enums
+        return v.value
+    if hasattr(v, "isoformat"):
+        return v.isoformat()
+    return v
+
+
+def dumps(ev: dict) -> str:
+    return json.dumps(ev, default=_value)
+
+
+def request_event(kind: str, req, **extra) -> dict:
+    return {
+        "type": kind,
+        "id": req.id,
+        "teamId": req.maintenance_team_id,
+        "equipmentId": req.equipment_id,
+        "subject": req.subject,
+        "stage": _value(req.stage),
+        "assignedToId": req.assigned_to_id,
+        **extra,
+    }
+
+
+def equipment_scrapped_event(
+    equipment_id: str, team_id: str, name: str, scrapped_at: str | None, reason: str | None
+) -> dict:
+    return {
+        "type": "equipment.scrapped",
+        "id": equipment_id,
+        "teamId": team_id,
+        "name": name,
+        "scrappedAt": scrapped_at,
+        "scrappedReason": reason,
+    }
+
+
+def emit(db: Session, ev: dict) -> None:
+    """Queue `ev` on the session; it is published if and when the session commits."""
+    if settings.EVENTS_ENABLED:
+        db.info.setdefault("pending_events", []).append(ev)
+
+
+def _use_postgres(session: Session) -> bool:
+    if settings.EVENTS_BACKEND != "auto":
+        return settings.EVENTS_BACKEND == "postgres"
+    return session.get_bind().dialect.name == "postgresql"
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_in_transaction(session: Session) -> None:
+    pending = session.info.get("pending_events")
+    if not pending or not _use_postgres(session):
+        return
+    session.info["pending_events"] = []
+    at = datetime.now(timezone.utc).isoformat()
+    session.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": EVENTS_CHANNEL, "payloads": [dumps({**ev, "at": at}) for ev in pending]},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_local(session: Session) -> None:
+    pending = session.info.pop("pending_events", None)
+    if pending:
+        at = datetime.now(timezone.utc).isoformat()
+        for ev in pending:
+            broker.publish({**ev, "at": at})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop("pending_events", None)
+
+
+class Subscription:
+    def __init__(self, team_id: str | None, maxsize: int):
+        self.team_id = team_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # asyncio queues are not thread-safe: deliveries are scheduled on this loop.
+        self.loop = asyncio.get_running_loop()
+
+    def wants(self, ev: dict) -> bool:
+        # Events without a team (e.g. bulk imports) go to everyone.
+        return self.team_id is None or ev.get("teamId") in (None, self.team_id)
+
+    def offer(self, ev: dict) -> None:
+        try:
+            self.queue.put_nowait(ev)
+        except asyncio.QueueFull:
+            # Too slow: drop what is queued and tell the consumer to reconnect.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class Broker:
+    """In-process fan-out. `publish` may be called from any thread."""
+
+    def __init__(self):
+        self._subs: set[Subscription] = set()
+        self._listener: "PgListener | None" = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.overflowed = 0
+
+    def subscribe(self, team_id: str | None = None) -> Subscription:
+        self._ensure_listener()
+        sub = Subscription(team_id, settings.EVENTS_QUEUE_SIZE)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subs.discard(sub)
+
+    def publish(self, ev: dict) -> None:
+        subs = list(self._subs)
+        if not subs:
+            return
+        with self._lock:
+            self.published += 1
+        for sub in subs:
+            if sub.wants(ev) and not sub.loop.is_closed():
+                sub.loop.call_soon_threadsafe(self._deliver, sub, ev)
+
+    def _deliver(self, sub: Subscription, ev: dict) -> None:
+        if sub.queue.full():
+            with self._lock:
+                self.overflowed += 1
+        sub.offer(ev)
+
+    def _ensure_listener(self) -> None:
+        # Only workers that actually serve a feed hold a LISTEN connection.
+        from app.db.session import engine
+
+        backend = settings.EVENTS_BACKEND
+        if backend == "local" or (backend == "auto" and engine.dialect.name != "postgresql"):
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = PgListener(engine, EVENTS_CHANNEL, self._on_notify, name="events-listen")
+                self._listener.start()
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except ValueError:
+            logger.warning("dropping malformed event payload")
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self._subs), "published": self.published, "overflowed": self.overflowed}
+
+
+class PgListener(threading.Thread):
+    """LISTENs on `channel` over a connection detached from the pool, reconnecting on failure.
+
+    `handle` gets each notification's payload. `on_listen` runs every time LISTEN is (re)established,
+    for callers that must account for notifications missed while disconnected; `listening` tells
+    whether notifications are being received right now.
+    """
+
+    def __init__(
+        self,
+        engine,
+        channel: str,
+        handle: Callable[[str], None],
+        on_listen: Callable[[], None] | None = None,
+        name: str = "pg-listen",
+    ):
+        super().__init__(name=name, daemon=True)
+        self.engine = engine
+        self.channel = channel
+        self.handle = handle
+        self.on_listen = on_listen
+        self.listening = False
+
+    def run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("listener on %s failed, reconnecting in %.0fs", self.channel, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _listen(self) -> None:
+        fairy = self.engine.raw_connection()
+        fairy.detach()
+        conn = fairy.dbapi_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {self.channel}")
+            if self.on_listen is not None:
+                self.on_listen()
+            self.listening = True
+            while True:
+                if select.select([conn], [], [], 30.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.handle(conn.notifies.pop(0).payload)
+        finally:
+            self.listening = False
+            conn.close()
+
+
+broker = Broker()
@@ -0,0 +1,332 @@
+"""In-process metrics in Prometheus text format.
+
+A deliberately small registry (no prometheus_client dependency): every sample is a
+dict update under a lock, cheap enough to leave on in production. Each worker process
+keeps its own numbers, so scrape every worker (or run one per container).
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.doc = doc
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=(), collect=None):
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple, float] = {}
+        # Optional callable returning {label tuple: value} from a counter kept elsewhere.
+        self._collect = collect
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        if self._collect is not None:
+            items = list(self._collect().items())
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, doc, labels=(), collect=None):
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple, float] = {}
+        # Optional callable returning {label tuple: value}, evaluated at scrape time.
+        self._collect = collect
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, *labels) -> None:
+        self.inc(-amount, *labels)
+
+    def render(self) -> list[str]:
+        if self._collect is not None:
+            items = list(self._collect().items())
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+        # label tuple -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(row)) for k, row in self._values.items()]
+        out = self.header()
+        names = self.label_names + ("le",)
+        for k, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), row):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _fmt(bound)
+                out.append(f"{self.name}_bucket{_labels(names, k + (le,))} {cumulative}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, k)} {_fmt(row[-1])}")
+            out.append(f"{self.name}_count{_labels(self.label_names, k)} {cumulative}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[_Metric] = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for m in self.metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def route_label(scope) -> str:
+    # Templated path ("/api/v1/equipment/{equipment_id}") keeps label cardinality bounded.
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+# Scopes of the requests being served, keyed by id(). The router sets scope["route"] on the same
+# dict, so the gauge resolves each request's route when scraped, after routing.
+_in_flight: dict[int, dict] = {}
+_in_flight_routes: set[str] = set()
+
+
+def _in_flight_by_route() -> dict[tuple, int]:
+    # Routes seen before report 0 rather than dropping out of the scrape.
+    counts = dict.fromkeys(_in_flight_routes, 0)
+    for scope in list(_in_flight.values()):
+        route = route_label(scope)
+        counts[route] = counts.get(route, 0) + 1
+    return {(route,): n for route, n in counts.items()}
+
+
+http_latency = registry.add(
+    Histogram("gearguard_http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"))
+)
+http_in_flight = registry.add(
+    Gauge("gearguard_http_requests_in_flight", "Requests currently being served.", ("route",), collect=_in_flight_by_route)
+)
+request_queries = registry.add(
+    Histogram(
+        "gearguard_db_queries_per_request", "SQL statements executed per request.", ("route",), QUERY_COUNT_BUCKETS
+    )
+)
+request_sql_time = registry.add(
+    Histogram("gearguard_db_query_seconds_per_request", "Total SQL time per request.", ("route",))
+)
+queries_total = registry.add(Counter("gearguard_db_queries_total", "SQL statements executed.", ("engine",)))
+query_seconds_total = registry.add(Counter("gearguard_db_query_seconds_total", "Time spent in SQL.", ("engine",)))
+pool_wait = registry.add(
+    Histogram("gearguard_db_pool_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",), POOL_WAIT_BUCKETS)
+)
+pool_waiting = registry.add(Gauge("gearguard_db_pool_waiting", "Callers currently waiting for a connection.", ("engine",)))
+
+# --- per-request SQL accounting ---
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+
+
+# The stats object is mutable, so copies of the context made by the threadpool or
+# AsyncSession.run_sync still update the instance the middleware created.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Count statements and SQL time on `engine` (pass `async_engine.sync_engine` for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        queries_total.inc(1, name)
+        query_seconds_total.inc(elapsed, name)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        starts = ctx.connection.info.get("query_start") if ctx.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+# --- connection pools ---
+
+
+class _TimedPoolMixin:
+    """Records how long checkouts wait for a connection and how many callers are waiting."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        pool_waiting.inc(1, self.metrics_name)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_waiting.dec(1, self.metrics_name)
+            pool_wait.observe(time.perf_counter() - start, self.metrics_name)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+_pools: dict[str, QueuePool] = {}
+
+
+def register_pool(name: str, pool) -> None:
+    if isinstance(pool, QueuePool):
+        pool.metrics_name = name
+        _pools[name] = pool
+
+
+def pool_status(name: str) -> dict:
+    pool = _pools[name]
+    size = pool.size()
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": max_overflow,
+        # max_overflow < 0 means unbounded.
+        "exhausted": max_overflow >= 0 and checked_out >= size + max_overflow,
+    }
+
+
+def exhausted_pools() -> list[str]:
+    return [name for name in _pools if pool_status(name)["exhausted"]]
+
+
+def _pool_gauge(key: str):
+    return lambda: {(name,): pool_status(name)[key] for name in _pools}
+
+
+registry.add(Gauge("gearguard_db_pool_size", "Configured pool size.", ("engine",), collect=_pool_gauge("size")))
+registry.add(
+    Gauge("gearguard_db_pool_checked_out", "Connections checked out.", ("engine",), collect=_pool_gauge("checked_out"))
+)
+registry.add(Gauge("gearguard_db_pool_overflow", "Overflow connections open.", ("engine",), collect=_pool_gauge("overflow")))
+
+# --- ASGI middleware ---
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead)."""
+
+    def __init__(self, app, exclude: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = current_request.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        _in_flight[id(scope)] = scope
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            del _in_flight[id(scope)]
+            current_request.reset(token)
+            route = route_label(scope)
+            _in_flight_routes.add(route)
+            http_latency.observe(elapsed, scope["method"], route, status)
+            request_queries.observe(stats.queries, route)
+            request_sql_time.observe(stats.sql_seconds, route)
@@ -0,0 +1,254 @@
+"""Read-through cache for low-churn reference data: teams and users.
+
+CRUD reads go through `read_through(db, namespace, key, load)` and writes call `bump(db, namespace)`
+before committing. Each namespace is a TTLCache whose generation moves on every bump, so a value
+loaded before a concurrent write is never stored. Bumps take effect when the transaction commits:
+at once in this worker, and in the others through REFERENCE_CACHE_BROADCAST:
+
+- postgres: NOTIFY on CACHE_CHANNEL, sent inside the transaction (so delivered exactly on commit)
+  and received by a LISTEN thread each worker starts on first use. While that thread is not
+  listening, reads bypass the cache, and the cache is cleared whenever it (re)connects.
+- file: one generation file per namespace in REFERENCE_CACHE_DIR, replaced on every bump and
+  stat()ed on every lookup. For several workers on one host without Postgres.
+- local: no broadcast; a single worker only.
+
+`bump(db, namespace, key)` also names the row that changed. Functions registered with `on_bump`
+get that key once the bump reaches this worker, or None when bumps may have been missed (the
+LISTEN connection was (re)established, or the file broadcast, which carries no keys, fired).
+
+Memory is bounded per namespace by REFERENCE_CACHE_MAX_ENTRIES and REFERENCE_CACHE_MAX_ROWS (a list
+counts one per row). Cached values are shared between requests and must not be mutated: projected
+rows, tuples, or the column dicts that `attach` turns back into session-bound entities.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.events import PgListener
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_CHANNEL = "gearguard_cache"
+NAMESPACES = ("teams", "users")
+
+caches = {
+    ns: TTLCache(
+        settings.REFERENCE_CACHE_TTL_SECONDS, settings.REFERENCE_CACHE_MAX_ENTRIES, settings.REFERENCE_CACHE_MAX_ROWS
+    )
+    for ns in NAMESPACES
+}
+# namespace -> time.monotonic() of its last invalidation
+_invalidated_at = dict.fromkeys(NAMESPACES, float("-inf"))
+# namespace -> (inode, mtime) of its generation file when last checked (file broadcast)
+_file_seen: dict[str, tuple[int, int] | None] = {}
+_listener: PgListener | None = None
+_lock = threading.Lock()
+# namespace -> callbacks taking the bumped key, or None for "anything may have changed"
+_subscribers: dict[str, list[Callable[[str | None], None]]] = {ns: [] for ns in NAMESPACES}
+
+
+@lru_cache(maxsize=None)
+def backend() -> str:
+    mode = settings.REFERENCE_CACHE_BROADCAST
+    if mode != "auto":
+        return mode
+    from app.db.session import engine
+
+    if engine.dialect.name == "postgresql":
+        return "postgres"
+    return "file" if settings.REFERENCE_CACHE_DIR else "local"
+
+
+def _invalidate(namespace: str, key: str | None = None) -> None:
+    caches[namespace].invalidate()
+    _invalidated_at[namespace] = time.monotonic()
+    for fn in _subscribers[namespace]:
+        fn(key)
+
+
+def on_bump(namespace: str, fn: Callable[[str | None], None]) -> None:
+    """Call `fn(key)` for every bump of `namespace` seen by this worker (see the module docstring)."""
+    _subscribers[namespace].append(fn)
+
+
+# --- postgres broadcast ---
+
+
+def _on_notify(payload: str) -> None:
+    namespace, _, key = payload.partition(":")
+    if namespace in caches:
+        _invalidate(namespace, key or None)
+
+
+def _on_listen() -> None:
+    # Bumps sent while this worker was not listening are lost: start over.
+    for ns in NAMESPACES:
+        _invalidate(ns)
+
+
+def _listening() -> bool:
+    global _listener
+    if _listener is not None:
+        return _listener.listening
+    from app.db.session import engine
+
+    with _lock:
+        if _listener is None:
+            _listener = PgListener(engine, CACHE_CHANNEL, _on_notify, _on_listen, name="cache-listen")
+            _listener.start()
+    return False
+
+
+# --- file broadcast ---
+
+
+def _generation_file(namespace: str) -> Path:
+    return Path(settings.REFERENCE_CACHE_DIR) / f"{namespace}.generation"
+
+
+def _check_file(namespace: str) -> None:
+    try:
+        st = os.stat(_generation_file(namespace))
+        seen = (st.st_ino, st.st_mtime_ns)
+    except FileNotFoundError:
+        seen = None
+    if namespace not in _file_seen or _file_seen[namespace] != seen:
+        _file_seen[namespace] = seen
+        _invalidate(namespace)
+
+
+def _write_file(namespace: str) -> None:
+    path = _generation_file(namespace)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    token = uuid.uuid4().hex
+    tmp = path.with_name(f"{path.name}.{token}")
+    tmp.write_text(token)
+    # A new file rather than a rewrite, so readers see a new inode even within one mtime tick.
+    os.replace(tmp, path)
+
+
+def in_sync(namespace: str) -> bool:
+    """Whether bumps from other workers are reaching this one, so cached values can be trusted."""
+    mode = backend()
+    if mode == "postgres":
+        return _listening()
+    if mode == "file":
+        _check_file(namespace)
+    return True
+
+
+# --- reads ---
+
+
+def read_through(db: Session, namespace: str, key: Hashable, load: Callable[[], Any]) -> Any:
+    """`load()`, answered from the namespace's cache when possible. None results are not cached."""
+    if not settings.REFERENCE_CACHE_ENABLED or not in_sync(namespace):
+        return load()
+    cache = caches[namespace]
+    value = cache.get(key)
+    if value is not None:
+        return value
+    generation = cache.generation
+    value = load()
+    # A replica may not have replayed a write bumped moments ago; keep its answer only once a
+    # healthy replica must have caught up (see REPLICA_MAX_LAG_SECONDS).
+    replica_fresh = time.monotonic() - _invalidated_at[namespace] > settings.REPLICA_MAX_LAG_SECONDS
+    if value is not None and (db.info.get("replica") is None or replica_fresh):
+        cache.set(key, value, generation, weight=len(value) if isinstance(value, list) else 1)
+    return value
+
+
+def columns(obj: Any) -> dict:
+    """Plain copy of an entity's column values, to cache in place of the entity."""
+    return {a.key: _copy(getattr(obj, a.key)) for a in inspect(obj).mapper.column_attrs}
+
+
+def attach(db: Session, model: type, data: dict) -> Any:
+    """A `model` entity in `db` built from `columns()` output, without querying."""
+    obj = model(**{k: _copy(v) for k, v in data.items()})
+    make_transient_to_detached(obj)
+    return db.merge(obj, load=False)
+
+
+def _copy(value: Any) -> Any:
+    # JSON columns (e.g. member_ids) are the only mutable values in these tables.
+    return list(value) if isinstance(value, list) else value
+
+
+# --- writes ---
+
+
+def bump(db: Session, namespace: str, key: str | None = None) -> None:
+    """Invalidate `namespace` in every worker once `db` commits; `key` is passed to `on_bump` subscribers."""
+    db.info.setdefault("cache_bumps", set()).add((namespace, key))
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_in_transaction(session: Session) -> None:
+    bumps = session.info.get("cache_bumps")
+    if not bumps or backend() != "postgres":
+        return
+    payloads = sorted(f"{ns}:{key}" if key else ns for ns, key in bumps)
+    session.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": CACHE_CHANNEL, "payloads": payloads},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for ns, key in session.info.pop("cache_bumps", None) or ():
+        if backend() == "file":
+            try:
+                _write_file(ns)
+            except OSError:
+                logger.exception("could not publish cache bump for %s", ns)
+        _invalidate(ns, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop("cache_bumps", None)
+
+
+# --- stats ---
+
+
+def stats() -> dict:
+    return {
+        "enabled": settings.REFERENCE_CACHE_ENABLED,
+        "broadcast": backend(),
+        "namespaces": {ns: cache.stats() for ns, cache in caches.items()},
+    }
+
+
+def _stat(key: str):
+    return lambda: {(ns,): cache.stats()[key] for ns, cache in caches.items()}
+
+
+metrics.registry.add(
+    metrics.Counter("gearguard_reference_cache_hits_total", "Reference cache hits.", ("namespace",), collect=_stat("hits"))
+)
+metrics.registry.add(
+    metrics.Counter(
+        "gearguard_reference_cache_misses_total", "Reference cache misses.", ("namespace",), collect=_stat("misses")
+    )
+)
+metrics.registry.add(
+    metrics.Gauge("gearguard_reference_cache_entries", "Entries in the reference cache.", ("namespace",), collect=_stat("size"))
+)
+metrics.registry.add(
+    metrics.Gauge("gearguard_reference_cache_rows", "Rows held by the reference cache.", ("namespace",), collect=_stat("weight"))
+)
@@ -1,22 +1,131 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Optional
 
-from jose import jwt
-from passlib.context import CryptContext
-
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordHashBusy(Exception):
+    """The password hashing pool is saturated; callers should answer 503."""
+
+
+# bcrypt runs on a dedicated, size-capped process pool so it never occupies the
+# request threadpool. At most PASSWORD_HASH_MAX_PENDING jobs are queued or running;
+# beyond that, or after PASSWORD_HASH_TIMEOUT_SECONDS in the queue, PasswordHashBusy is raised.
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _release(_: Future) -> None:
+    global _pending
+    with _pool_lock:
+        _pending -= 1
+
+
+def _submit(fn, *args) -> Future:
+    global _pending
+    pool = _get_pool()
+    with _pool_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHashBusy()
+        _pending += 1
+    try:
+        fut = pool.submit(fn, *args)
+    except Exception:
+        _release(None)
+        raise
+    fut.add_done_callback(_release)
+    return fut
+
+
+def _result(fut: Future):
+    try:
+        return fut.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        fut.cancel()
+        raise PasswordHashBusy()
+
+
+async def _result_async(fut: Future):
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(fut), settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        fut.cancel()
+        raise PasswordHashBusy()
+
+
+# --- worker functions (run inside the pool) ---
+
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    # Imported here so passlib loads in the pool's processes, not when the API starts.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+def _hash(password: str) -> str:
+    return _pwd_context().hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return _pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+def _warm() -> None:
+    _pwd_context()
+
+
+# --- public API ---
+
+
+def warm_pool() -> None:
+    """Start every hashing process and load passlib in it, so the first login does not wait for spawns."""
+    futures = [_get_pool().submit(_warm) for _ in range(settings.PASSWORD_HASH_WORKERS)]
+    for fut in futures:
+        fut.result()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _result(_submit(_verify_and_update, plain_password, hashed_password))[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when the stored hash uses outdated cost parameters."""
+    return _result(_submit(_verify_and_update, plain_password, hashed_password))
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return await _result_async(_submit(_verify_and_update, plain_password, hashed_password))
 
 
 def get_password_hash(password: str) -> str:
     if len(password.encode("utf-8")) > 72:
         raise ValueError("Password too long for bcrypt (max 72 bytes)")
-    return pwd_context.hash(password)
+    return _result(_submit(_hash, password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    if len(password.encode("utf-8")) > 72:
+        raise ValueError("Password too long for bcrypt (max 72 bytes)")
+    return await _result_async(_submit(_hash, password))
 
 
 def create_access_token(subject: str, expires_minutes: Optional[int] = None, extra: Optional[dict[str, Any]] = None) -> str:
@@ -27,4 +136,19 @@ def create_access_token(subject: str, expires_minutes: Optional[int] = None, ext
     payload: dict[str, Any] = {"sub": subject, "exp": expire}
     if extra:
         payload.update(extra)
+    from jose import jwt  # deferred: its cryptography backend is slow to import
+
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def token_subject(authorization: str) -> Optional[str]:
+    """User id from an `Authorization: Bearer` header value, without authenticating the user."""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
@@ -0,0 +1,80 @@
+"""Cold-start timing and the startup work kept off the critical path.
+
+`mark()` records how long each import phase of app.main took and `phase()` times startup tasks;
+both end up in `phases` (served at /startupz, checked by bench.startup). With DEFER_STARTUP_TASKS,
+`run()` hands the tasks to a background thread so the app starts serving without waiting for them.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Imported on first use instead of with the app; `warm_imports` loads them in the background.
+DEFERRED_IMPORTS = ("jose.jwt", "passlib.context", "qrcode")
+
+logger = logging.getLogger(__name__)
+
+phases: dict[str, float] = {}  # name -> milliseconds, in the order they ran
+pending: list[str] = []  # tasks handed to the background thread that have not finished yet
+_last = time.perf_counter()
+_thread: threading.Thread | None = None
+
+
+def mark(name: str) -> None:
+    """Record the time since the previous mark (or since this module was imported) as `name`."""
+    global _last
+    now = time.perf_counter()
+    phases[name] = round((now - _last) * 1000, 1)
+    _last = now
+
+
+@contextmanager
+def phase(name: str):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = round((time.perf_counter() - t) * 1000, 1)
+
+
+def warm_imports() -> None:
+    for module in DEFERRED_IMPORTS:
+        importlib.import_module(module)
+
+
+def _run_in_background(tasks: list[tuple[str, Callable[[], None]]]) -> None:
+    for name, fn in tasks:
+        try:
+            with phase(name):
+                fn()
+        except Exception:
+            # Nothing is waiting on these any more; a failed task must not stop the rest.
+            logger.exception("startup task %s failed", name)
+        finally:
+            pending.remove(name)
+
+
+def run(tasks: list[tuple[str, Callable[[], None]]], background: bool) -> None:
+    """Run `(name, fn)` tasks in order, inline or on one daemon thread."""
+    global _thread
+    if not background:
+        for name, fn in tasks:
+            with phase(name):
+                fn()
+        return
+    pending.extend(name for name, _ in tasks)
+    _thread = threading.Thread(target=_run_in_background, args=(tasks,), name="startup-tasks", daemon=True)
+    _thread.start()
+
+
+def join(timeout: float | None = None) -> None:
+    """Wait for background startup tasks (for benchmarks and tests)."""
+    if _thread is not None:
+        _thread.join(timeout)
+
+
+def report() -> dict:
+    return {"phases": dict(phases), "pending": list(pending)}
@@ -1,36 +1,146 @@
 from datetime import datetime, timezone
+from typing import Iterator
+from sqlalchemy import func, insert, update as update_
 from sqlalchemy.orm import Session
 
+from app.core import events
+from app.crud import search as search_
+from app.crud.sync import record_deletion
 from app.models.equipment import Equipment
+from app.utils.pagination import keyset_page, project, sort_order
 
+STREAM_BATCH = 1000
 
-def list_equipment(
+
+def _filtered(
     db: Session,
     search: str | None = None,
     category: str | None = None,
     department: str | None = None,
-    status: str | None = None,  # active|scrapped|all
-) -> list[Equipment]:
+    status: str | None = None,
+):
     q = db.query(Equipment)
 
     if search:
-        s = f"%{search.lower()}%"
-        q = q.filter(
-            (Equipment.name.ilike(s))
-            | (Equipment.serial_number.ilike(s))
-            | (Equipment.owner_employee_name.ilike(s))
-        )
+        q = q.filter(search_.equipment_filter(db, search))
     if category:
         q = q.filter(Equipment.category == category)
     if department:
         q = q.filter(Equipment.department == department)
     if status and status != "all":
+        # `= false`, not `IS false`: only the former lets Postgres use the partial
+        # ix_equipment_active_created_at index (WHERE is_scrapped = false).
         if status == "active":
-            q = q.filter(Equipment.is_scrapped.is_(False))
+            q = q.filter(Equipment.is_scrapped == False)  # noqa: E712
         elif status == "scrapped":
-            q = q.filter(Equipment.is_scrapped.is_(True))
+            q = q.filter(Equipment.is_scrapped == True)  # noqa: E712
+    return q
+
+
+def list_equipment(
+    db: Session,
+    search: str | None = None,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,  # active|scrapped|all
+    columns: tuple[str, ...] | None = None,
+) -> list:
+    """Entities, or plain rows of just `columns` when given."""
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+    return project(q, Equipment, columns).order_by(Equipment.created_at.desc()).all()
+
+
+def page_equipment(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    sort: str = "-created_at",
+    search: str | None = None,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,
+    columns: tuple[str, ...] | None = None,
+) -> tuple[list, str | None]:
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+    return keyset_page(project(q, Equipment, columns, sort), Equipment, sort, limit, cursor)
+
+
+def list_stamp(
+    db: Session,
+    search: str | None = None,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,
+) -> tuple[int, datetime | None]:
+    """(row count, newest updated_at) of the filtered list: a cheap validator for conditional GETs."""
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+    count, last_modified = q.with_entities(func.count(Equipment.id), func.max(Equipment.updated_at)).one()
+    return count, last_modified
 
-    return q.order_by(Equipment.created_at.desc()).all()
+
+def iter_equipment(
+    db: Session,
+    sort: str = "-created_at",
+    search: str | None = None,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,
+) -> Iterator[Equipment]:
+    """Every matching row, fetched through a server-side cursor STREAM_BATCH rows at a time."""
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+    return iter(q.order_by(*sort_order(Equipment, sort)).yield_per(STREAM_BATCH))
+
+
+def label_rows(
+    db: Session,
+    ids: list[str] | None = None,
+    search: str | None = None,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,
+) -> list[tuple[str, str, str]]:
+    """(id, name, serial_number) for label printing; selects only those three columns."""
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+    if ids is not None:
+        q = q.filter(Equipment.id.in_(ids))
+    q = q.with_entities(Equipment.id, Equipment.name, Equipment.serial_number)
+    return [tuple(r) for r in q.order_by(Equipment.created_at.desc(), Equipment.id).all()]
+
+
+def search_equipment(
+    db: Session,
+    search: str,
+    limit: int = 50,
+    category: str | None = None,
+    department: str | None = None,
+    status: str | None = None,
+) -> list[tuple[Equipment, float, str | None]]:
+    """Relevance-ranked search returning (equipment, score, highlighted snippet) tuples."""
+    q = _filtered(db, search=search, category=category, department=department, status=status)
+
+    def snippet(e: Equipment) -> str | None:
+        return (
+            search_.highlight(e.name, search)
+            or search_.highlight(e.serial_number, search)
+            or search_.highlight(e.owner_employee_name, search)
+        )
+
+    if search_.is_postgres(db):
+        score = search_.equipment_score(search).label("score")
+        rows = q.add_columns(score).order_by(score.desc(), Equipment.created_at.desc()).limit(limit).all()
+        return [(e, float(sc), snippet(e)) for e, sc in rows]
+
+    hits = [
+        (e, search_.python_score(search, e.name, e.serial_number, e.owner_employee_name), snippet(e))
+        for e in q.all()
+    ]
+    hits.sort(key=lambda h: h[1], reverse=True)
+    return hits[:limit]
+
+
+def get_stamp(db: Session, equipment_id: str) -> datetime | None:
+    """updated_at of one row (None if it does not exist), read without loading the row."""
+    return db.query(Equipment.updated_at).filter(Equipment.id == equipment_id).scalar()
 
 
 def get(db: Session, equipment_id: str) -> Equipment | None:
@@ -45,6 +155,16 @@ def create(db: Session, payload: dict) -> Equipment:
     return eq
 
 
+def bulk_create(db: Session, rows: list[dict]) -> None:
+    """Insert many rows in one transaction using multi-row INSERTs; ids/timestamps come from column defaults."""
+    try:
+        db.execute(insert(Equipment), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
 def update(db: Session, eq: Equipment, payload: dict) -> Equipment:
     for k, v in payload.items():
         setattr(eq, k, v)
@@ -60,11 +180,50 @@ def scrap(db: Session, eq: Equipment, reason: str | None = None) -> Equipment:
     if reason:
         eq.scrapped_reason = reason
     db.add(eq)
+    events.emit(db, events.equipment_scrapped_event(eq.id, eq.maintenance_team_id, eq.name, eq.scrapped_at, eq.scrapped_reason))
     db.commit()
     db.refresh(eq)
     return eq
 
 
+def scrap_many(db: Session, reasons: dict[str, str]) -> None:
+    """Scrap the not-yet-scrapped equipment in `reasons` (id -> reason). Does not commit."""
+    rows = (
+        db.query(Equipment.id, Equipment.name, Equipment.maintenance_team_id)
+        .filter(Equipment.id.in_(reasons), Equipment.is_scrapped.is_(False))
+        .all()
+    )
+    if not rows:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    values = [{"id": r.id, "is_scrapped": True, "scrapped_at": now, "scrapped_reason": reasons[r.id]} for r in rows]
+    db.execute(update_(Equipment), values)
+    for r in rows:
+        events.emit(db, events.equipment_scrapped_event(r.id, r.maintenance_team_id, r.name, now, reasons[r.id]))
+
+
+def batch_update(db: Session, ids: list[str], payload: dict) -> tuple[list[Equipment], list[str]]:
+    """Apply `payload` to every row in `ids` with one UPDATE ... RETURNING.
+
+    Returns (updated rows in `ids` order, missing ids); nothing is changed if any id is missing.
+    """
+    ids = list(dict.fromkeys(ids))
+    found = {eid for (eid,) in db.query(Equipment.id).filter(Equipment.id.in_(ids)).with_for_update()}
+    missing = [eid for eid in ids if eid not in found]
+    if missing:
+        db.rollback()
+        return [], missing
+
+    rows = db.scalars(
+        update_(Equipment).where(Equipment.id.in_(ids)).values(**payload).returning(Equipment),
+        execution_options={"synchronize_session": False},
+    ).all()
+    db.commit()
+    by_id = {eq.id: eq for eq in rows}
+    return [by_id[eid] for eid in ids], []
+
+
 def delete(db: Session, eq: Equipment) -> None:
     db.delete(eq)
+    record_deletion(db, "equipment", eq.id)
     db.commit()
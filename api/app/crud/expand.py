@@ -0,0 +1,96 @@
+"""Batched loading of related rows for `expand=`.
+
+Models hold bare id strings rather than relationships, so related rows are resolved here: one
+`IN (...)` query per relation for the whole page of parent rows, never one per row.
+"""
+
+from typing import Any, NamedTuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from app.crud.user import PRINCIPAL_FIELDS
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team import Team
+from app.models.user import User
+from app.utils.pagination import project
+
+# Upper bound on values per IN list (SQLite and some drivers cap bound parameters).
+IN_BATCH = 1000
+# Rows embedded per parent for one-to-many relations (the most recent ones).
+MANY_LIMIT = 20
+
+
+class Relation(NamedTuple):
+    key: str  # attribute of the parent row holding the lookup value
+    model: Any
+    columns: tuple[str, ...] | None = None  # None selects whole entities
+    match: str = "id"  # column of `model` compared with the key values
+    many: bool = False  # one-to-many: a list per parent instead of a single row
+
+
+RELATIONS: dict[str, dict[str, Relation]] = {
+    "equipment": {
+        "team": Relation("maintenance_team_id", Team),
+        "technician": Relation("default_technician_id", User, PRINCIPAL_FIELDS),
+        "requests": Relation("id", MaintenanceRequest, match="equipment_id", many=True),
+    },
+    "requests": {
+        "team": Relation("maintenance_team_id", Team),
+        "assignee": Relation("assigned_to_id", User, PRINCIPAL_FIELDS),
+        "equipment": Relation("equipment_id", Equipment),
+    },
+}
+
+
+def parse_expand(kind: str, expand: str | None) -> tuple[str, ...]:
+    """Relation names from a comma-separated `expand=` value; raises ValueError for unknown ones."""
+    if not expand:
+        return ()
+    allowed = RELATIONS[kind]
+    names = tuple(dict.fromkeys(n.strip() for n in expand.split(",") if n.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise ValueError(f"Cannot expand {', '.join(unknown)}; expected some of {', '.join(allowed)}")
+    return names
+
+
+def key_columns(kind: str, relations: tuple[str, ...]) -> tuple[str, ...]:
+    """Parent columns a projection must include for `relations` to be resolved."""
+    return tuple(dict.fromkeys(RELATIONS[kind][n].key for n in relations))
+
+
+def load(db: Session, kind: str, rows: list, relations: tuple[str, ...]) -> dict[str, dict[str, Any]]:
+    """{relation: {key value: related row, or list of rows for one-to-many}} for `rows`."""
+    out: dict[str, dict[str, Any]] = {}
+    for name in relations:
+        rel = RELATIONS[kind][name]
+        keys = list({k for k in (getattr(r, rel.key) for r in rows) if k is not None})
+        column = getattr(rel.model, rel.match)
+        found: dict[str, Any] = {}
+        for i in range(0, len(keys), IN_BATCH):
+            q = project(db.query(rel.model), rel.model, rel.columns and (*rel.columns, rel.match))
+            q = q.filter(column.in_(keys[i : i + IN_BATCH]))
+            if rel.many:
+                for row in _most_recent(db, rel, q):
+                    found.setdefault(getattr(row, rel.match), []).append(row)
+            else:
+                found.update((getattr(row, rel.match), row) for row in q)
+        out[name] = found
+    return out
+
+
+def _most_recent(db: Session, rel: Relation, q):
+    """The newest MANY_LIMIT rows of `q` per parent key, grouped by key, newest first."""
+    nth = (
+        func.row_number()
+        .over(partition_by=getattr(rel.model, rel.match), order_by=(rel.model.created_at.desc(), rel.model.id))
+        .label("nth")
+    )
+    sub = q.add_columns(nth).subquery()
+    if rel.columns:
+        outer = db.query(*(sub.c[c] for c in dict.fromkeys((*rel.columns, rel.match))))
+    else:
+        outer = db.query(aliased(rel.model, sub))
+    return outer.filter(sub.c.nth <= MANY_LIMIT).order_by(sub.c[rel.match], sub.c.nth)
@@ -0,0 +1,142 @@
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from statistics import fmean
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.crud.search import is_postgres
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest, RequestStage
+
+GROUP_COLUMNS = {
+    "team": MaintenanceRequest.maintenance_team_id,
+    "category": MaintenanceRequest.equipment_category,
+    "stage": MaintenanceRequest.stage,
+    "type": MaintenanceRequest.type,
+}
+
+# SQLite stand-ins for date_trunc(); each yields the ISO date starting the bucket.
+_SQLITE_BUCKETS = {
+    "day": lambda col: func.date(col),
+    "week": lambda col: func.date(col, "weekday 0", "-6 days"),
+    "month": lambda col: func.strftime("%Y-%m-01", col),
+}
+
+OPEN_STAGES = (RequestStage.new, RequestStage.in_progress)
+
+
+def _key(v) -> str | None:
+    return v.value if isinstance(v, Enum) else v
+
+
+def _scoped(db: Session, *columns, start: date | None = None, end: date | None = None, team_id: str | None = None):
+    # The window is "created in", the same column the time series buckets by, so a window never
+    # returns buckets outside itself and every report counts the same requests.
+    q = db.query(*columns)
+    if start:
+        q = q.filter(MaintenanceRequest.created_at >= datetime.combine(start, time.min))
+    if end:
+        q = q.filter(MaintenanceRequest.created_at < datetime.combine(end + timedelta(days=1), time.min))
+    if team_id and team_id != "all":
+        q = q.filter(MaintenanceRequest.maintenance_team_id == team_id)
+    return q
+
+
+def request_counts(
+    db: Session,
+    group_by: str,
+    start: date | None = None,
+    end: date | None = None,
+    team_id: str | None = None,
+) -> list[tuple[str | None, int]]:
+    col = GROUP_COLUMNS[group_by]
+    rows = (
+        _scoped(db, col, func.count(), start=start, end=end, team_id=team_id)
+        .group_by(col)
+        .order_by(func.count().desc())
+        .all()
+    )
+    return [(_key(k), n) for k, n in rows]
+
+
+def request_timeseries(
+    db: Session,
+    bucket: str,
+    start: date | None = None,
+    end: date | None = None,
+    team_id: str | None = None,
+) -> list[tuple[str, int]]:
+    """Request counts per day/week/month of creation."""
+    if is_postgres(db):
+        b = func.date_trunc(bucket, MaintenanceRequest.created_at)
+    else:
+        b = _SQLITE_BUCKETS[bucket](MaintenanceRequest.created_at)
+    b = b.label("bucket")
+
+    rows = _scoped(db, b, func.count(), start=start, end=end, team_id=team_id).group_by(b).order_by(b).all()
+    return [(k.date().isoformat() if isinstance(k, datetime) else str(k), n) for k, n in rows]
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    # Linear interpolation, same definition as Postgres percentile_cont.
+    idx = (len(sorted_values) - 1) * p
+    lo = int(idx)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (idx - lo)
+
+
+def duration_stats(
+    db: Session,
+    group_by: str,
+    percentiles: tuple[float, ...] = (0.5, 0.9, 0.95),
+    start: date | None = None,
+    end: date | None = None,
+    team_id: str | None = None,
+) -> list[tuple[str | None, int, float, list[float]]]:
+    """(key, count, avg, [percentiles...]) of duration_hours per group, ignoring requests without a duration."""
+    col = GROUP_COLUMNS[group_by]
+    dur = MaintenanceRequest.duration_hours
+
+    if is_postgres(db):
+        q = _scoped(
+            db,
+            col,
+            func.count(dur),
+            func.avg(dur),
+            *[func.percentile_cont(p).within_group(dur) for p in percentiles],
+            start=start,
+            end=end,
+            team_id=team_id,
+        )
+        rows = q.filter(dur.isnot(None)).group_by(col).order_by(col).all()
+        return [(_key(r[0]), r[1], float(r[2]), [float(v) for v in r[3:]]) for r in rows]
+
+    # No ordered-set aggregates: stream the (key, duration) pairs already sorted and reduce in Python.
+    q = _scoped(db, col, dur, start=start, end=end, team_id=team_id).filter(dur.isnot(None)).order_by(col, dur)
+    groups: dict[str | None, list[float]] = {}
+    for k, v in q.yield_per(1000):
+        groups.setdefault(_key(k), []).append(v)
+    return [
+        (k, len(vals), fmean(vals), [_percentile(vals, p) for p in percentiles])
+        for k, vals in groups.items()
+    ]
+
+
+def summary(db: Session) -> dict:
+    total_eq, active_eq = db.query(
+        func.count(Equipment.id),
+        func.count(Equipment.id).filter(Equipment.is_scrapped.is_(False)),
+    ).one()
+    total_req, open_req, repaired_req = db.query(
+        func.count(MaintenanceRequest.id),
+        func.count(MaintenanceRequest.id).filter(MaintenanceRequest.stage.in_(OPEN_STAGES)),
+        func.count(MaintenanceRequest.id).filter(MaintenanceRequest.stage == RequestStage.repaired),
+    ).one()
+    return {
+        "total_equipment": total_eq,
+        "active_equipment": active_eq,
+        "total_requests": total_req,
+        "open_requests": open_req,
+        "repaired_requests": repaired_req,
+    }
@@ -1,17 +1,28 @@
+from datetime import date, datetime
+from typing import Iterator
+
+from sqlalchemy import and_, case, func, insert, or_, select, update as update_
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
-from app.models.request import MaintenanceRequest, RequestStage
+from app.core import events
+from app.crud import equipment as crud_equipment
+from app.crud import search as search_
+from app.crud.sync import record_deletion
+from app.models.request import OPEN_STAGES, MaintenanceRequest, RequestStage, RequestType
+from app.models.team_member import TeamMember
+from app.utils.pagination import keyset_page, project, sort_order
 
+STREAM_BATCH = 1000
 
-def list_requests(
+
+def _filtered(
     db: Session,
     equipment_id: str | None = None,
     type_: str | None = None,
     team_id: str | None = None,
     stage: str | None = None,
     search: str | None = None,
-) -> list[MaintenanceRequest]:
+):
     q = db.query(MaintenanceRequest)
 
     if equipment_id:
@@ -23,10 +34,152 @@ def list_requests(
     if stage:
         q = q.filter(MaintenanceRequest.stage == stage)
     if search:
-        s = f"%{search.lower()}%"
-        q = q.filter(or_(MaintenanceRequest.subject.ilike(s), MaintenanceRequest.description.ilike(s)))
+        q = q.filter(search_.request_filter(db, search))
+    return q
+
+
+def list_requests(
+    db: Session,
+    equipment_id: str | None = None,
+    type_: str | None = None,
+    team_id: str | None = None,
+    stage: str | None = None,
+    search: str | None = None,
+    columns: tuple[str, ...] | None = None,
+) -> list:
+    """Entities, or plain rows of just `columns` when given (e.g. without `description`)."""
+    q = _filtered(db, equipment_id=equipment_id, type_=type_, team_id=team_id, stage=stage, search=search)
+    return project(q, MaintenanceRequest, columns).order_by(MaintenanceRequest.updated_at.desc()).all()
+
+
+def page_requests(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    sort: str = "-updated_at",
+    equipment_id: str | None = None,
+    type_: str | None = None,
+    team_id: str | None = None,
+    stage: str | None = None,
+    search: str | None = None,
+    columns: tuple[str, ...] | None = None,
+) -> tuple[list, str | None]:
+    q = _filtered(db, equipment_id=equipment_id, type_=type_, team_id=team_id, stage=stage, search=search)
+    return keyset_page(project(q, MaintenanceRequest, columns, sort), MaintenanceRequest, sort, limit, cursor)
+
+
+def list_stamp(
+    db: Session,
+    equipment_id: str | None = None,
+    type_: str | None = None,
+    team_id: str | None = None,
+    stage: str | None = None,
+    search: str | None = None,
+) -> tuple[int, datetime | None]:
+    """(row count, newest updated_at) of the filtered list: a cheap validator for conditional GETs."""
+    q = _filtered(db, equipment_id=equipment_id, type_=type_, team_id=team_id, stage=stage, search=search)
+    count, last_modified = q.with_entities(
+        func.count(MaintenanceRequest.id), func.max(MaintenanceRequest.updated_at)
+    ).one()
+    return count, last_modified
+
+
+def iter_requests(
+    db: Session,
+    sort: str = "-updated_at",
+    equipment_id: str | None = None,
+    type_: str | None = None,
+    team_id: str | None = None,
+    stage: str | None = None,
+    search: str | None = None,
+) -> Iterator[MaintenanceRequest]:
+    """Every matching row, fetched through a server-side cursor STREAM_BATCH rows at a time."""
+    q = _filtered(db, equipment_id=equipment_id, type_=type_, team_id=team_id, stage=stage, search=search)
+    return iter(q.order_by(*sort_order(MaintenanceRequest, sort)).yield_per(STREAM_BATCH))
+
+
+def list_scheduled(
+    db: Session,
+    start: date,
+    end: date,
+    team_id: str | None = None,
+    type_: str | None = None,
+) -> list[MaintenanceRequest]:
+    """Requests whose scheduled_date falls in [start, end]: an index range scan with or without team_id."""
+    q = db.query(MaintenanceRequest).filter(
+        MaintenanceRequest.scheduled_date >= start,
+        MaintenanceRequest.scheduled_date <= end,
+    )
+    if team_id and team_id != "all":
+        q = q.filter(MaintenanceRequest.maintenance_team_id == team_id)
+    if type_ and type_ != "all":
+        q = q.filter(MaintenanceRequest.type == type_)
+    return q.order_by(MaintenanceRequest.scheduled_date, MaintenanceRequest.id).all()
+
+
+def work_queue(db: Session, user_id: str, limit: int = 200, columns: tuple[str, ...] | None = None) -> list:
+    """Open requests for a technician: assigned to them, or unassigned in one of their teams.
 
-    return q.order_by(MaintenanceRequest.updated_at.desc()).all()
+    There is no priority column, so work already in progress comes first, then corrective
+    (breakdown) before preventive, then by scheduled_date (unscheduled last) and age.
+    """
+    R = MaintenanceRequest
+    my_teams = select(TeamMember.team_id).where(TeamMember.user_id == user_id)
+    q = db.query(R).filter(
+        R.stage.in_(OPEN_STAGES),
+        or_(R.assigned_to_id == user_id, and_(R.assigned_to_id.is_(None), R.maintenance_team_id.in_(my_teams))),
+    )
+    priority = case(
+        (R.stage == RequestStage.in_progress, 0),
+        (R.type == RequestType.corrective, 1),
+        else_=2,
+    )
+    q = project(q, R, columns).order_by(priority, R.scheduled_date.asc().nulls_last(), R.created_at, R.id)
+    return q.limit(limit).all()
+
+
+def search_requests(
+    db: Session,
+    search: str,
+    limit: int = 50,
+    equipment_id: str | None = None,
+    type_: str | None = None,
+    team_id: str | None = None,
+    stage: str | None = None,
+) -> list[tuple[MaintenanceRequest, float, str | None]]:
+    """Relevance-ranked search returning (request, score, highlighted snippet) tuples."""
+    q = _filtered(db, equipment_id=equipment_id, type_=type_, team_id=team_id, stage=stage, search=search)
+
+    if search_.is_postgres(db):
+        score = search_.request_score(search).label("score")
+        headline = search_.request_headline(search).label("snippet")
+        rows = (
+            q.add_columns(score, headline)
+            .order_by(score.desc(), MaintenanceRequest.updated_at.desc())
+            .limit(limit)
+            .all()
+        )
+        # Prefer the description headline; fall back to the subject when only it matched.
+        return [
+            (r, float(sc), search_.headline(hl) or search_.highlight(r.subject, search))
+            for r, sc, hl in rows
+        ]
+
+    hits = [
+        (
+            r,
+            search_.python_score(search, r.subject, r.description),
+            search_.highlight(r.description, search) or search_.highlight(r.subject, search),
+        )
+        for r in q.all()
+    ]
+    hits.sort(key=lambda h: h[1], reverse=True)
+    return hits[:limit]
+
+
+def get_stamp(db: Session, request_id: str) -> datetime | None:
+    """updated_at of one row (None if it does not exist), read without loading the row."""
+    return db.query(MaintenanceRequest.updated_at).filter(MaintenanceRequest.id == request_id).scalar()
 
 
 def get(db: Session, request_id: str) -> MaintenanceRequest | None:
@@ -36,20 +189,95 @@ def get(db: Session, request_id: str) -> MaintenanceRequest | None:
 def create(db: Session, payload: dict) -> MaintenanceRequest:
     req = MaintenanceRequest(**payload)
     db.add(req)
+    db.flush()
+    events.emit(db, events.request_event("request.created", req))
     db.commit()
     db.refresh(req)
     return req
 
 
+def bulk_create(db: Session, rows: list[dict]) -> None:
+    """Insert many rows in one transaction using multi-row INSERTs; ids/timestamps come from column defaults."""
+    try:
+        db.execute(insert(MaintenanceRequest), rows)
+        # One summary event rather than one per row; subscribers refresh through /sync.
+        events.emit(db, {"type": "requests.imported", "count": len(rows)})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _update_event(req: MaintenanceRequest, before: RequestStage) -> dict:
+    after = RequestStage(req.stage)
+    if after != before:
+        return events.request_event("request.stage_changed", req, previousStage=before.value)
+    return events.request_event("request.updated", req)
+
+
 def update(db: Session, req: MaintenanceRequest, payload: dict) -> MaintenanceRequest:
+    before = req.stage
     for k, v in payload.items():
         setattr(req, k, v)
     db.add(req)
+    events.emit(db, _update_event(req, before))
     db.commit()
     db.refresh(req)
     return req
 
 
+def batch_update(db: Session, ids: list[str], payload: dict) -> tuple[list[MaintenanceRequest], list[str]]:
+    """Apply `payload` to every request in `ids` in one transaction, with the `PUT` rules:
+
+    - moving to `repaired` needs a duration, either in `payload` or already on each request, and
+      cannot clear it with an explicit null (raises ValueError otherwise);
+    - moving to `scrap` scraps the linked equipment (callers restrict this to admin/manager).
+
+    Returns (updated rows in `ids` order, missing ids); nothing is changed if any id is missing.
+    """
+    ids = list(dict.fromkeys(ids))
+    R = MaintenanceRequest
+    current = (
+        db.query(R.id, R.duration_hours, R.equipment_id, R.subject, R.stage)
+        .filter(R.id.in_(ids))
+        .with_for_update()
+        .all()
+    )
+    found = {r.id for r in current}
+    missing = [rid for rid in ids if rid not in found]
+    if missing:
+        db.rollback()
+        return [], missing
+
+    stage = payload.get("stage")
+    if stage == RequestStage.repaired.value and "duration_hours" in payload and payload["duration_hours"] is None:
+        db.rollback()
+        raise ValueError("durationHours cannot be null when marking as repaired")
+    if stage == RequestStage.repaired.value and not payload.get("duration_hours"):
+        without = [r.id for r in current if not r.duration_hours]
+        if without:
+            db.rollback()
+            raise ValueError(f"durationHours is required to mark as repaired (missing on {', '.join(without)})")
+
+    try:
+        if stage == RequestStage.scrap.value:
+            crud_equipment.scrap_many(db, {r.equipment_id: f"Scrap request: {r.subject}" for r in current})
+        rows = db.scalars(
+            update_(R).where(R.id.in_(ids)).values(**payload).returning(R),
+            execution_options={"synchronize_session": False},
+        ).all()
+        stages = {r.id: r.stage for r in current}
+        for row in rows:
+            events.emit(db, _update_event(row, stages[row.id]))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    by_id = {r.id: r for r in rows}
+    return [by_id[rid] for rid in ids], []
+
+
 def delete(db: Session, req: MaintenanceRequest) -> None:
     db.delete(req)
+    record_deletion(db, "requests", req.id)
     db.commit()
@@ -0,0 +1,136 @@
+"""Search helpers shared by the equipment and request list queries.
+
+On Postgres the filters are served by pg_trgm GIN indexes (substring `ILIKE` and
+typo-tolerant `%` similarity) and by the `maintenance_requests.search_vector`
+tsvector column (see migration 0003_search_indexes). Other dialects, e.g. a
+SQLite test database, fall back to plain `ILIKE` with scores and snippets
+computed in Python.
+
+Snippets are HTML: the matched text is escaped and only the HIGHLIGHT_START/STOP
+tags around hits are markup, so clients can render them as they are.
+"""
+
+import html
+import re
+from difflib import SequenceMatcher
+
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+
+TS_CONFIG = literal_column("'english'::regconfig")
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# ts_headline returns the raw text, so it marks hits with private-use characters (removed from the
+# text beforehand) that `headline` swaps for the tags once the rest is escaped.
+HEADLINE_START = "\ue000"
+HEADLINE_STOP = "\ue001"
+HEADLINE_OPTIONS = f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+# Generated column, only present on Postgres; not mapped on the model.
+request_search_vector = literal_column("maintenance_requests.search_vector", TSVECTOR)
+
+
+def is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _like(search: str) -> str:
+    return f"%{search.lower()}%"
+
+
+def equipment_filter(db: Session, search: str):
+    s = _like(search)
+    clause = (
+        Equipment.name.ilike(s)
+        | Equipment.serial_number.ilike(s)
+        | Equipment.owner_employee_name.ilike(s)
+    )
+    if is_postgres(db):
+        clause = clause | Equipment.name.bool_op("%")(search)
+    return clause
+
+
+def equipment_score(search: str):
+    """Postgres relevance expression: best trigram similarity over the searchable columns."""
+    return func.greatest(
+        func.similarity(Equipment.name, search),
+        func.similarity(Equipment.serial_number, search),
+        func.similarity(Equipment.owner_employee_name, search),
+    )
+
+
+def request_query(search: str):
+    return func.websearch_to_tsquery(TS_CONFIG, search)
+
+
+def request_filter(db: Session, search: str):
+    s = _like(search)
+    clause = or_(MaintenanceRequest.subject.ilike(s), MaintenanceRequest.description.ilike(s))
+    if is_postgres(db):
+        clause = or_(
+            clause,
+            request_search_vector.bool_op("@@")(request_query(search)),
+            MaintenanceRequest.subject.bool_op("%")(search),
+        )
+    return clause
+
+
+def request_score(search: str):
+    """Postgres relevance expression: weighted full-text rank plus subject similarity."""
+    return func.ts_rank_cd(request_search_vector, request_query(search)) + func.similarity(
+        MaintenanceRequest.subject, search
+    )
+
+
+def request_headline(search: str):
+    """Postgres headline of the description; pass the result through `headline`."""
+    text = func.translate(MaintenanceRequest.description, HEADLINE_START + HEADLINE_STOP, "")
+    return func.ts_headline(TS_CONFIG, text, request_query(search), HEADLINE_OPTIONS)
+
+
+def headline(raw: str | None) -> str | None:
+    """HTML snippet from a `request_headline` value, or None when it marks no hit."""
+    if not raw or HEADLINE_START not in raw:
+        return None
+    return html.escape(raw).replace(HEADLINE_START, HIGHLIGHT_START).replace(HEADLINE_STOP, HIGHLIGHT_STOP)
+
+
+def python_score(search: str, *values: str | None) -> float:
+    """Fallback relevance in [0, 1] for dialects without pg_trgm."""
+    needle = search.lower()
+    best = 0.0
+    for v in values:
+        if not v:
+            continue
+        hay = v.lower()
+        if hay == needle:
+            return 1.0
+        ratio = SequenceMatcher(None, needle, hay).ratio()
+        if needle in hay:
+            ratio = max(ratio, 0.5)
+        best = max(best, ratio)
+    return round(best, 4)
+
+
+def highlight(text: str | None, search: str, width: int = 160) -> str | None:
+    """HTML-escaped `text` with occurrences of `search` wrapped in <mark> tags, trimmed to a window
+    around the first hit."""
+    if not text:
+        return None
+    m = re.search(re.escape(search), text, flags=re.IGNORECASE)
+    if not m:
+        return None
+
+    start = max(0, m.start() - width // 2)
+    end = min(len(text), start + width)
+    window = text[start:end]
+    parts, last = [], 0
+    for hit in re.finditer(re.escape(search), window, flags=re.IGNORECASE):
+        parts += [html.escape(window[last : hit.start()]), HIGHLIGHT_START, html.escape(hit.group(0)), HIGHLIGHT_STOP]
+        last = hit.end()
+    marked = "".join(parts) + html.escape(window[last:])
+    return ("..." if start > 0 else "") + marked + ("..." if end < len(text) else "")
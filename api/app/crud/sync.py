@@ -0,0 +1,113 @@
+"""Delta sync: rows changed since a token, plus tombstones for deletions.
+
+The token holds one (updated_at, id) keyset position per entity, so each entity is paged
+independently along its (updated_at, id) index.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team import Team
+from app.models.tombstone import Tombstone
+from app.models.user import User
+
+ENTITIES = {
+    "equipment": Equipment,
+    "teams": Team,
+    "requests": MaintenanceRequest,
+    "users": User,
+}
+
+# Position before any row.
+_START = (datetime(1970, 1, 1), "")
+
+
+class TokenExpired(Exception):
+    """The token predates tombstone retention; the client must resync from scratch."""
+
+
+def encode_token(positions: dict[str, tuple[datetime, str]]) -> str:
+    raw = json.dumps({k: [v.isoformat(), i] for k, (v, i) in positions.items()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> dict[str, tuple[datetime, str]]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {k: (datetime.fromisoformat(v), str(i)) for k, (v, i) in data.items() if k in ENTITIES or k == "deleted"}
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid sync token")
+
+
+def record_deletion(db: Session, entity: str, entity_id: str) -> None:
+    """Add a tombstone in the caller's transaction (commit together with the delete)."""
+    db.add(Tombstone(entity=entity, entity_id=entity_id))
+
+
+def prune_tombstones(db: Session) -> int:
+    horizon = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    n = db.query(Tombstone).filter(Tombstone.deleted_at < horizon).delete(synchronize_session=False)
+    db.commit()
+    return n
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    # Timestamps are written as naive UTC; Postgres hands them back aware.
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _after(q, model, column, position: tuple[datetime, str], limit: int) -> tuple[list, tuple[datetime, str] | None]:
+    """Up to `limit` rows after `position` in (column, id) order, and the position to resume from
+    when more remain (None once caught up)."""
+    key = tuple_(column, model.id)
+    rows = q.filter(key > tuple_(*position)).order_by(column, model.id).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (_naive_utc(getattr(rows[-1], column.key)), rows[-1].id)
+
+
+def changes(db: Session, token: str | None, limit: int = 1000, entities: tuple[str, ...] = tuple(ENTITIES)) -> dict:
+    """Rows of `entities` changed after `token` (all rows when None), at most `limit` per entity.
+
+    Raises ValueError for a malformed token and TokenExpired for one older than tombstone retention.
+    """
+    now = datetime.utcnow()
+    rescan = now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+
+    if token:
+        positions = decode_token(token)
+        horizon = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if positions.get("deleted", _START)[0] < horizon:
+            raise TokenExpired()
+    else:
+        # A fresh replica has nothing to delete, so tombstones start from now.
+        positions = {"deleted": (rescan, "")}
+
+    out: dict = {"has_more": False}
+    next_positions: dict[str, tuple[datetime, str]] = {}
+
+    def scan(name: str, q, model, column) -> list:
+        rows, resume = _after(q, model, column, positions.get(name, _START), limit)
+        if resume:
+            out["has_more"] = True
+        # Once caught up, step back by the overlap so late commits are picked up next time.
+        next_positions[name] = resume or (rescan, "")
+        return rows
+
+    for name in entities:
+        model = ENTITIES[name]
+        out[name] = scan(name, db.query(model), model, model.updated_at)
+    tombstones = db.query(Tombstone).filter(Tombstone.entity.in_(entities))
+    out["deleted"] = scan("deleted", tombstones, Tombstone, Tombstone.deleted_at)
+
+    out["token"] = encode_token(next_positions)
+    return out
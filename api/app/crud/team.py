@@ -1,19 +1,65 @@
+from datetime import datetime
+
+from sqlalchemy import delete as delete_, func, insert
 from sqlalchemy.orm import Session
 
+from app.core import reference_cache
+from app.crud.sync import record_deletion
 from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.utils.pagination import keyset_page, project
+
+
+def list_teams(db: Session, columns: tuple[str, ...] | None = None) -> list:
+    """Entities, or plain rows of just `columns`; only the rows are cached (see reference_cache)."""
+    q = project(db.query(Team), Team, columns).order_by(Team.created_at.desc())
+    if columns is None:
+        return q.all()
+    return reference_cache.read_through(db, "teams", ("list", columns), q.all)
+
+
+def page_teams(
+    db: Session, limit: int, cursor: str | None = None, sort: str = "-created_at", columns: tuple[str, ...] | None = None
+) -> tuple[list, str | None]:
+    return keyset_page(project(db.query(Team), Team, columns, sort), Team, sort, limit, cursor)
+
 
+def list_stamp(db: Session) -> tuple[int, datetime | None]:
+    def load():
+        count, last_modified = db.query(func.count(Team.id), func.max(Team.updated_at)).one()
+        return count, last_modified
 
-def list_teams(db: Session) -> list[Team]:
-    return db.query(Team).order_by(Team.created_at.desc()).all()
+    return reference_cache.read_through(db, "teams", "stamp", load)
+
+
+def get_stamp(db: Session, team_id: str) -> datetime | None:
+    return reference_cache.read_through(
+        db, "teams", ("stamp", team_id), db.query(Team.updated_at).filter(Team.id == team_id).scalar
+    )
 
 
 def get(db: Session, team_id: str) -> Team | None:
-    return db.query(Team).filter(Team.id == team_id).first()
+    def load():
+        team = db.query(Team).filter(Team.id == team_id).first()
+        return reference_cache.columns(team) if team else None
+
+    data = reference_cache.read_through(db, "teams", ("get", team_id), load)
+    return reference_cache.attach(db, Team, data) if data is not None else None
+
+
+def _sync_members(db: Session, team_id: str, member_ids: list[str]) -> None:
+    """Rewrite the team's team_members rows to match `member_ids` (in the caller's transaction)."""
+    db.execute(delete_(TeamMember).where(TeamMember.team_id == team_id))
+    if member_ids:
+        db.execute(insert(TeamMember), [{"team_id": team_id, "user_id": uid} for uid in dict.fromkeys(member_ids)])
 
 
 def create(db: Session, name: str, member_ids: list[str]) -> Team:
     team = Team(name=name, member_ids=member_ids or [])
     db.add(team)
+    db.flush()
+    _sync_members(db, team.id, team.member_ids)
+    reference_cache.bump(db, "teams")
     db.commit()
     db.refresh(team)
     return team
@@ -24,7 +70,9 @@ def update(db: Session, team: Team, name: str | None = None, member_ids: list[st
         team.name = name
     if member_ids is not None:
         team.member_ids = member_ids
+        _sync_members(db, team.id, member_ids)
     db.add(team)
+    reference_cache.bump(db, "teams")
     db.commit()
     db.refresh(team)
     return team
@@ -32,4 +80,7 @@ def update(db: Session, team: Team, name: str | None = None, member_ids: list[st
 
 def delete(db: Session, team: Team) -> None:
     db.delete(team)
+    _sync_members(db, team.id, [])
+    record_deletion(db, "teams", team.id)
+    reference_cache.bump(db, "teams")
     db.commit()
@@ -1,7 +1,91 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core import reference_cache
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password, verify_and_update_password_async
+from app.crud.sync import record_deletion
+from app.db.session import run_db
+from app.models.tombstone import Tombstone
 from app.models.user import User, UserRole
+from app.utils.cache import TTLCache
+from app.utils.pagination import keyset_page, project
+
+# user id -> principal snapshot (see `snapshot`), used by get_current_user
+principal_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
+PRINCIPAL_FIELDS = ("id", "name", "email", "role", "created_at", "updated_at")
+
+# user id -> time.monotonic() until which tokens issued to that user may carry a stale role, name or
+# email: users updated or deleted within the last token lifetime. With AUTH_TRUST_TOKEN_CLAIMS their
+# claims are not trusted. A plain dict rather than an LRU: dropping an entry early would re-trust a
+# revoked token, and the dict never outgrows the users changed in one token lifetime.
+_changed_principals: dict[str, float] = {}
+_prune_at = 1024
+_missed = 0  # bumped whenever this worker may have missed a user change
+_loaded = -1  # value of _missed when _changed_principals was last rebuilt from the database
+
+
+def _token_lifetime() -> float:
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def _on_users_bump(user_id: str | None) -> None:
+    """reference_cache subscriber: runs in every worker for every committed user change."""
+    global _missed, _changed_principals, _prune_at
+    if user_id is None:
+        principal_cache.invalidate()
+        _missed += 1
+        return
+    principal_cache.invalidate(user_id)
+    now = time.monotonic()
+    _changed_principals[user_id] = now + _token_lifetime()
+    if len(_changed_principals) > _prune_at:
+        _changed_principals = {k: v for k, v in list(_changed_principals.items()) if v > now}
+        _prune_at = 2 * len(_changed_principals) + 1024
+
+
+reference_cache.on_bump("users", _on_users_bump)
+
+
+def load_changed_principals(db: Session) -> None:
+    """Rebuild the changed-principal markers from users.updated_at and user tombstones."""
+    global _changed_principals, _loaded
+    missed = _missed
+    since = datetime.utcnow() - timedelta(seconds=_token_lifetime())
+    updated = db.query(User.id).filter(User.updated_at >= since).all()
+    deleted = db.query(Tombstone.entity_id).filter(Tombstone.entity == "users", Tombstone.deleted_at >= since).all()
+    until = time.monotonic() + _token_lifetime()
+    # Keep markers set meanwhile by _on_users_bump.
+    _changed_principals = {**{user_id: until for (user_id,) in [*updated, *deleted]}, **_changed_principals}
+    _loaded = missed
+
+
+async def claims_trusted(db: Session | AsyncSession, user_id: str) -> bool:
+    """Whether `user_id`'s token claims may stand in for their row (AUTH_TRUST_TOKEN_CLAIMS).
+
+    Not for users updated or deleted within a token lifetime, and not while changes made in other
+    workers may not be reaching this one.
+    """
+    if not reference_cache.in_sync("users"):
+        return False
+    if _loaded != _missed:
+        await run_db(db, load_changed_principals)
+    return _changed_principals.get(user_id, 0.0) <= time.monotonic()
+
+
+def snapshot(user: User) -> dict:
+    """Plain copy of the non-secret columns, safe to share between requests."""
+    return {f: getattr(user, f) for f in PRINCIPAL_FIELDS}
+
+
+def from_snapshot(data: dict) -> User:
+    """Transient (session-less) User built from a snapshot or token claims."""
+    return User(**{**data, "role": UserRole(data["role"])})
 
 
 def get_by_email(db: Session, email: str) -> User | None:
@@ -12,40 +96,108 @@ def get(db: Session, user_id: str) -> User | None:
     return db.query(User).filter(User.id == user_id).first()
 
 
-def list_users(db: Session) -> list[User]:
-    return db.query(User).order_by(User.created_at.desc()).all()
+def list_users(db: Session, columns: tuple[str, ...] | None = None) -> list:
+    """Entities, or plain rows of just `columns` (which never need `password_hash`).
+
+    Only the rows are cached (see reference_cache).
+    """
+    q = project(db.query(User), User, columns).order_by(User.created_at.desc())
+    if columns is None:
+        return q.all()
+    return reference_cache.read_through(db, "users", ("list", columns), q.all)
 
 
-def create_user(db: Session, name: str, email: str, role: str, password: str) -> User:
+def list_stamp(db: Session) -> tuple[int, datetime | None]:
+    def load():
+        count, last_modified = db.query(func.count(User.id), func.max(User.updated_at)).one()
+        return count, last_modified
+
+    return reference_cache.read_through(db, "users", "stamp", load)
+
+
+def page_users(
+    db: Session, limit: int, cursor: str | None = None, sort: str = "-created_at", columns: tuple[str, ...] | None = None
+) -> tuple[list, str | None]:
+    return keyset_page(project(db.query(User), User, columns, sort), User, sort, limit, cursor)
+
+
+def create_user(
+    db: Session, name: str, email: str, role: str, password: str | None = None, password_hash: str | None = None
+) -> User:
+    """Pass `password_hash` when it was computed up front (async callers hash before entering the session)."""
     user = User(
         name=name,
         email=email,
         role=UserRole(role),
-        password_hash=get_password_hash(password),
+        password_hash=password_hash or get_password_hash(password),
     )
     db.add(user)
+    reference_cache.bump(db, "users")
     db.commit()
     db.refresh(user)
     return user
 
 
-def update_user(db: Session, user: User, name: str | None = None, role: str | None = None, password: str | None = None) -> User:
+def update_user(
+    db: Session,
+    user: User,
+    name: str | None = None,
+    role: str | None = None,
+    password: str | None = None,
+    password_hash: str | None = None,
+) -> User:
     if name is not None:
         user.name = name
     if role is not None:
         user.role = UserRole(role)
-    if password is not None:
+    if password_hash is not None:
+        user.password_hash = password_hash
+    elif password is not None:
         user.password_hash = get_password_hash(password)
     db.add(user)
+    # Keyed bump: every worker drops the cached principal and stops trusting its token claims.
+    reference_cache.bump(db, "users", user.id)
     db.commit()
     db.refresh(user)
     return user
 
 
+def delete_user(db: Session, user: User) -> None:
+    db.delete(user)
+    record_deletion(db, "users", user.id)
+    reference_cache.bump(db, "users", user.id)
+    db.commit()
+
+
+def _rehash(db: Session, user: User, new_hash: str) -> None:
+    user.password_hash = new_hash
+    db.add(user)
+    # updated_at moves, and with it the users list stamp.
+    reference_cache.bump(db, "users")
+    db.commit()
+    db.refresh(user)
+
+
 def authenticate(db: Session, email: str, password: str) -> User | None:
     user = get_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    ok, new_hash = verify_and_update_password(password, user.password_hash)
+    if not ok:
+        return None
+    if new_hash:
+        _rehash(db, user, new_hash)
+    return user
+
+
+async def authenticate_async(db: Session | AsyncSession, email: str, password: str) -> User | None:
+    """Like `authenticate`, but awaits bcrypt on the hashing pool instead of holding a worker thread."""
+    user = await run_db(db, get_by_email, email)
+    if not user:
+        return None
+    ok, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    if not ok:
         return None
+    if new_hash:
+        await run_db(db, _rehash, user, new_hash)
     return user
@@ -1,7 +1,9 @@
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
+from app.core import reference_cache
 from app.core.config import settings
 from app.core.security import get_password_hash
+from app.crud.sync import prune_tombstones
 from app.db.session import SessionLocal
 from app.models.user import User, UserRole
 
@@ -24,9 +26,22 @@ def init_demo_data() -> None:
             password_hash=get_password_hash(settings.DEMO_ADMIN_PASSWORD),
         )
         db.add(admin)
+        reference_cache.bump(db, "users")
         db.commit()
     except (OperationalError, ProgrammingError):
         # DB not ready / tables not created
         db.rollback()
     finally:
         db.close()
+
+
+def prune_sync_tombstones() -> None:
+    """Drop tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS (tokens that old get 410 anyway)."""
+    db = SessionLocal()
+    try:
+        prune_tombstones(db)
+    except (OperationalError, ProgrammingError):
+        # DB not ready / tables not created
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+"""Fast check of whether the database is already at the Alembic head.
+
+`alembic upgrade head` loads env.py and every model and sets up a migration context even when
+there is nothing to apply. start.sh runs this probe first and skips Alembic when it passes:
+
+    python -m app.db.migrations    # exit 0 at head; 1 when behind, ahead or unreachable
+
+It compares the `alembic_version` table with the head revisions, read from the migration
+scripts' `revision = ...` / `down_revision = ...` lines, so neither Alembic nor the app is
+imported (importing Alembic alone costs about as much as the rest of the probe).
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, pool, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+_ASSIGNMENT = re.compile(r"^(revision|down_revision)\b[^=]*=(.*)$", re.MULTILINE)
+_QUOTED = re.compile(r"[\"']([^\"']+)[\"']")
+
+
+def head_revisions() -> set[str]:
+    """Revisions that no other migration names as its down_revision."""
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        for name, value in _ASSIGNMENT.findall(path.read_text()):
+            (revisions if name == "revision" else parents).update(_QUOTED.findall(value))
+    return revisions - parents
+
+
+def current_revisions(url: str) -> set[str]:
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as conn:
+            return set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    heads = head_revisions()
+    try:
+        current = current_revisions(settings.DATABASE_URL)
+    except SQLAlchemyError as e:
+        # Missing alembic_version (fresh database) lands here too; Alembic will sort it out.
+        print(f"revision probe failed: {e.__class__.__name__}", file=sys.stderr)
+        sys.exit(1)
+    if current != heads:
+        print(f"database at {sorted(current) or 'no revision'}, head is {sorted(heads)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
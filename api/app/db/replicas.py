@@ -0,0 +1,189 @@
+"""Read replicas for read-only routes: health checks, failover and read-your-writes pinning.
+
+`get_read_db` asks `ReplicaSet.choose()` for a replica, round-robin over the healthy ones, and
+falls back to the primary when none is healthy. A background thread checks every replica each
+REPLICA_HEALTH_CHECK_SECONDS. A replica fails the check when it is unreachable, or when it lags
+the primary by more than REPLICA_MAX_LAG_SECONDS, and is used again once a check passes. A replica
+whose connection fails during a request is marked down at once instead of at the next check.
+
+After a user's successful write, their reads go to the primary for REPLICA_READ_YOUR_WRITES_SECONDS.
+The pin travels with the client rather than living in a worker: `ReadYourWritesMiddleware` adds a
+signed "primary-until" marker (`pin_token`) to the response, as the PIN_COOKIE cookie and the
+PIN_HEADER header, and `pinned` checks the one the next request sends back, whichever worker or
+host serves it. Browsers return the cookie on their own; other clients echo the header.
+"""
+
+import hashlib
+import hmac
+import itertools
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import token_subject
+
+logger = logging.getLogger(__name__)
+
+# Seconds a standby is behind: 0 once it has replayed all WAL it received, and for a server that
+# is not a standby at all (e.g. a second database standing in for a replica).
+LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "gearguard_primary_until"
+PIN_HEADER = "X-Primary-Until"
+
+
+class Replica:
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine | None = None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        # Same session options as the primary's SessionLocal / AsyncSessionLocal.
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.async_sessionmaker = (
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if async_engine else None
+        )
+        self.healthy = True
+        self.lag: float | None = None
+        self.error: str | None = None
+        self.checked_at: float | None = None
+
+    def probe(self) -> str | None:
+        """Run the health check; returns why the replica is unhealthy, or None."""
+        self.checked_at = time.time()
+        try:
+            with self.engine.connect() as conn:
+                sql = LAG_SQL.get(self.engine.dialect.name)
+                self.lag = float(conn.execute(text(sql)).scalar() or 0) if sql else 0.0
+        except Exception as e:
+            self.lag = None
+            return type(e).__name__
+        if self.lag > settings.REPLICA_MAX_LAG_SECONDS:
+            return f"lag {self.lag:.1f}s"
+        return None
+
+
+class ReplicaSet:
+    def __init__(self, replicas: list[Replica]):
+        self.replicas = replicas
+        self.failovers = 0
+        self.pinned_reads = 0
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Replica | None:
+        """A healthy replica, or None when reads should go to the primary."""
+        if not self.replicas:
+            return None
+        self._start()
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def mark_down(self, replica: Replica, error: str) -> None:
+        with self._lock:
+            was_healthy, replica.healthy, replica.error = replica.healthy, False, error
+            if was_healthy:
+                self.failovers += 1
+        if was_healthy:
+            logger.warning("replica %s marked down (%s); reading from the primary", replica.name, error)
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            error = replica.probe()
+            if error is not None:
+                self.mark_down(replica, error)
+            elif not replica.healthy:
+                replica.healthy, replica.error = True, None
+                logger.info("replica %s is healthy again", replica.name)
+
+    def _start(self) -> None:
+        # Started on first use rather than at import, so scripts and cold starts don't pay for it.
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.check_all()
+            time.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "failovers": self.failovers,
+            "pinnedReads": self.pinned_reads,
+            "replicas": [
+                {"name": r.name, "healthy": r.healthy, "lagSeconds": r.lag, "error": r.error, "checkedAt": r.checked_at}
+                for r in self.replicas
+            ],
+        }
+
+
+def _sign(user_id: str, until: int) -> str:
+    message = f"primary-until:{user_id}:{until}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+
+def pin_token(user_id: str) -> str:
+    """Marker sending `user_id`'s reads to the primary for REPLICA_READ_YOUR_WRITES_SECONDS."""
+    until = math.ceil(time.time() + settings.REPLICA_READ_YOUR_WRITES_SECONDS)
+    return f"{until}.{_sign(user_id, until)}"
+
+
+def pinned(user_id: str, token: str | None) -> bool:
+    """Whether `token` is an unexpired `pin_token(user_id)`. Wall-clock, so it holds across hosts."""
+    until, _, signature = (token or "").partition(".")
+    if not until.isdigit() or not hmac.compare_digest(signature, _sign(user_id, int(until))):
+        return False
+    return time.time() < int(until)
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware adding the pin to successful non-GET responses of bearer-token users."""
+
+    def __init__(self, app, replica_set: ReplicaSet):
+        self.app = app
+        self.replica_set = replica_set
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not self.replica_set:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # Status < 400 means the route returned, so its writes are committed.
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                user_id = token_subject(headers.get(b"authorization", b"").decode("latin-1"))
+                if user_id:
+                    token = pin_token(user_id)
+                    max_age = math.ceil(settings.REPLICA_READ_YOUR_WRITES_SECONDS)
+                    cookie = f"{PIN_COOKIE}={token}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (PIN_HEADER.lower().encode(), token.encode()),
+                        (b"set-cookie", cookie.encode()),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,11 +1,94 @@
+import functools
+
+from anyio import to_thread
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import metrics
+from app.core.config import async_url, settings
+from app.db.replicas import Replica, ReplicaSet
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    # In-memory SQLite needs its single-connection pool; everything else gets a timed QueuePool.
+    if make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
 
-from app.core.config import settings
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
+    **_pool_options(settings.DATABASE_URL, metrics.TimedQueuePool),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async stack, used by get_db when DB_ASYNC is enabled. The sync engine above is
+# still used by Alembic, startup seeding and scripts.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        pool_pre_ping=True,
+        **_pool_options(settings.async_database_url, metrics.TimedAsyncQueuePool),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read replicas, used by get_read_db. The health checks always go through the sync engine.
+replicas = ReplicaSet(
+    [
+        Replica(
+            f"replica{i}",
+            create_engine(url, pool_pre_ping=True, **_pool_options(url, metrics.TimedQueuePool)),
+            create_async_engine(
+                async_url(url), pool_pre_ping=True, **_pool_options(async_url(url), metrics.TimedAsyncQueuePool)
+            )
+            if settings.DB_ASYNC
+            else None,
+        )
+        for i, url in enumerate(settings.replica_urls)
+    ]
+)
+
+# Pools are always registered: the readiness probe checks them even with metrics off.
+metrics.register_pool("primary", engine.pool)
+if async_engine is not None:
+    metrics.register_pool("async", async_engine.pool)
+for replica in replicas.replicas:
+    metrics.register_pool(replica.name, replica.engine.pool)
+    if replica.async_engine is not None:
+        metrics.register_pool(f"{replica.name}_async", replica.async_engine.pool)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine, "primary")
+    if async_engine is not None:
+        metrics.instrument_engine(async_engine.sync_engine, "async")
+    for replica in replicas.replicas:
+        metrics.instrument_engine(replica.engine, replica.name)
+        if replica.async_engine is not None:
+            metrics.instrument_engine(replica.async_engine.sync_engine, f"{replica.name}_async")
+
+
+def read_sessionmaker(db: Session | AsyncSession) -> sessionmaker:
+    """Sync sessionmaker for the database `db` reads from (replica or primary), e.g. for streamed exports."""
+    replica = db.info.get("replica")
+    return replica.sessionmaker if replica is not None else SessionLocal
+
+
+async def run_db(db: Session | AsyncSession, fn, *args, **kwargs):
+    """Await a sync CRUD function `fn(db, *args, **kwargs)` without blocking the event loop.
+
+    With an AsyncSession the function runs through `run_sync`, so its queries go over the
+    async driver; with a sync Session it runs in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await to_thread.run_sync(functools.partial(fn, db, *args, **kwargs))
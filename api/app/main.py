@@ -1,10 +1,20 @@
-from fastapi import FastAPI
+from app.core import startup  # first, so the imports below are timed
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 
+startup.mark("import.framework")
 
+from app.core import metrics
 from app.core.config import settings
-from app.api.router import api_router
-from app.db.init_db import init_demo_data
+from app.api.router import include_routers
+from app.core.security import warm_pool
+from app.db.init_db import init_demo_data, prune_sync_tombstones
+from app.db.replicas import PIN_HEADER, ReadYourWritesMiddleware
+from app.db.session import engine, replicas
+
+startup.mark("import.app")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -24,10 +34,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PIN_HEADER],
 )
+app.add_middleware(ReadYourWritesMiddleware, replica_set=replicas)
+
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+include_routers(app, settings.API_V1_STR)
+startup.mark("app.build")
 
 @app.get("/healthz", include_in_schema=False)
 def healthz():
@@ -37,8 +54,39 @@ def healthz():
 def health():
     return {"status": "ok"}
 
+@app.get("/startupz", include_in_schema=False)
+def startupz():
+    # Import and startup phase timings (ms), plus background startup tasks still running.
+    return startup.report()
+
+@app.get("/readyz", include_in_schema=False)
+def readyz(response: Response):
+    # Not ready when a connection pool has no connection left to hand out, or the DB is unreachable.
+    exhausted = metrics.exhausted_pools()
+    if exhausted:
+        response.status_code = 503
+        return {"status": "unavailable", "exhaustedPools": exhausted}
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception:
+        response.status_code = 503
+        return {"status": "unavailable", "database": "unreachable"}
+    # Replicas are informational: with all of them down, reads still go to the primary.
+    return {"status": "ok", "replicas": replicas.stats()} if replicas else {"status": "ok"}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.on_event("startup")
 def on_startup():
     # Note: migrations are handled by start.sh in Docker.
-    # This only seeds demo users if enabled.
-    init_demo_data()
+    # This only seeds demo users if enabled and prunes old tombstones. Neither is needed to
+    # serve requests, so by default they run on a background thread (DEFER_STARTUP_TASKS),
+    # followed by the first-request costs: deferred imports and spawning the bcrypt pool.
+    tasks = [("startup.demo_data", init_demo_data), ("startup.prune_tombstones", prune_sync_tombstones)]
+    if settings.DEFER_STARTUP_TASKS:
+        tasks += [("startup.warm_imports", startup.warm_imports), ("startup.warm_hash_pool", warm_pool)]
+    startup.run(tasks, background=settings.DEFER_STARTUP_TASKS)
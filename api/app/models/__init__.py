@@ -1,4 +1,6 @@
 from app.models.user import User, UserRole
 from app.models.team import Team
+from app.models.team_member import TeamMember
 from app.models.equipment import Equipment
 from app.models.request import MaintenanceRequest, RequestType, RequestStage
+from app.models.tombstone import Tombstone
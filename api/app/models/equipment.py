@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Boolean
+from sqlalchemy import String, DateTime, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -10,6 +10,13 @@ from app.db.base import Base
 
 class Equipment(Base):
     __tablename__ = "equipment"
+    __table_args__ = (
+        Index("ix_equipment_created_at_id", "created_at", "id"),
+        Index("ix_equipment_updated_at_id", "updated_at", "id"),
+        Index("ix_equipment_category_created_at", "category", "created_at", "id"),
+        Index("ix_equipment_department_created_at", "department", "created_at", "id"),
+        Index("ix_equipment_active_created_at", "created_at", "id", postgresql_where=text("is_scrapped = false")),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name: Mapped[str] = mapped_column(String(120), nullable=False)
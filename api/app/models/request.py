@@ -1,9 +1,9 @@
 import enum
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, Enum, Float
+from sqlalchemy import String, Date, DateTime, Enum, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -21,8 +21,23 @@ class RequestStage(str, enum.Enum):
     scrap = "scrap"
 
 
+# Stages still waiting on a technician.
+OPEN_STAGES = (RequestStage.new, RequestStage.in_progress)
+
+
 class MaintenanceRequest(Base):
     __tablename__ = "maintenance_requests"
+    __table_args__ = (
+        Index("ix_maintenance_requests_created_at_id", "created_at", "id"),
+        Index("ix_maintenance_requests_updated_at_id", "updated_at", "id"),
+        Index("ix_maintenance_requests_team_scheduled_date", "maintenance_team_id", "scheduled_date"),
+        Index("ix_maintenance_requests_assigned_to_stage", "assigned_to_id", "stage"),
+        Index("ix_maintenance_requests_equipment_updated_at", "equipment_id", "updated_at", "id"),
+        Index("ix_maintenance_requests_team_updated_at", "maintenance_team_id", "updated_at", "id"),
+        Index("ix_maintenance_requests_stage_updated_at", "stage", "updated_at", "id"),
+        Index("ix_maintenance_requests_type_updated_at", "type", "updated_at", "id"),
+        Index("ix_maintenance_requests_scheduled_date", "scheduled_date", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 
@@ -35,7 +50,7 @@ class MaintenanceRequest(Base):
 
     maintenance_team_id: Mapped[str] = mapped_column(String(36), nullable=False)
 
-    scheduled_date: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # ISO date string
+    scheduled_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     duration_hours: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     assigned_to_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import String, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TeamMember(Base):
+    """One row per (team, user) in `Team.member_ids`, kept in step by crud.team.
+
+    `member_ids` stays the API representation; this table lets "which teams is this user in"
+    be answered from an index instead of scanning every team's JSON array.
+    """
+
+    __tablename__ = "team_members"
+    __table_args__ = (Index("ix_team_members_user_id_team_id", "user_id", "team_id"),)
+
+    team_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
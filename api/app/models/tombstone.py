@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Tombstone(Base):
+    """Record of a hard delete, so delta sync clients can drop the row from their copy."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_deleted_at_id", "deleted_at", "id"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)  # equipment|teams|requests|users
+    entity_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
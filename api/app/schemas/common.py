@@ -1,4 +1,17 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Annotated, Generic, TypeVar
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict
+
+T = TypeVar("T")
+
+
+def _iso(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+
+# Timestamps are exposed as ISO strings; ORM rows hold datetimes, so convert on the way in.
+IsoDateTime = Annotated[str, BeforeValidator(_iso)]
 
 
 def to_camel(s: str) -> str:
@@ -12,3 +25,29 @@ class APIModel(BaseModel):
         populate_by_name=True,
         alias_generator=to_camel,
     )
+
+
+class Page(APIModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class SearchHit(APIModel, Generic[T]):
+    item: T
+    score: float
+    snippet: str | None = None
+
+
+class ImportLineError(APIModel):
+    line: int
+    errors: list[str]
+
+
+class ImportResult(APIModel):
+    dry_run: bool
+    total: int
+    valid: int
+    inserted: int
+    failed: int
+    errors: list[ImportLineError]
+    errors_truncated: bool = False
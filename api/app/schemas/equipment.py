@@ -1,6 +1,6 @@
 from pydantic import Field
 
-from app.schemas.common import APIModel
+from app.schemas.common import APIModel, IsoDateTime
 
 
 class EquipmentOut(APIModel):
@@ -18,8 +18,8 @@ class EquipmentOut(APIModel):
     is_scrapped: bool = False
     scrapped_at: str | None = None
     scrapped_reason: str | None = None
-    created_at: str | None = None
-    updated_at: str | None = None
+    created_at: IsoDateTime | None = None
+    updated_at: IsoDateTime | None = None
 
 
 class EquipmentCreate(APIModel):
@@ -49,3 +49,21 @@ class EquipmentUpdate(APIModel):
     default_technician_id: str | None = None
     is_scrapped: bool | None = None
     scrapped_reason: str | None = None
+
+
+class EquipmentBatchUpdate(APIModel):
+    ids: list[str] = Field(min_length=1, max_length=1000)
+    maintenance_team_id: str | None = None
+    default_technician_id: str | None = None
+
+
+class LabelSheetIn(APIModel):
+    ids: list[str] | None = Field(default=None, max_length=20000)
+    search: str | None = None
+    category: str | None = None
+    department: str | None = None
+    status: str | None = "all"
+    format: str = Field(default="pdf", pattern="^(pdf|zip)$")
+    mode: str = Field(default="link", pattern="^(link|json)$")
+    columns: int = Field(default=3, ge=1, le=6)
+    rows: int = Field(default=7, ge=1, le=12)
@@ -0,0 +1,31 @@
+from app.schemas.common import APIModel
+
+
+class CountsOut(APIModel):
+    group_by: str
+    keys: list[str | None]
+    counts: list[int]
+
+
+class TimeseriesOut(APIModel):
+    bucket: str
+    buckets: list[str]
+    counts: list[int]
+
+
+class DurationStatsOut(APIModel):
+    group_by: str
+    keys: list[str | None]
+    counts: list[int]
+    avg: list[float]
+    p50: list[float]
+    p90: list[float]
+    p95: list[float]
+
+
+class SummaryOut(APIModel):
+    total_equipment: int
+    active_equipment: int
+    total_requests: int
+    open_requests: int
+    repaired_requests: int
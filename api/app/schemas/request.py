@@ -1,6 +1,8 @@
+from datetime import date
+
 from pydantic import Field
 
-from app.schemas.common import APIModel
+from app.schemas.common import APIModel, IsoDateTime
 
 
 class RequestOut(APIModel):
@@ -11,13 +13,13 @@ class RequestOut(APIModel):
     equipment_id: str
     equipment_category: str
     maintenance_team_id: str
-    scheduled_date: str | None = None
+    scheduled_date: date | None = None
     duration_hours: float | None = None
     assigned_to_id: str | None = None
     created_by_id: str
     stage: str
-    created_at: str | None = None
-    updated_at: str | None = None
+    created_at: IsoDateTime | None = None
+    updated_at: IsoDateTime | None = None
 
 
 class RequestCreate(APIModel):
@@ -27,7 +29,7 @@ class RequestCreate(APIModel):
     equipment_id: str
     equipment_category: str
     maintenance_team_id: str
-    scheduled_date: str | None = None
+    scheduled_date: date | None = None
     assigned_to_id: str | None = None
     created_by_id: str
 
@@ -36,7 +38,17 @@ class RequestUpdate(APIModel):
     type: str | None = None
     subject: str | None = None
     description: str | None = None
-    scheduled_date: str | None = None
+    scheduled_date: date | None = None
     duration_hours: float | None = None
     assigned_to_id: str | None = None
     stage: str | None = None
+
+
+class RequestBatchUpdate(APIModel):
+    """Changes applied to every request in `ids`; omitted fields are left alone, explicit nulls clear."""
+
+    ids: list[str] = Field(min_length=1, max_length=1000)
+    stage: str | None = Field(default=None, pattern="^(new|in_progress|repaired|scrap)$")
+    duration_hours: float | None = None
+    assigned_to_id: str | None = None
+    maintenance_team_id: str | None = None
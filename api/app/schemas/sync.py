@@ -0,0 +1,22 @@
+from app.schemas.common import APIModel, IsoDateTime
+from app.schemas.equipment import EquipmentOut
+from app.schemas.request import RequestOut
+from app.schemas.team import TeamOut
+from app.schemas.user import UserOut
+
+
+class TombstoneOut(APIModel):
+    entity: str
+    entity_id: str
+    deleted_at: IsoDateTime
+
+
+class SyncOut(APIModel):
+    equipment: list[EquipmentOut] = []
+    teams: list[TeamOut] = []
+    requests: list[RequestOut] = []
+    users: list[UserOut] = []
+    deleted: list[TombstoneOut] = []
+    token: str
+    # More changes are waiting: call again with `token` right away.
+    has_more: bool = False
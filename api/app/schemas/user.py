@@ -1,6 +1,6 @@
 from pydantic import EmailStr, Field
 
-from app.schemas.common import APIModel
+from app.schemas.common import APIModel, IsoDateTime
 
 
 class UserOut(APIModel):
@@ -8,8 +8,8 @@ class UserOut(APIModel):
     name: str
     email: EmailStr
     role: str
-    created_at: str | None = None
-    updated_at: str | None = None
+    created_at: IsoDateTime | None = None
+    updated_at: IsoDateTime | None = None
 
 
 class UserCreate(APIModel):
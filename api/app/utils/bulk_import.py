@@ -0,0 +1,178 @@
+"""Streaming CSV / NDJSON import: parse the request body incrementally, validate rows in
+chunks against a pydantic schema and hand each valid chunk to a bulk insert function.
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import DBAPIError
+
+CHUNK_SIZE = 2000
+MAX_ERRORS = 1000
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(fmt: str | None, content_type: str | None) -> str | None:
+    if fmt:
+        return fmt
+    ct = (content_type or "").split(";")[0].strip().lower()
+    if ct in ("text/csv", "application/csv"):
+        return "csv"
+    if ct in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 byte chunks into lines (newline kept), whatever the chunk boundaries."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | str]]:
+    header: list[str] | None = None
+    line_no = 0
+    start = 0
+    pending: list[str] = []
+    quotes = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending.append(line)
+        # A quoted field may span physical lines; the record ends once its quotes balance.
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        text, pending, quotes = "".join(pending), [], 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells mean "not provided", so optional fields fall back to their defaults.
+        yield start, {k: v for k, v in zip(header, values) if v != ""}
+    if pending:
+        yield start, "unterminated quoted field"
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | str]]:
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield line_no, f"invalid JSON: {e}"
+            continue
+        if not isinstance(value, dict):
+            yield line_no, "expected a JSON object"
+            continue
+        yield line_no, value
+
+
+def records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """(line number, row dict) per record, or (line number, error message) for unparsable ones."""
+    return _csv_records(chunks) if fmt == "csv" else _ndjson_records(chunks)
+
+
+def _messages(e: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+async def run_import(
+    rows: AsyncIterator[tuple[int, dict | str]],
+    schema: type[BaseModel],
+    insert: Callable[[list[dict]], Awaitable[None]],
+    dry_run: bool = False,
+    check: Callable[[BaseModel], str | None] | None = None,
+    prepare: Callable[[dict], dict] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """Validate rows against `schema` and `insert` them a chunk at a time.
+
+    `prepare` adjusts raw rows before validation, `check` applies business rules to a valid
+    row (returning an error message or None). When the database rejects a chunk, it is split
+    in halves and retried, down to single rows, so only the offending lines are reported and
+    the rest of the chunk is still inserted. With `dry_run` nothing is inserted; `valid`
+    still counts the rows that would have been.
+    """
+    total = valid = inserted = failed = 0
+    errors: list[dict] = []
+
+    def fail(line: int, messages: list[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_ERRORS:
+            errors.append({"line": line, "errors": messages})
+
+    chunk: list[tuple[int, dict]] = []
+
+    async def insert_or_split(part: list[tuple[int, dict]]) -> None:
+        nonlocal inserted
+        try:
+            await insert([values for _, values in part])
+            inserted += len(part)
+        except DBAPIError as e:
+            if len(part) == 1:
+                detail = str(e.orig).strip().splitlines()
+                fail(part[0][0], [f"database error: {detail[0] if detail else type(e.orig).__name__}"])
+                return
+            # A few bad rows cost O(bad * log(chunk)) extra round trips instead of the whole chunk.
+            half = len(part) // 2
+            await insert_or_split(part[:half])
+            await insert_or_split(part[half:])
+
+    async def flush() -> None:
+        if not chunk:
+            return
+        if not dry_run:
+            await insert_or_split(chunk)
+        chunk.clear()
+
+    async for line, row in rows:
+        total += 1
+        if isinstance(row, str):
+            fail(line, [row])
+            continue
+        try:
+            item = schema.model_validate(prepare(row) if prepare else row)
+        except ValidationError as e:
+            fail(line, _messages(e))
+            continue
+        problem = check(item) if check else None
+        if problem:
+            fail(line, [problem])
+            continue
+        valid += 1
+        chunk.append((line, item.model_dump(by_alias=False)))
+        if len(chunk) >= chunk_size:
+            await flush()
+    await flush()
+
+    return {
+        "dry_run": dry_run,
+        "total": total,
+        "valid": valid,
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU with per-entry TTL and a generation stamp.
+
+    Every invalidation bumps the generation. Readers capture `generation` before
+    loading from the database and pass it to `set`, so a value read before a
+    concurrent invalidation is never stored.
+
+    With `max_weight`, entries also carry a weight (e.g. the rows in a cached list) and
+    the least recently used are evicted until the total fits; a heavier entry is not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_weight: int | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._items: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < now:
+                if item is not None:
+                    del self._items[key]
+                    self._weight -= item[2]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None, weight: int = 1) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+            self._items[key] = (time.monotonic() + self.ttl_seconds, value, weight)
+            self._weight += weight
+            while len(self._items) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                self._weight -= self._items.popitem(last=False)[1][2]
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one key, or everything when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._items.clear()
+                self._weight = 0
+            else:
+                item = self._items.pop(key, None)
+                if item is not None:
+                    self._weight -= item[2]
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "weight": self._weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "generation": self._generation,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,82 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an If-None-Match header value matches `etag` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def make_etag(*parts) -> str:
+    """Weak validator over `parts` (for representations that are equivalent, not byte-identical)."""
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _utc(dt: datetime) -> datetime:
+    # Timestamps are written as naive UTC; Postgres hands them back aware.
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def http_date(dt: datetime) -> str:
+    return format_datetime(_utc(dt), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match, or failing that If-Modified-Since (RFC 9110 §13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return _utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def conditional(request: Request, response: Response, etag: str, last_modified: datetime | None) -> Response | None:
+    """Put the validators on `response`; return a 304 to send instead when the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def list_etag(request: Request, count: int, last_modified: datetime | None) -> str:
+    """Collection validator: row count, newest updated_at and the query string (filters, sort, page)."""
+    params = sorted(request.query_params.multi_items())
+    return make_etag(request.url.path, params, count, last_modified.isoformat() if last_modified else "")
+
+
+# Columns page_etag reads; add them to a projected page query with `stamped`.
+STAMP_COLUMNS = ("id", "updated_at")
+
+
+def stamped(columns: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(dict.fromkeys((*columns, *STAMP_COLUMNS)))
+
+
+def page_etag(request: Request, rows: list, next_cursor: str | None) -> str:
+    """Page validator from the page's own rows (ids and newest updated_at) and the query string.
+
+    Pages carry no Last-Modified: a row dropping off the page can leave the newest updated_at as it was.
+    """
+    params = sorted(request.query_params.multi_items())
+    newest = max((r.updated_at for r in rows), default=None)
+    return make_etag(request.url.path, params, [r.id for r in rows], newest.isoformat() if newest else "", next_cursor)
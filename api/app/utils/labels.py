@@ -0,0 +1,234 @@
+"""Bulk QR label sheets, streamed as a PDF or a ZIP of PNGs.
+
+QR matrices / PNGs are rendered in a process pool, a chunk of labels at a time, so
+memory stays bounded by the chunk size rather than the size of the archive.
+"""
+
+import io
+import multiprocessing
+import re
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from app.core.config import settings
+from app.utils.qr import dark_runs, equipment_payload, qr_matrix
+
+CHUNK_SIZE = 256
+
+# A4 portrait, in points.
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+PAGE_MARGIN = 24
+CAPTION_SIZE = 8
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that already runs threads (uvicorn, QR render pool) is unsafe.
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.QR_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _rendered(fn, items: Iterable, chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Map `fn` over `items` in the process pool, chunk by chunk, preserving order."""
+    pool = get_pool()
+    chunk: list = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield from pool.map(fn, chunk, chunksize=16)
+            chunk = []
+    if chunk:
+        yield from pool.map(fn, chunk, chunksize=16)
+
+
+# --- worker functions (must be importable for the process pool) ---
+
+
+def label_matrix(args: tuple[str, str]) -> list[str]:
+    equipment_id, mode = args
+    matrix = qr_matrix(equipment_payload(equipment_id, mode), border=0)
+    return ["".join("1" if m else "0" for m in row) for row in matrix]
+
+
+def label_png(args: tuple[str, str, str, str]) -> bytes:
+    from PIL import Image, ImageDraw, ImageFont
+
+    equipment_id, mode, name, serial_number = args
+    box, border, caption_h = 8, 4, 36
+    matrix = qr_matrix(equipment_payload(equipment_id, mode), border=border)
+    side = len(matrix) * box
+
+    img = Image.new("L", (side, side + caption_h), 255)
+    draw = ImageDraw.Draw(img)
+    for x, y, w in dark_runs(matrix):
+        draw.rectangle([x * box, y * box, (x + w) * box - 1, (y + 1) * box - 1], fill=0)
+
+    # Captions go in the band below the code: the 4-module border is the quiet zone scanners need.
+    font = ImageFont.load_default()
+    draw.text((border * box, side + 2), name, fill=0, font=font)
+    draw.text((border * box, side + 18), serial_number, fill=0, font=font)
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+# --- PDF ---
+
+
+def _pdf_text(s: str) -> str:
+    s = s.encode("latin-1", "replace").decode("latin-1")
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class _PDFWriter:
+    """Minimal streaming PDF writer: objects are emitted as soon as they are complete."""
+
+    CATALOG, PAGES, FONT = 1, 2, 3
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets: dict[int, int] = {}
+        self.next_id = 4
+        self.page_ids: list[int] = []
+
+    def _emit(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+
+    def _obj(self, num: int, body: bytes) -> bytes:
+        self.offsets[num] = self.offset
+        return self._emit(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+    def header(self) -> bytes:
+        out = self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        out += self._obj(self.CATALOG, b"<< /Type /Catalog /Pages 2 0 R >>")
+        out += self._obj(self.FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        return out
+
+    def page(self, content: bytes) -> bytes:
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self.page_ids.append(page_id)
+        data = zlib.compress(content)
+        out = self._obj(
+            content_id,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream",
+        )
+        out += self._obj(
+            page_id,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_id),
+        )
+        return out
+
+    def trailer(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % p for p in self.page_ids)
+        out = self._obj(self.PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)))
+
+        xref_at = self.offset
+        size = self.next_id
+        xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for num in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self.offsets[num])
+        xref.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at))
+        return out + self._emit(b"".join(xref))
+
+
+def _label_ops(matrix: list[str], name: str, serial_number: str, x0: float, y0: float, w: float, h: float) -> list[str]:
+    """PDF drawing operators for one label cell whose bottom-left corner is (x0, y0)."""
+    pad = 6
+    caption_h = 2 * (CAPTION_SIZE + 2)
+    side = min(w - 2 * pad, h - 2 * pad - caption_h)
+    n = len(matrix)
+    module = side / n
+    qx = x0 + (w - side) / 2
+    qy = y0 + pad + caption_h  # bottom of the QR square
+
+    ops = []
+    for x, y, run in dark_runs([[c == "1" for c in row] for row in matrix]):
+        ops.append(f"{qx + x * module:.2f} {qy + (n - y - 1) * module:.2f} {run * module:.2f} {module:.2f} re")
+    ops.append("f")
+
+    max_chars = int((w - 2 * pad) / (CAPTION_SIZE * 0.5))
+    for i, text in enumerate((name, serial_number)):
+        ty = y0 + pad + (CAPTION_SIZE + 2) * (1 - i)
+        ops.append(f"BT /F1 {CAPTION_SIZE} Tf {x0 + pad:.2f} {ty:.2f} Td ({_pdf_text(text[:max_chars])}) Tj ET")
+    return ops
+
+
+def stream_pdf(rows: list[tuple[str, str, str]], mode: str = "link", columns: int = 3, rows_per_page: int = 7) -> Iterator[bytes]:
+    """Yield a label-sheet PDF page by page. `rows` are (id, name, serial_number)."""
+    writer = _PDFWriter()
+    yield writer.header()
+
+    per_page = columns * rows_per_page
+    cell_w = (PAGE_WIDTH - 2 * PAGE_MARGIN) / columns
+    cell_h = (PAGE_HEIGHT - 2 * PAGE_MARGIN) / rows_per_page
+
+    ops: list[str] = []
+    matrices = _rendered(label_matrix, ((r[0], mode) for r in rows))
+    for i, ((_, name, serial_number), matrix) in enumerate(zip(rows, matrices)):
+        slot = i % per_page
+        col, row = slot % columns, slot // columns
+        x0 = PAGE_MARGIN + col * cell_w
+        y0 = PAGE_HEIGHT - PAGE_MARGIN - (row + 1) * cell_h
+        ops.extend(_label_ops(matrix, name, serial_number, x0, y0, cell_w, cell_h))
+        if slot == per_page - 1:
+            yield writer.page("\n".join(ops).encode("latin-1"))
+            ops = []
+
+    if ops or not writer.page_ids:
+        yield writer.page("\n".join(ops).encode("latin-1"))
+    yield writer.trailer()
+
+
+# --- ZIP ---
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only, non-seekable buffer that zipfile writes into and we drain after each entry."""
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+def _safe_name(s: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", s).strip("_") or "label"
+
+
+def stream_zip(rows: list[tuple[str, str, str]], mode: str = "link") -> Iterator[bytes]:
+    """Yield a ZIP of captioned PNG labels. `rows` are (id, name, serial_number)."""
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        pngs = _rendered(label_png, ((r[0], mode, r[1], r[2]) for r in rows))
+        for (equipment_id, _, serial_number), png in zip(rows, pngs):
+            zf.writestr(f"{_safe_name(serial_number)}_{equipment_id[:8]}.png", png)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+# Sort keys exposed by the list endpoints. Each one is backed by a
+# composite (column, id) index so keyset pages are index range scans.
+SORT_KEYS = ("created_at", "-created_at", "updated_at", "-updated_at")
+SORT_PATTERN = "^-?(created_at|updated_at)$"
+
+
+def encode_cursor(sort: str, value: datetime, row_id: str) -> str:
+    raw = json.dumps({"s": sort, "v": value.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = datetime.fromisoformat(data["v"])
+        row_id = str(data["id"])
+        cursor_sort = data["s"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match sort order")
+    return value, row_id
+
+
+def sort_order(model: Any, sort: str) -> tuple:
+    """ORDER BY clauses for `sort`, with id as tie-breaker so the order is total."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort key: {sort}")
+    column = getattr(model, sort.lstrip("-"))
+    if sort.startswith("-"):
+        return column.desc(), model.id.desc()
+    return column.asc(), model.id.asc()
+
+
+def project(q: Query, model: Any, columns: Iterable[str] | None, sort: str | None = None) -> Query:
+    """Select only `columns` as plain rows instead of full entities (no-op when None).
+
+    id and the sort column are always selected because keyset cursors are built from them.
+    """
+    if columns is None:
+        return q
+    names = dict.fromkeys(("id", *((sort.lstrip("-"),) if sort else ()), *columns))
+    return q.with_entities(*(getattr(model, n) for n in names))
+
+
+def keyset_page(
+    q: Query,
+    model: Any,
+    sort: str,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[Any], str | None]:
+    """Return one page of `q` ordered by (sort column, id) and the cursor for the next page."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort key: {sort}")
+
+    descending = sort.startswith("-")
+    column = getattr(model, sort.lstrip("-"))
+    key = tuple_(column, model.id)
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort)
+        q = q.filter(key < tuple_(value, row_id) if descending else key > tuple_(value, row_id))
+
+    rows = q.order_by(*sort_order(model, sort)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, getattr(last, column.key), last.id)
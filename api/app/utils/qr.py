@@ -1,27 +1,175 @@
+import asyncio
+import hashlib
 import io
 import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-import qrcode
+from app.core.config import settings
 
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
 
-def make_qr_png(payload: Any) -> bytes:
+
+def _encode(payload: Any) -> str:
     if isinstance(payload, (dict, list)):
-        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-    else:
-        data = str(payload)
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return str(payload)
+
+
+def _qr(data: str, box_size: int, border: int):
+    # qrcode pulls in Pillow; load both on the first render rather than at startup.
+    import qrcode
 
     qr = qrcode.QRCode(
         version=None,
         error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
+        box_size=box_size,
+        border=border,
     )
     qr.add_data(data)
     qr.make(fit=True)
+    return qr
 
-    img = qr.make_image(fill_color="black", back_color="white")
+
+def make_qr_png(payload: Any, box_size: int = 10, border: int = 4) -> bytes:
+    img = _qr(_encode(payload), box_size, border).make_image(fill_color="black", back_color="white")
 
     buf = io.BytesIO()
     img.save(buf, format="PNG")
     return buf.getvalue()
+
+
+def equipment_payload(equipment_id: str, mode: str = "link") -> Any:
+    if mode == "link":
+        return f"{settings.FRONTEND_BASE_URL.rstrip('/')}/scan/{equipment_id}"
+    return {"equipmentId": equipment_id}
+
+
+def qr_matrix(payload: Any, border: int = 4) -> list[list[bool]]:
+    """Module matrix (True = dark), border included."""
+    return _qr(_encode(payload), 1, border).get_matrix()
+
+
+def dark_runs(matrix: list[list[bool]]):
+    """Yield (x, y, width) for each horizontal run of dark modules."""
+    for y, row in enumerate(matrix):
+        x, n = 0, len(row)
+        while x < n:
+            if row[x]:
+                start = x
+                while x < n and row[x]:
+                    x += 1
+                yield start, y, x - start
+            else:
+                x += 1
+
+
+def make_qr_svg(payload: Any, box_size: int = 10, border: int = 4) -> bytes:
+    """Vector QR built straight from the module matrix (no Pillow involved)."""
+    matrix = qr_matrix(payload, border)
+    n = len(matrix)
+
+    # One horizontal run per stretch of dark modules keeps the path short.
+    parts = [f"M{x} {y}h{w}v1h-{w}z" for x, y, w in dark_runs(matrix)]
+
+    size = n * box_size
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+        f'<rect width="{n}" height="{n}" fill="#fff"/>'
+        f'<path fill="#000" d="{"".join(parts)}"/></svg>'
+    )
+    return svg.encode("utf-8")
+
+
+RENDERERS = {"png": make_qr_png, "svg": make_qr_svg}
+
+
+def qr_etag(payload: Any, fmt: str = "png", box_size: int = 10, border: int = 4) -> str:
+    """Strong validator derived from the inputs only, so it can be checked before rendering."""
+    key = f"{fmt}|{box_size}|{border}|{_encode(payload)}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class QRCache:
+    """Bounded in-memory LRU of rendered images, optionally backed by a directory on disk."""
+
+    def __init__(self, max_items: int, directory: str | None = None):
+        self.max_items = max_items
+        self.directory = directory
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, etag: str, fmt: str) -> str:
+        name = etag.strip('"')
+        return os.path.join(self.directory, f"{name}.{fmt}")
+
+    def get_memory(self, etag: str) -> bytes | None:
+        """In-memory lookup only: never touches the disk, so it is safe on the event loop."""
+        with self._lock:
+            data = self._items.get(etag)
+            if data is not None:
+                self._items.move_to_end(etag)
+            return data
+
+    def get(self, etag: str, fmt: str) -> bytes | None:
+        data = self.get_memory(etag)
+        if data is None and self.directory:
+            try:
+                with open(self._path(etag, fmt), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return None
+            self._remember(etag, data)
+        return data
+
+    def put(self, etag: str, fmt: str, data: bytes) -> None:
+        self._remember(etag, data)
+        if self.directory:
+            # Write-then-rename so concurrent readers never see a partial file.
+            path = self._path(etag, fmt)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def _remember(self, etag: str, data: bytes) -> None:
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._items[etag] = data
+            self._items.move_to_end(etag)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+qr_cache = QRCache(settings.QR_CACHE_SIZE, settings.QR_CACHE_DIR)
+
+# Dedicated pool so QR rendering does not occupy the request threadpool.
+# Threads rather than processes so every worker shares `qr_cache`.
+_render_pool = ThreadPoolExecutor(max_workers=settings.QR_RENDER_WORKERS, thread_name_prefix="qr-render")
+
+
+def render_qr(payload: Any, fmt: str = "png", box_size: int = 10, border: int = 4) -> tuple[bytes, str]:
+    """Return (image bytes, etag), rendering only on a cache miss."""
+    etag = qr_etag(payload, fmt, box_size, border)
+    data = qr_cache.get(etag, fmt)
+    if data is None:
+        data = RENDERERS[fmt](payload, box_size=box_size, border=border)
+        qr_cache.put(etag, fmt, data)
+    return data, etag
+
+
+async def render_qr_async(payload: Any, fmt: str = "png", box_size: int = 10, border: int = 4) -> tuple[bytes, str]:
+    etag = qr_etag(payload, fmt, box_size, border)
+    data = qr_cache.get_memory(etag)
+    if data is not None:
+        return data, etag
+    # The disk cache (QR_CACHE_DIR) is read by render_qr on the pool, off the event loop.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_render_pool, render_qr, payload, fmt, box_size, border)
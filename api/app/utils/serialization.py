@@ -0,0 +1,125 @@
+"""One-pass JSON for list responses.
+
+Returning pydantic models from a route with a `response_model` makes FastAPI dump them to dicts,
+validate those again, re-serialize and run `jsonable_encoder` before `json.dumps` - and the
+route had already validated every row once. List routes instead map ORM rows straight to
+camelCase dicts and let pydantic-core encode them. The rows come from our own tables, so they
+are not re-validated. The `response_model` stays on the route, so the OpenAPI schema is unchanged.
+
+`fields=` (see `parse_fields`) narrows both the SELECT, through `pagination.project`, and the JSON.
+`expand=` embeds related rows loaded in batches by crud.expand (see `Expanded`).
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.engine import Row
+
+# relation name -> (parent attribute holding the key, embedded schema, {key: row or rows}, one-to-many)
+Expanded = dict[str, tuple[str, type[BaseModel], dict[str, Any], bool]]
+
+FIELDS_HELP = "Comma-separated camelCase fields to return, e.g. id,subject,stage (id is always included)"
+
+
+@lru_cache(maxsize=None)
+def _plan(schema: type[BaseModel]) -> tuple[tuple[str, str, Any], ...]:
+    """(attribute, JSON key, default) per field of `schema`."""
+    fields = schema.model_fields.items()
+    return tuple((name, f.alias or name, f.get_default(call_default_factory=True)) for name, f in fields)
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...]:
+    """Attribute names for a `fields=` list of camelCase keys; every field of `schema` when omitted.
+
+    id is always included. Raises ValueError naming unknown fields.
+    """
+    plan = _plan(schema)
+    if not fields:
+        return tuple(name for name, _, _ in plan)
+    by_key = {key: name for name, key, _ in plan}
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in by_key]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *(by_key[f] for f in wanted)]))
+
+
+def _select(schema: type[BaseModel], columns: tuple[str, ...] | None) -> tuple[tuple[str, str, Any], ...]:
+    plan = _plan(schema)
+    if columns is None or len(columns) == len(plan):
+        return plan
+    wanted = set(columns)
+    return tuple(p for p in plan if p[0] in wanted)
+
+
+def row_dict(row: Any, plan: tuple[tuple[str, str, Any], ...]) -> dict:
+    # Projected queries return Rows; for entities, a loaded instance keeps its column values in
+    # __dict__, which is much cheaper to read than going through the ORM descriptors. Expired
+    # or deferred columns are loaded via getattr.
+    loaded = row._asdict() if isinstance(row, Row) else row.__dict__
+    out = {}
+    for name, key, default in plan:
+        value = loaded[name] if name in loaded else getattr(row, name, default)
+        if value is None:
+            value = default
+        elif isinstance(value, datetime):
+            # Same text as the schemas' IsoDateTime (pydantic would write "Z" for UTC).
+            value = value.isoformat()
+        out[key] = value
+    return out
+
+
+def _embed(items: list[dict], rows: list, expanded: Expanded) -> None:
+    for name, (key, schema, found, many) in expanded.items():
+        plan = _plan(schema)
+        for item, row in zip(items, rows):
+            hit = found.get(getattr(row, key))
+            if many:
+                item[name] = [row_dict(h, plan) for h in hit or ()]
+            else:
+                item[name] = row_dict(hit, plan) if hit is not None else None
+
+
+def dump_rows(
+    rows: Iterable[Any],
+    schema: type[BaseModel],
+    columns: tuple[str, ...] | None = None,
+    expanded: Expanded | None = None,
+) -> list[dict]:
+    """camelCase dicts of `rows`, limited to `columns` (see parse_fields) when given."""
+    plan = _select(schema, columns)
+    rows = list(rows)
+    items = [row_dict(r, plan) for r in rows]
+    if expanded:
+        _embed(items, rows, expanded)
+    return items
+
+
+def json_response(content: Any, response: Response) -> Response:
+    # A returned Response bypasses the injected one, so carry its headers (ETag etc.) over.
+    return Response(content=to_json(content), media_type="application/json", headers=dict(response.headers))
+
+
+def list_response(
+    rows: Iterable[Any],
+    schema: type[BaseModel],
+    response: Response,
+    columns: tuple[str, ...] | None = None,
+    expanded: Expanded | None = None,
+) -> Response:
+    return json_response(dump_rows(rows, schema, columns, expanded), response)
+
+
+def page_response(
+    rows: Iterable[Any],
+    schema: type[BaseModel],
+    next_cursor: str | None,
+    response: Response,
+    columns: tuple[str, ...] | None = None,
+    expanded: Expanded | None = None,
+) -> Response:
+    return json_response({"items": dump_rows(rows, schema, columns, expanded), "nextCursor": next_cursor}, response)
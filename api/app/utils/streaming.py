@@ -0,0 +1,83 @@
+"""Streamed list responses: rows go from a server-side cursor to the socket in small batches,
+so memory stays flat however many rows match.
+"""
+
+import csv
+import io
+from typing import Callable, Iterable, Iterator
+
+from pydantic import BaseModel
+
+from app.db.session import SessionLocal
+
+FORMATS = ("json", "ndjson", "csv")
+STREAM_PATTERN = "^(json|ndjson|csv)$"
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Rows encoded per chunk handed to the server.
+FLUSH_ROWS = 200
+
+
+def streamed(fn: Callable[..., Iterable], *args, session_factory: Callable = SessionLocal, **kwargs) -> Iterator:
+    """Run the CRUD iterator `fn(db, ...)` on a session of its own.
+
+    Dependency sessions are closed before a StreamingResponse body is sent, so the
+    stream opens one that lives exactly as long as the body. Pass `session_factory`
+    to read from the same database (replica or primary) as the request's session.
+    """
+    db = session_factory()
+    try:
+        yield from fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def _batched(lines: Iterator[str]) -> Iterator[bytes]:
+    buf: list[str] = []
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= FLUSH_ROWS:
+            yield "".join(buf).encode("utf-8")
+            buf = []
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def _ndjson(rows: Iterable, schema: type[BaseModel]) -> Iterator[str]:
+    for row in rows:
+        yield schema.model_validate(row).model_dump_json(by_alias=True) + "\n"
+
+
+def _json_array(rows: Iterable, schema: type[BaseModel]) -> Iterator[str]:
+    sep = "["
+    for row in rows:
+        yield sep + schema.model_validate(row).model_dump_json(by_alias=True)
+        sep = ","
+    yield "[]" if sep == "[" else "]"
+
+
+def _csv(rows: Iterable, schema: type[BaseModel]) -> Iterator[str]:
+    fields = [f.alias or name for name, f in schema.model_fields.items()]
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        data = schema.model_validate(row).model_dump(mode="json", by_alias=True)
+        # Booleans as in the JSON formats rather than Python's True/False.
+        writer.writerow({k: str(v).lower() if isinstance(v, bool) else v for k, v in data.items()})
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+_ENCODERS = {"json": _json_array, "ndjson": _ndjson, "csv": _csv}
+
+
+def encode_rows(rows: Iterable, schema: type[BaseModel], fmt: str) -> Iterator[bytes]:
+    return _batched(_ENCODERS[fmt](rows, schema))
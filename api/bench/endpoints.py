@@ -0,0 +1,456 @@
+"""Throughput and p50/p95/p99 latency of every router at fixed concurrency.
+
+Run against a fleet from `bench.fleet` (needs `pip install httpx`). Usage (from api/):
+
+    # in-process: requests go straight into the ASGI app, no sockets
+    python -m bench.endpoints --transport asgi --concurrency 1 16 64 --out results/asgi.json
+
+    # over HTTP, against a running server (e.g. uvicorn app.main:app --workers 4)
+    python -m bench.endpoints --transport http --base-url http://localhost:8000 --out results/http.json
+
+    # compare with an earlier run
+    python -m bench.endpoints --transport asgi --baseline results/asgi.json
+
+Each scenario runs `--concurrency` workers in a closed loop for `--warmup` + `--duration`
+seconds; only requests started after the warmup are measured. Every worker draws ids from the
+fleet with its own seeded RNG, so runs replay the same requests. Write scenarios (`--writes`)
+change the data, so re-seed before comparing runs that used them. The JSON written by `--out`
+holds the commit, settings and one record per scenario and concurrency; diff two files or pass
+one as `--baseline`. Routes no scenario covers are listed so the suite keeps up with the routers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, NamedTuple
+
+import httpx
+
+from bench.fleet import BENCH_EMAIL, BENCH_PASSWORD
+from bench.login_storm import pct
+
+API = "/api/v1"
+GROUP_BY = ("team", "category", "stage", "type")
+
+# Long-lived streams: a closed request loop does not measure them meaningfully.
+UNMEASURED = {("GET", f"{API}/events"), ("WEBSOCKET", f"{API}/events/ws")}
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    route: str  # path template as registered, used for the coverage report
+    build: Callable[[dict, random.Random], tuple[str, dict]]  # (samples, rng) -> (url, httpx kwargs)
+    as_: str = "admin"  # whose token: admin | technician | none
+    write: bool = False
+
+
+def _get(url: str, **params) -> Callable[[dict, random.Random], tuple[str, dict]]:
+    """Builder for a fixed GET; `{kind}` placeholders are filled with a random sample id."""
+
+    def build(s: dict, rnd: random.Random) -> tuple[str, dict]:
+        path = re.sub(r"{(\w+)}", lambda m: rnd.choice(s[m.group(1)]), url)
+        return path, {"params": {k: (v(s, rnd) if callable(v) else v) for k, v in params.items()}}
+
+    return build
+
+
+def _pick(kind: str):
+    return lambda s, rnd: rnd.choice(s[kind])
+
+
+def _window(s: dict, rnd: random.Random) -> str:
+    return (date(2024, 1, 1) + timedelta(days=rnd.randrange(0, 690))).isoformat()
+
+
+def _calendar(s: dict, rnd: random.Random) -> tuple[str, dict]:
+    start = date(2024, 1, 1) + timedelta(days=rnd.randrange(0, 690))
+    end = start + timedelta(days=35)
+    params = {"start": start.isoformat(), "end": end.isoformat(), "teamId": rnd.choice(s["team"])}
+    return f"{API}/requests/calendar", {"params": params}
+
+
+def _json(url: str, body: Callable[[dict, random.Random], dict]):
+    def build(s: dict, rnd: random.Random) -> tuple[str, dict]:
+        path = re.sub(r"{(\w+)}", lambda m: rnd.choice(s[m.group(1)]), url)
+        return path, {"json": body(s, rnd)}
+
+    return build
+
+
+def _login(s: dict, rnd: random.Random) -> tuple[str, dict]:
+    return f"{API}/auth/login", {"json": {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}}
+
+
+def _request_create(s: dict, rnd: random.Random) -> dict:
+    return {
+        "type": "corrective",
+        "subject": "Bench request",
+        "description": "Created by bench.endpoints",
+        "equipmentId": rnd.choice(s["equipment"]),
+        "equipmentCategory": "CNC",
+        "maintenanceTeamId": rnd.choice(s["team"]),
+        "createdById": s["admin"],
+    }
+
+
+SCENARIOS = [
+    Scenario("health", "GET", "/health", _get("/health"), as_="none"),
+    Scenario("auth.login", "POST", f"{API}/auth/login", _login, as_="none"),
+    Scenario("auth.me", "GET", f"{API}/auth/me", _get(f"{API}/auth/me")),
+    Scenario("auth.principal_cache", "GET", f"{API}/auth/principal-cache", _get(f"{API}/auth/principal-cache")),
+    Scenario("auth.reference_cache", "GET", f"{API}/auth/reference-cache", _get(f"{API}/auth/reference-cache")),
+    Scenario("users.page", "GET", f"{API}/users", _get(f"{API}/users", limit=50)),
+    Scenario("users.list", "GET", f"{API}/users", _get(f"{API}/users")),
+    Scenario("users.me", "GET", f"{API}/users/me", _get(f"{API}/users/me")),
+    Scenario("teams.list", "GET", f"{API}/teams", _get(f"{API}/teams")),
+    Scenario("teams.get", "GET", f"{API}/teams/{{team_id}}", _get(f"{API}/teams/{{team}}")),
+    Scenario("equipment.page", "GET", f"{API}/equipment", _get(f"{API}/equipment", limit=50)),
+    Scenario(
+        "equipment.page_filtered",
+        "GET",
+        f"{API}/equipment",
+        _get(f"{API}/equipment", limit=50, status="active", category=_pick("category"), sort="updated_at"),
+    ),
+    Scenario(
+        "equipment.page_fields",
+        "GET",
+        f"{API}/equipment",
+        _get(f"{API}/equipment", limit=200, fields="id,name,category"),
+    ),
+    Scenario(
+        "equipment.page_expand",
+        "GET",
+        f"{API}/equipment",
+        _get(f"{API}/equipment", limit=50, expand="team,technician"),
+    ),
+    Scenario("equipment.search", "GET", f"{API}/equipment/search", _get(f"{API}/equipment/search", search="pump unit")),
+    Scenario("equipment.get", "GET", f"{API}/equipment/{{equipment_id}}", _get(f"{API}/equipment/{{equipment}}")),
+    Scenario(
+        "equipment.get_expand",
+        "GET",
+        f"{API}/equipment/{{equipment_id}}",
+        _get(f"{API}/equipment/{{equipment}}", expand="team,technician,requests"),
+    ),
+    Scenario("requests.page", "GET", f"{API}/requests", _get(f"{API}/requests", limit=50)),
+    Scenario(
+        "requests.page_filtered",
+        "GET",
+        f"{API}/requests",
+        _get(f"{API}/requests", limit=50, team_id=_pick("team"), stage="in_progress"),
+    ),
+    Scenario(
+        "requests.by_equipment", "GET", f"{API}/requests", _get(f"{API}/requests", equipment_id=_pick("equipment"))
+    ),
+    Scenario(
+        "requests.page_expand",
+        "GET",
+        f"{API}/requests",
+        _get(f"{API}/requests", limit=50, expand="team,assignee,equipment"),
+    ),
+    Scenario("requests.search", "GET", f"{API}/requests/search", _get(f"{API}/requests/search", search="leak line")),
+    Scenario("requests.calendar", "GET", f"{API}/requests/calendar", _calendar),
+    Scenario("requests.get", "GET", f"{API}/requests/{{request_id}}", _get(f"{API}/requests/{{request}}")),
+    Scenario(
+        "requests.get_expand",
+        "GET",
+        f"{API}/requests/{{request_id}}",
+        _get(f"{API}/requests/{{request}}", expand="team,assignee,equipment"),
+    ),
+    Scenario(
+        "public.equipment",
+        "GET",
+        f"{API}/public/equipment/{{equipment_id}}",
+        _get(f"{API}/public/equipment/{{equipment}}"),
+        as_="none",
+    ),
+    Scenario(
+        "public.qr",
+        "GET",
+        f"{API}/public/equipment/{{equipment_id}}/qr",
+        _get(f"{API}/public/equipment/{{equipment}}/qr"),
+        as_="none",
+    ),
+    Scenario("reports.summary", "GET", f"{API}/reports/summary", _get(f"{API}/reports/summary")),
+    Scenario(
+        "reports.counts",
+        "GET",
+        f"{API}/reports/requests/counts",
+        _get(f"{API}/reports/requests/counts", group_by=lambda s, rnd: rnd.choice(GROUP_BY)),
+    ),
+    Scenario(
+        "reports.timeseries",
+        "GET",
+        f"{API}/reports/requests/timeseries",
+        _get(f"{API}/reports/requests/timeseries", bucket="week", start=_window),
+    ),
+    Scenario(
+        "reports.durations",
+        "GET",
+        f"{API}/reports/requests/durations",
+        _get(f"{API}/reports/requests/durations", group_by="category"),
+    ),
+    Scenario("sync.initial", "GET", f"{API}/sync", _get(f"{API}/sync", limit=1000)),
+    Scenario("events.stats", "GET", f"{API}/events/stats", _get(f"{API}/events/stats")),
+    Scenario("me.queue", "GET", f"{API}/me/queue", _get(f"{API}/me/queue"), as_="technician"),
+    Scenario(
+        "equipment.labels",
+        "POST",
+        f"{API}/equipment/labels",
+        _json(f"{API}/equipment/labels", lambda s, rnd: {"ids": rnd.sample(s["equipment"], 21)}),
+    ),
+    Scenario("requests.create", "POST", f"{API}/requests", _json(f"{API}/requests", _request_create), write=True),
+    Scenario(
+        "requests.update",
+        "PUT",
+        f"{API}/requests/{{request_id}}",
+        _json(f"{API}/requests/{{request}}", lambda s, rnd: {"description": f"Updated {rnd.random()}"}),
+        write=True,
+    ),
+    Scenario(
+        "teams.update",
+        "PUT",
+        f"{API}/teams/{{team_id}}",
+        _json(f"{API}/teams/{{team}}", lambda s, rnd: {"name": f"Team {rnd.randrange(1000)}"}),
+        write=True,
+    ),
+    Scenario(
+        "equipment.update",
+        "PUT",
+        f"{API}/equipment/{{equipment_id}}",
+        _json(f"{API}/equipment/{{equipment}}", lambda s, rnd: {"location": f"Hall {rnd.randrange(40)}"}),
+        write=True,
+    ),
+    Scenario(
+        "requests.batch",
+        "PATCH",
+        f"{API}/requests/batch",
+        _json(
+            f"{API}/requests/batch",
+            lambda s, rnd: {"ids": rnd.sample(s["request"], 20), "durationHours": round(rnd.uniform(1, 8), 1)},
+        ),
+        write=True,
+    ),
+    Scenario(
+        "equipment.batch",
+        "PATCH",
+        f"{API}/equipment/batch",
+        _json(
+            f"{API}/equipment/batch",
+            lambda s, rnd: {"ids": rnd.sample(s["equipment"], 20), "maintenanceTeamId": rnd.choice(s["team"])},
+        ),
+        write=True,
+    ),
+]
+
+
+def routes() -> set[tuple[str, str]]:
+    from app.api.router import ROUTERS
+
+    found = set()
+    for router, prefix, _ in ROUTERS:
+        for route in router.routes:
+            for method in getattr(route, "methods", None) or {"WEBSOCKET"}:
+                found.add((method, API + prefix + route.path))
+    return found
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    r = await client.post(f"{API}/auth/login", json={"email": email, "password": password})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['accessToken']}"}
+
+
+async def samples(client: httpx.AsyncClient, headers: dict, n: int) -> dict:
+    """Ids to draw from, read through the API so both transports see the same fleet."""
+
+    async def ids(path: str, **params) -> list[dict]:
+        r = await client.get(f"{API}{path}", headers=headers, params=params)
+        r.raise_for_status()
+        body = r.json()
+        return body["items"] if isinstance(body, dict) else body
+
+    equipment = await ids("/equipment", limit=n, fields="id,category")
+    requests = await ids("/requests", limit=n, fields="id")
+    users = await ids("/users", limit=500, fields="id,email,role")
+    teams = await ids("/teams", fields="id")
+    me = (await client.get(f"{API}/auth/me", headers=headers)).json()
+    missing = [k for k, v in (("equipment", equipment), ("requests", requests), ("teams", teams)) if not v]
+    if missing:
+        raise SystemExit(f"no {', '.join(missing)} to benchmark; seed a fleet with bench.fleet first")
+    return {
+        "equipment": [e["id"] for e in equipment],
+        "category": sorted({e["category"] for e in equipment}),
+        "request": [r["id"] for r in requests],
+        "team": [t["id"] for t in teams],
+        "admin": me["id"],
+        "technicians": [u["email"] for u in users if u["role"] == "technician"],
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    s: dict,
+    headers: dict,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    until = measure_from + duration
+
+    async def worker(i: int) -> None:
+        rnd = random.Random(i)
+        while time.perf_counter() < until:
+            url, kwargs = scenario.build(s, rnd)
+            t = time.perf_counter()
+            try:
+                r = await client.request(scenario.method, url, headers=headers, **kwargs)
+                status = str(r.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if t >= measure_from:
+                latencies.append((time.perf_counter() - t) * 1000)
+                statuses[status] += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+    # null rather than NaN when nothing finished in time, so the file stays valid JSON
+    stat = (lambda v: round(v, 2)) if latencies else (lambda v: None)
+    return {
+        "scenario": scenario.name,
+        "method": scenario.method,
+        "route": scenario.route,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": dict(statuses),
+        "rps": round(len(latencies) / duration, 1),
+        "p50": stat(pct(latencies, 50)),
+        "p95": stat(pct(latencies, 95)),
+        "p99": stat(pct(latencies, 99)),
+        "max": stat(max(latencies, default=0)),
+    }
+
+
+def commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        before = {(r["scenario"], r["concurrency"]): r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}:")
+    for r in results:
+        old = before.get((r["scenario"], r["concurrency"]))
+        if not old:
+            continue
+        deltas = "  ".join(
+            f"{k} {(r[k] - old[k]) / old[k] * 100:+6.1f}%" if old[k] and r[k] is not None else f"{k}     n/a"
+            for k in ("rps", "p50", "p99")
+        )
+        print(f"{r['scenario']:>24} c={r['concurrency']:<4} {deltas}")
+
+
+async def run(args) -> None:
+    if args.transport == "asgi":
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+    else:
+        transport = None
+        base_url = args.base_url
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        admin = await login(client, args.email, args.password)
+        s = await samples(client, admin, args.samples)
+        tokens = {"admin": admin, "none": {}}
+        tokens["technician"] = await login(client, s["technicians"][0], args.password) if s["technicians"] else admin
+
+        chosen = [
+            sc
+            for sc in SCENARIOS
+            if (args.writes or not sc.write) and (not args.only or any(re.search(p, sc.name) for p in args.only))
+        ]
+        uncovered = sorted(routes() - {(sc.method, sc.route) for sc in SCENARIOS} - UNMEASURED)
+        results = []
+        print(f"{'scenario':>24} {'conc':>5} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}  errors")
+        for concurrency in args.concurrency:
+            for sc in chosen:
+                r = await drive(client, sc, s, tokens[sc.as_], concurrency, args.duration, args.warmup)
+                results.append(r)
+                ms = " ".join(f"{r[k]:>7.1f}ms" if r[k] is not None else f"{'-':>9}" for k in ("p50", "p95", "p99"))
+                print(
+                    f"{r['scenario']:>24} {concurrency:>5} {r['requests']:>7} {r['rps']:>8.1f} {ms}  "
+                    + (f"{r['errors']} {r['statuses']}" if r["errors"] else "0"),
+                    flush=True,
+                )
+        summary = (await client.get(f"{API}/reports/summary", headers=admin)).json()
+
+    if uncovered:
+        print("\nroutes without a scenario: " + ", ".join(f"{m} {p}" for m, p in uncovered))
+    report = {
+        "commit": commit(),
+        "startedAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "transport": args.transport,
+        "baseUrl": None if args.transport == "asgi" else args.base_url,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "writes": args.writes,
+        "fleet": summary,
+        "uncovered": [f"{m} {p}" for m, p in uncovered],
+        "results": results,
+    }
+    if args.baseline:
+        compare(results, args.baseline)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.out}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    ap.add_argument("--base-url", default="http://localhost:8000")
+    ap.add_argument("--email", default=BENCH_EMAIL)
+    ap.add_argument("--password", default=BENCH_PASSWORD)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[16])
+    ap.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    ap.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--samples", type=int, default=500, help="ids of each kind to draw requests from")
+    ap.add_argument("--only", nargs="+", metavar="REGEX", help="run scenarios whose name matches")
+    ap.add_argument("--writes", action="store_true", help="include scenarios that change data")
+    ap.add_argument("--out", help="write results as JSON")
+    ap.add_argument("--baseline", help="JSON from an earlier run to compare with")
+    asyncio.run(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Deterministic synthetic fleet for benchmarks: users, teams, equipment and requests.
+
+Usage (from api/, against the database in DATABASE_URL, migrated to head):
+
+    python -m bench.fleet --reset --users 5000 --teams 50 --equipment 100000 --requests 2000000
+
+The same `--seed` always produces the same rows (ids included), so runs on different commits
+measure the same data. Rows go in with multi-row INSERTs in batches of `--batch`. Every user
+can log in with BENCH_PASSWORD; BENCH_EMAIL is an admin.
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, text
+
+from app.core import reference_cache
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.tombstone import Tombstone
+from app.models.user import User, UserRole
+
+BENCH_EMAIL = "bench-admin@gearguard.dev"
+BENCH_PASSWORD = "Bench@12345"
+
+CATEGORIES = ["CNC", "HVAC", "Forklift", "Press", "IT", "Compressor", "Conveyor", "Pump"]
+SUBJECTS = ["Noise", "Leak", "Overheating", "Calibration", "Inspection"]
+DEPARTMENTS = ["Production", "Assembly", "Logistics", "Facilities", "IT", "Quality", "Packaging", "R&D"]
+# Most requests are closed; open work is the minority the partial indexes target.
+STAGES = ["new"] * 8 + ["in_progress"] * 7 + ["repaired"] * 75 + ["scrap"] * 10
+ROLES = [UserRole.technician] * 6 + [UserRole.requester] * 3 + [UserRole.manager]
+
+# Children first, so deletes never trip a foreign key.
+TABLES = (Tombstone, MaintenanceRequest, Equipment, TeamMember, Team, User)
+
+
+def reset(db) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("TRUNCATE " + ", ".join(m.__tablename__ for m in TABLES)))
+    else:
+        for model in TABLES:
+            db.execute(delete(model))
+    _bump_reference_cache(db)
+    db.commit()
+
+
+def _bump_reference_cache(db) -> None:
+    # Rows written with bulk INSERTs bypass the CRUD functions; tell running servers directly.
+    for ns in reference_cache.NAMESPACES:
+        reference_cache.bump(db, ns)
+
+
+def _id(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+
+def _batches(db, model, rows, batch: int) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == batch:
+            db.execute(insert(model), chunk)
+            db.commit()
+            chunk = []
+    if chunk:
+        db.execute(insert(model), chunk)
+        db.commit()
+
+
+def seed(
+    db,
+    users: int = 200,
+    teams: int = 20,
+    equipment: int = 10_000,
+    requests: int = 100_000,
+    seed: int = 42,
+    batch: int = 5000,
+    log=None,
+) -> None:
+    """Insert a fleet of the given size. Expects no earlier fleet in the database (see `reset`)."""
+    if db.query(User.id).filter(User.email == BENCH_EMAIL).first():
+        raise ValueError(f"{BENCH_EMAIL} already exists; reset the database before seeding again")
+    log = log or (lambda msg: None)
+    rnd = random.Random(seed)
+    t0 = datetime(2024, 1, 1)
+    # One hash for everyone: hashing thousands of bcrypt passwords would dominate seeding.
+    password_hash = get_password_hash(BENCH_PASSWORD)
+
+    user_ids = [_id(rnd) for _ in range(max(users, 1))]
+    user_rows = []
+    for i, uid in enumerate(user_ids):
+        created = t0 + timedelta(minutes=i)
+        user_rows.append(
+            {
+                "id": uid,
+                "name": f"Bench user {i}",
+                "email": BENCH_EMAIL if i == 0 else f"bench-user-{i}@gearguard.dev",
+                "role": UserRole.admin if i == 0 else rnd.choice(ROLES),
+                "password_hash": password_hash,
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+    _batches(db, User, user_rows, batch)
+    log(f"users: {len(user_rows)}")
+
+    team_ids = [_id(rnd) for _ in range(max(teams, 1))]
+    memberships = {tid: rnd.sample(user_ids, min(len(user_ids), rnd.randrange(4, 16))) for tid in team_ids}
+    team_rows = [{"id": tid, "name": f"Team {i}", "member_ids": memberships[tid]} for i, tid in enumerate(team_ids)]
+    _batches(db, Team, team_rows, batch)
+    member_rows = [{"team_id": tid, "user_id": u} for tid, members in memberships.items() for u in members]
+    _batches(db, TeamMember, member_rows, batch)
+    log(f"teams: {len(team_ids)}")
+
+    equipment_ids = [_id(rnd) for _ in range(max(equipment, 1))]
+
+    def equipment_rows():
+        for i, eid in enumerate(equipment_ids):
+            created = t0 + timedelta(minutes=rnd.randrange(0, 1_000_000))
+            category = rnd.choice(CATEGORIES)
+            team = rnd.choice(team_ids)
+            yield {
+                "id": eid,
+                "name": f"{category} unit {i}",
+                "serial_number": f"SN-{i:09d}",
+                "category": category,
+                "department": rnd.choice(DEPARTMENTS),
+                "owner_employee_name": f"Employee {rnd.randrange(5000)}",
+                "purchase_date": "2023-01-01",
+                "warranty_expiry": "2026-01-01",
+                "location": f"Hall {rnd.randrange(40)}",
+                "maintenance_team_id": team,
+                "default_technician_id": rnd.choice(memberships[team]),
+                "is_scrapped": rnd.random() < 0.05,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    _batches(db, Equipment, equipment_rows(), batch)
+    log(f"equipment: {len(equipment_ids)}")
+
+    def request_rows():
+        for i in range(requests):
+            created = t0 + timedelta(minutes=rnd.randrange(0, 1_000_000))
+            rtype = rnd.choice(["corrective", "corrective", "preventive"])
+            scheduled = (created + timedelta(days=rnd.randrange(60))).date() if rtype == "preventive" else None
+            stage = rnd.choice(STAGES)
+            team = rnd.choice(team_ids)
+            yield {
+                "id": _id(rnd),
+                "type": rtype,
+                "subject": f"{rnd.choice(SUBJECTS)} on line {rnd.randrange(60)}",
+                "description": "Synthetic request " * rnd.randrange(2, 40),
+                "equipment_id": rnd.choice(equipment_ids),
+                "equipment_category": rnd.choice(CATEGORIES),
+                "maintenance_team_id": team,
+                "scheduled_date": scheduled,
+                "duration_hours": round(rnd.uniform(0.5, 12), 2) if stage == "repaired" else None,
+                "assigned_to_id": rnd.choice(memberships[team]) if rnd.random() < 0.7 else None,
+                "created_by_id": rnd.choice(user_ids),
+                "stage": stage,
+                "created_at": created,
+                "updated_at": created + timedelta(hours=rnd.randrange(0, 500)),
+            }
+            if i and i % 100_000 == 0:
+                log(f"requests: {i}")
+
+    _batches(db, MaintenanceRequest, request_rows(), batch)
+    log(f"requests: {requests}")
+
+    _bump_reference_cache(db)
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("ANALYZE"))
+    db.commit()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=5000)
+    ap.add_argument("--teams", type=int, default=50)
+    ap.add_argument("--equipment", type=int, default=100_000)
+    ap.add_argument("--requests", type=int, default=2_000_000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--batch", type=int, default=5000)
+    ap.add_argument(
+        "--reset", action="store_true", help="empty the fleet tables first (all of their rows, not just bench ones)"
+    )
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        if args.reset:
+            reset(db)
+        seed(
+            db,
+            users=args.users,
+            teams=args.teams,
+            equipment=args.equipment,
+            requests=args.requests,
+            seed=args.seed,
+            batch=args.batch,
+            log=lambda msg: print(f"{time.perf_counter() - started:8.1f}s  {msg}", flush=True),
+        )
+        counts = {m.__tablename__: db.query(func.count()).select_from(m).scalar() for m in TABLES[1:]}
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+    print(f"done in {time.perf_counter() - started:.1f}s: {counts}")
+
+
+if __name__ == "__main__":
+    main()
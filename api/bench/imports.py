@@ -0,0 +1,130 @@
+"""Bulk import throughput: rows/s through POST /api/v1/equipment/import.
+
+Needs the bench admin from `bench.fleet` (any fleet size) and `pip install httpx`. Usage (from api/):
+
+    python -m bench.imports --rows 100000
+    python -m bench.imports --rows 100000 --bad-every 500 --format ndjson
+    python -m bench.imports --transport http --base-url http://localhost:8000 --rows 100000
+
+The body is generated in memory and sent in 64 KiB chunks, like a client streaming a file.
+`--bad-every N` makes every Nth row one the database rejects (a category longer than the
+column allows; Postgres enforces that, SQLite does not), to measure the cost of splitting
+rejected chunks. Imported rows are deleted afterwards unless `--keep` is given.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from sqlalchemy import delete
+
+from bench.fleet import BENCH_EMAIL, BENCH_PASSWORD
+from app.db.session import SessionLocal
+from app.models.equipment import Equipment
+
+API = "/api/v1"
+PREFIX = "IMP-"
+BODY_CHUNK = 64 * 1024
+FIELDS = (
+    "name", "serialNumber", "category", "department", "ownerEmployeeName",
+    "purchaseDate", "warrantyExpiry", "location", "maintenanceTeamId", "defaultTechnicianId",
+)
+
+
+def row(i: int, bad: bool) -> dict:
+    return {
+        "name": f"Imported {i}",
+        "serialNumber": f"{PREFIX}{i:09d}",
+        "category": "X" * 200 if bad else "CNC",
+        "department": "Production",
+        "ownerEmployeeName": "Jane Doe",
+        "purchaseDate": "2024-01-01",
+        "warrantyExpiry": "2027-01-01",
+        "location": "Hall A",
+        "maintenanceTeamId": "00000000-0000-0000-0000-000000000000",
+        "defaultTechnicianId": "00000000-0000-0000-0000-000000000000",
+    }
+
+
+def body(rows: int, fmt: str, bad_every: int) -> bytes:
+    def is_bad(i: int) -> bool:
+        return bool(bad_every) and i % bad_every == bad_every - 1
+
+    if fmt == "ndjson":
+        return "".join(json.dumps(row(i, is_bad(i))) + "\n" for i in range(rows)).encode()
+    lines = [",".join(FIELDS)]
+    lines += [",".join(row(i, is_bad(i))[f] for f in FIELDS) for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def chunks(data: bytes):
+    for i in range(0, len(data), BODY_CHUNK):
+        yield data[i : i + BODY_CHUNK]
+
+
+def cleanup() -> int:
+    db = SessionLocal()
+    try:
+        n = db.execute(delete(Equipment).where(Equipment.serial_number.like(f"{PREFIX}%"))).rowcount
+        db.commit()
+        return n
+    finally:
+        db.close()
+
+
+async def run(args) -> dict:
+    if args.transport == "asgi":
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+    else:
+        transport, base_url = None, args.base_url
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as client:
+        r = await client.post(f"{API}/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        if r.status_code != 200:
+            raise SystemExit("bench admin cannot log in; seed with `python -m bench.fleet` first")
+        headers = {
+            "Authorization": f"Bearer {r.json()['accessToken']}",
+            "Content-Type": "text/csv" if args.format == "csv" else "application/x-ndjson",
+        }
+        data = body(args.rows, args.format, args.bad_every)
+        t = time.perf_counter()
+        r = await client.post(f"{API}/equipment/import", content=chunks(data), headers=headers)
+        elapsed = time.perf_counter() - t
+    r.raise_for_status()
+    result = r.json()
+    return {
+        "rows": args.rows,
+        "format": args.format,
+        "seconds": round(elapsed, 3),
+        "rowsPerSecond": round(args.rows / elapsed),
+        "inserted": result["inserted"],
+        "failed": result["failed"],
+        "megabytes": round(len(data) / 1e6, 1),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    ap.add_argument("--bad-every", type=int, default=0, help="make every Nth row one the database rejects")
+    ap.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    ap.add_argument("--base-url", default="http://localhost:8000")
+    ap.add_argument("--keep", action="store_true", help="leave the imported rows in place")
+    args = ap.parse_args()
+
+    result = asyncio.run(run(args))
+    print(
+        f"{result['rows']} {result['format']} rows ({result['megabytes']} MB) in {result['seconds']} s: "
+        f"{result['rowsPerSecond']} rows/s, {result['inserted']} inserted, {result['failed']} failed"
+    )
+    if not args.keep:
+        print(f"removed {cleanup()} imported rows")
+
+
+if __name__ == "__main__":
+    main()
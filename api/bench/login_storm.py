@@ -0,0 +1,75 @@
+"""Latency of a cheap route while a burst of logins hits the API.
+
+Run against a live server (needs `pip install httpx`):
+
+    python -m bench.login_storm --base-url http://localhost:8000 \\
+        --email admin@gearguard.dev --password Admin@123 --logins 400 --duration 10
+
+Prints p50/p95/p99 of `GET --probe` with and without the login storm running.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def pct(samples: list[float], p: float) -> float:
+    if not samples:
+        return float("nan")
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(p) - 1] if len(samples) > 1 else samples[0]
+
+
+async def probe(client: httpx.AsyncClient, path: str, headers: dict, until: float, out: list[float]) -> None:
+    while time.perf_counter() < until:
+        t = time.perf_counter()
+        await client.get(path, headers=headers)
+        out.append((time.perf_counter() - t) * 1000)
+
+
+async def storm(client: httpx.AsyncClient, email: str, password: str, n: int, statuses: dict) -> None:
+    async def one():
+        r = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(n)))
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.logins + args.probes)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        r = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['accessToken']}"}
+
+        for label, with_storm in (("baseline", False), ("login storm", True)):
+            samples: list[float] = []
+            statuses: dict[int, int] = {}
+            until = time.perf_counter() + args.duration
+            tasks = [probe(client, args.probe, headers, until, samples) for _ in range(args.probes)]
+            if with_storm:
+                tasks.append(storm(client, args.email, args.password, args.logins, statuses))
+            await asyncio.gather(*tasks)
+            print(
+                f"{label:>12}: {len(samples):6d} probes  p50={pct(samples, 50):7.1f}ms  "
+                f"p95={pct(samples, 95):7.1f}ms  p99={pct(samples, 99):7.1f}ms"
+                + (f"  logins={statuses}" if with_storm else "")
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--probe", default="/health")
+    parser.add_argument("--probes", type=int, default=8, help="concurrent probe loops")
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--duration", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
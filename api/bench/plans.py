@@ -0,0 +1,228 @@
+"""Query-plan regression check: EXPLAIN every filter combination the list routes expose and fail
+if a plan falls back to a sequential scan of a large table.
+
+Needs Postgres migrated to head (DATABASE_URL). `tests/test_query_plans.py` runs the same check
+under pytest; by hand (from api/):
+
+    python -m bench.plans --seed-equipment 50000 --seed-requests 300000
+    python -m bench.plans            # re-check existing data (e.g. a bench.fleet database)
+
+The SQL checked is whatever the CRUD functions actually emit (captured from the engine), so the
+suite follows the code. Small tables always seq-scan; `--min-rows` sets what counts as large.
+Unpaged lists return every match, so they may scan the table they list unless `equipmentId`
+narrows it. Exits 1 when any plan regresses, printing the offending route, filters and plan.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import event, func
+
+from app.crud import equipment as crud_equipment
+from app.crud import expand as crud_expand
+from app.crud import request as crud_request
+from app.db.session import SessionLocal, engine
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.schemas.equipment import EquipmentOut
+from app.schemas.request import RequestOut
+from app.utils.pagination import SORT_KEYS
+from app.utils.serialization import parse_fields
+from bench import fleet
+
+NONE: frozenset[str] = frozenset()
+
+
+def captured(db, fn, *args, **kwargs) -> list[tuple[str, dict]]:
+    """Run `fn` and return the SELECT statements (with parameters) it sent to the database."""
+    statements: list[tuple[str, dict]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        fn(db, *args, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def seq_scans(plan: dict, large: set[str]) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in large:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child, large))
+    return found
+
+
+def index_names(plan: dict) -> set[str]:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        found |= index_names(child)
+    return found
+
+
+def explain(db, statement: str, parameters) -> dict:
+    raw = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+def samples(db) -> dict:
+    """Filter values that exist in the data, as a client would send them."""
+    return {
+        "equipment_id": db.query(MaintenanceRequest.equipment_id).limit(1).scalar(),
+        "team_id": db.query(Team.id).limit(1).scalar(),
+        "technician": db.query(TeamMember.user_id).limit(1).scalar(),
+        "category": db.query(Equipment.category).limit(1).scalar(),
+        "department": db.query(Equipment.department).limit(1).scalar(),
+    }
+
+
+def cases(s: dict):
+    """(label, fn, kwargs, tables that may be seq-scanned) for every filter combination of the list
+    and search routes, plus the other lookups."""
+    request_filters = {
+        "equipment_id": s["equipment_id"],
+        "type_": "corrective",
+        "team_id": s["team_id"],
+        "stage": "in_progress",
+        "search": "leak",
+    }
+    request_columns = parse_fields(None, RequestOut)
+    for r in range(len(request_filters) + 1):
+        for combo in itertools.combinations(request_filters, r):
+            filters = {k: request_filters[k] for k in combo}
+            for sort in SORT_KEYS:
+                kwargs = dict(limit=50, sort=sort, columns=request_columns, **filters)
+                yield f"GET /requests?limit=50 sort={sort}", crud_request.page_requests, kwargs, NONE
+            # Unpaged lists return every match; a seq scan is right unless the filter is selective.
+            full = NONE if "equipment_id" in combo else {"maintenance_requests"}
+            yield "GET /requests", crud_request.list_requests, dict(columns=request_columns, **filters), full
+            yield "GET /requests (validators)", crud_request.list_stamp, filters, full
+            if "search" in combo:
+                yield "GET /requests/search", crud_request.search_requests, dict(limit=50, **filters), NONE
+
+    equipment_filters = {"search": "pump", "category": s["category"], "department": s["department"]}
+    equipment_columns = parse_fields(None, EquipmentOut)
+    for r in range(len(equipment_filters) + 1):
+        for combo in itertools.combinations(equipment_filters, r):
+            for status in ("all", "active", "scrapped"):
+                filters = {k: equipment_filters[k] for k in combo} | {"status": status}
+                for sort in SORT_KEYS:
+                    kwargs = dict(limit=50, sort=sort, columns=equipment_columns, **filters)
+                    yield f"GET /equipment?limit=50 sort={sort}", crud_equipment.page_equipment, kwargs, NONE
+                full = {"equipment"}
+                yield "GET /equipment", crud_equipment.list_equipment, dict(columns=equipment_columns, **filters), full
+                yield "GET /equipment (validators)", crud_equipment.list_stamp, filters, full
+                if "search" in combo:
+                    yield "GET /equipment/search", crud_equipment.search_equipment, dict(limit=50, **filters), NONE
+
+    yield "GET /me/queue", crud_request.work_queue, dict(user_id=s["technician"], columns=request_columns), NONE
+    start = date(2024, 6, 1)
+    for team_id, type_ in itertools.product((None, s["team_id"]), (None, "preventive")):
+        window = dict(start=start, end=start + timedelta(days=31), team_id=team_id, type_=type_)
+        yield "GET /requests/calendar", crud_request.list_scheduled, window, NONE
+    yield "GET /requests/{id}", crud_request.get, dict(request_id=str(uuid.uuid4())), NONE
+    yield "GET /equipment/{id}", crud_equipment.get, dict(equipment_id=str(uuid.uuid4())), NONE
+    parents = [Equipment(id=str(uuid.uuid4()), maintenance_team_id="", default_technician_id="") for _ in range(50)]
+    kwargs = dict(kind="equipment", rows=parents, relations=("requests",))
+    yield "expand=requests", crud_expand.load, kwargs, NONE
+
+
+def required_indexes():
+    """(label, fn, kwargs, index) whose plan must use that index. A partial index is only usable when
+    the query's WHERE clause implies its predicate, which "no seq scan" alone does not show."""
+    columns = parse_fields(None, EquipmentOut)
+    for sort in ("created_at", "-created_at"):
+        kwargs = dict(limit=50, sort=sort, status="active", columns=columns)
+        label = f"GET /equipment?status=active&limit=50 sort={sort}"
+        yield label, crud_equipment.page_equipment, kwargs, "ix_equipment_active_created_at"
+
+
+def used_indexes(db, fn, **kwargs) -> set[str]:
+    """Indexes in the plans of the statements `fn` sends."""
+    used = set()
+    for statement, parameters in captured(db, fn, **kwargs):
+        used |= index_names(explain(db, statement, parameters))
+    db.rollback()
+    return used
+
+
+def table_sizes(db) -> dict[str, int]:
+    return {
+        "equipment": db.query(func.count(Equipment.id)).scalar(),
+        "maintenance_requests": db.query(func.count(MaintenanceRequest.id)).scalar(),
+    }
+
+
+def check(db, min_rows: int, log=None) -> tuple[int, list[str]]:
+    """EXPLAIN every case; returns (statements explained, a report per sequentially-scanned plan).
+
+    `log(line)` also gets a line for every plan that passed."""
+    large = {t for t, n in table_sizes(db).items() if n >= min_rows}
+    checked, failures = 0, []
+    for label, fn, kwargs, full in cases(samples(db)):
+        for statement, parameters in captured(db, fn, **kwargs):
+            checked += 1
+            plan = explain(db, statement, parameters)
+            scans = seq_scans(plan, large - full)
+            filters = {k: v for k, v in kwargs.items() if k not in ("columns", "rows")}
+            if scans:
+                failures.append(f"SEQ SCAN {','.join(scans)}: {label} {filters}\n{json.dumps(plan, indent=2)[:4000]}")
+            elif log:
+                log(f"ok: {label} {filters}")
+        db.rollback()
+    if "equipment" in large:
+        for label, fn, kwargs, index in required_indexes():
+            used = used_indexes(db, fn, **kwargs)
+            if index not in used:
+                failures.append(f"{index} NOT USED: {label} (plan uses {sorted(used) or 'no index'})")
+            elif log:
+                log(f"ok: {label} uses {index}")
+    return checked, failures
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seed-equipment", type=int, default=0)
+    ap.add_argument("--seed-requests", type=int, default=0)
+    ap.add_argument(
+        "--min-rows", type=int, default=10_000, help="tables with at least this many rows must not be seq-scanned"
+    )
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            sys.exit("bench.plans needs Postgres (DATABASE_URL)")
+        if args.seed_equipment or args.seed_requests:
+            try:
+                fleet.seed(db, equipment=args.seed_equipment, requests=args.seed_requests)
+            except ValueError as e:
+                sys.exit(str(e))
+
+        sizes = table_sizes(db)
+        large = sorted(t for t, n in sizes.items() if n >= args.min_rows)
+        print(f"rows: {sizes}; checking seq scans on {large or 'nothing (seed more data)'}")
+
+        checked, failures = check(db, args.min_rows, log=print if args.verbose else None)
+        for failure in failures:
+            print(failure)
+        print(f"{checked} statements explained, {len(failures)} with sequential scans")
+    finally:
+        db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare /reports aggregation against the list-and-aggregate path the web client uses.
+
+Usage (from api/, against the database in DATABASE_URL, migrated to head):
+
+    python -m bench.reports --seed 200000 --repeat 5
+
+`--seed` bulk-inserts synthetic requests first; omit it to benchmark existing data.
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.crud import report as crud_report
+from app.crud.request import list_requests
+from app.db.session import SessionLocal
+from app.models.request import MaintenanceRequest
+from app.schemas.request import RequestOut
+
+COLUMNS = list(RequestOut.model_fields)
+
+
+def seed(db, n: int, batch: int = 5000) -> None:
+    rnd = random.Random(42)
+    teams = [str(uuid.uuid4()) for _ in range(20)]
+    t0 = datetime(2025, 1, 1)
+    for off in range(0, n, batch):
+        rows = []
+        for _ in range(min(batch, n - off)):
+            created = t0 + timedelta(minutes=rnd.randrange(0, 525600))
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "type": rnd.choice(["corrective", "preventive"]),
+                    "subject": "Synthetic request",
+                    "description": "x" * rnd.randrange(50, 1200),
+                    "equipment_id": str(uuid.uuid4()),
+                    "equipment_category": rnd.choice(["CNC", "HVAC", "Forklift", "Press", "IT"]),
+                    "maintenance_team_id": rnd.choice(teams),
+                    "duration_hours": rnd.choice([None, rnd.uniform(0.5, 12)]),
+                    "created_by_id": str(uuid.uuid4()),
+                    "stage": rnd.choice(["new", "in_progress", "repaired", "scrap"]),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        db.execute(insert(MaintenanceRequest), rows)
+        db.commit()
+
+
+def list_and_aggregate(db) -> int:
+    """What the browser does today: download every row as JSON, then count per team/category/stage/type."""
+    items = list_requests(db)
+    body = json.dumps([{c: getattr(r, c) for c in COLUMNS} for r in items], default=str)
+    for attr in ("maintenance_team_id", "equipment_category", "stage", "type"):
+        Counter(getattr(r, attr) for r in items)
+    return len(body)
+
+
+def server_side(db) -> int:
+    size = 0
+    for group_by in ("team", "category", "stage", "type"):
+        size += len(json.dumps(crud_report.request_counts(db, group_by)))
+    size += len(json.dumps(crud_report.duration_stats(db, "team")))
+    size += len(json.dumps(crud_report.request_timeseries(db, "week")))
+    return size
+
+
+def timed(fn, db, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        t = time.perf_counter()
+        size = fn(db)
+        best = min(best, time.perf_counter() - t)
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.seed)
+        rows = db.query(MaintenanceRequest).count()
+        for name, fn in (("list+aggregate", list_and_aggregate), ("reports", server_side)):
+            secs, size = timed(fn, db, args.repeat)
+            print(f"{name:>15}: {secs * 1000:9.1f} ms  {size / 1024:10.1f} KiB  ({rows} requests)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
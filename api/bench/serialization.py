@@ -0,0 +1,146 @@
+"""Per-row cost of list serialization: FastAPI's response_model path vs the one-pass path.
+
+No database needed; rows are built in memory. Usage (from api/):
+
+    python -m bench.serialization --rows 10000 100000 --repeat 3
+
+"old" is what the list routes used to do: `Schema.model_validate` per row, then FastAPI's
+`serialize_response` (dump, re-validate, jsonable_encoder) and `json.dumps`. "new" is
+`app.utils.serialization.list_response`. Both bodies are checked to decode to the same JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team import Team
+from app.models.user import User, UserRole
+from app.schemas.equipment import EquipmentOut
+from app.schemas.request import RequestOut
+from app.schemas.team import TeamOut
+from app.schemas.user import UserOut
+from app.utils.serialization import list_response
+
+
+def equipment_rows(n: int) -> list[Equipment]:
+    t0 = datetime(2025, 1, 1)
+    return [
+        Equipment(
+            id=str(uuid.UUID(int=i)),
+            name=f"Equipment {i}",
+            serial_number=f"SN-{i:08d}",
+            category="CNC",
+            department="Production",
+            owner_employee_name="Jane Doe",
+            purchase_date="2024-01-01",
+            warranty_expiry="2027-01-01",
+            location="Hall A",
+            maintenance_team_id=str(uuid.UUID(int=i % 20)),
+            default_technician_id=str(uuid.UUID(int=i % 50)),
+            is_scrapped=False,
+            created_at=t0 + timedelta(minutes=i),
+            updated_at=t0 + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def request_rows(n: int) -> list[MaintenanceRequest]:
+    t0 = datetime(2025, 1, 1)
+    return [
+        MaintenanceRequest(
+            id=str(uuid.UUID(int=i)),
+            type="corrective",
+            subject=f"Request {i}",
+            description="Spindle noise at high RPM " * 4,
+            equipment_id=str(uuid.UUID(int=i % 1000)),
+            equipment_category="CNC",
+            maintenance_team_id=str(uuid.UUID(int=i % 20)),
+            created_by_id=str(uuid.UUID(int=i % 50)),
+            stage="new",
+            created_at=t0 + timedelta(minutes=i),
+            updated_at=t0 + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def team_rows(n: int) -> list[Team]:
+    return [
+        Team(id=str(uuid.UUID(int=i)), name=f"Team {i}", member_ids=[str(uuid.UUID(int=j)) for j in range(i % 8)])
+        for i in range(n)
+    ]
+
+
+def user_rows(n: int) -> list[User]:
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    roles = list(UserRole)
+    return [
+        User(
+            id=str(uuid.UUID(int=i)),
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            role=roles[i % len(roles)],
+            created_at=t0 + timedelta(seconds=i, microseconds=i),
+            updated_at=t0 + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def old_path(rows, schema) -> bytes:
+    field = create_model_field(name="Response", type_=list[schema] | None, mode="serialization")
+    content = [schema.model_validate(r) for r in rows]
+    data = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True))
+    return JSONResponse(data).body
+
+
+def new_path(rows, schema) -> bytes:
+    return list_response(rows, schema, Response()).body
+
+
+def best(fn, repeat: int) -> tuple[float, bytes]:
+    times, body = [], b""
+    for _ in range(repeat):
+        t = time.perf_counter()
+        body = fn()
+        times.append(time.perf_counter() - t)
+    return min(times), body
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    cases = (
+        ("equipment", equipment_rows, EquipmentOut),
+        ("requests", request_rows, RequestOut),
+        ("teams", team_rows, TeamOut),
+        ("users", user_rows, UserOut),
+    )
+    for name, build, schema in cases:
+        for n in args.rows:
+            rows = build(n)
+            old_s, old_body = best(lambda: old_path(rows, schema), args.repeat)
+            new_s, new_body = best(lambda: new_path(rows, schema), args.repeat)
+            assert json.loads(old_body) == json.loads(new_body), "bodies differ"
+            print(
+                f"{name:>9} {n:>7} rows  old {old_s * 1e6 / n:6.2f} us/row  new {new_s * 1e6 / n:6.2f} us/row  "
+                f"x{old_s / new_s:4.1f}  ({len(new_body) / 1e6:.1f} MB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Cold-start breakdown of the API, measured in fresh interpreters.
+
+Usage (from api/, with DATABASE_URL and SECRET_KEY set as for the app):
+
+    python -m bench.startup --runs 5
+    python -m bench.startup --runs 5 --max-import-ms 2500 --max-startup-ms 100 --out startup.json
+
+Each run starts a new interpreter with `-X importtime`, imports app.main and runs its startup
+handlers, then reports the phases recorded by app.core.startup plus the packages and modules
+that took longest to import. "startup" is the time the handlers keep the server from accepting
+requests; background tasks are listed separately. Exits 1 when the median import or startup
+time is over its budget, or when a module in startup.DEFERRED_IMPORTS was imported eagerly.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+MARKER = "-- app.main imported --"
+CHILD = f"""
+import asyncio, json, sys, time
+t = time.perf_counter()
+import app.main
+imported = (time.perf_counter() - t) * 1000
+print("{MARKER}", file=sys.stderr, flush=True)
+from app.core import startup
+eager = [m for m in startup.DEFERRED_IMPORTS if m in sys.modules]
+t = time.perf_counter()
+asyncio.run(app.main.app.router.startup())
+critical = (time.perf_counter() - t) * 1000
+startup.join(120)
+print(json.dumps({{"importMs": imported, "startupMs": critical, "eager": eager, **startup.report()}}))
+"""
+
+
+def importtimes(stderr: str) -> dict[str, int]:
+    """Self time in microseconds per module imported by app.main, from `-X importtime` output."""
+    out = {}
+    for line in stderr.split(MARKER)[0].splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        out[name.strip()] = int(self_us)
+    return out
+
+
+def run_once() -> tuple[dict, dict[str, int]]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-4000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1]), importtimes(proc.stderr)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    ap.add_argument("--max-import-ms", type=float, help="fail when the median import of app.main is slower")
+    ap.add_argument("--max-startup-ms", type=float, help="fail when the median blocking startup is slower")
+    ap.add_argument("--out", help="write the breakdown as JSON")
+    args = ap.parse_args()
+
+    runs, modules = [], defaultdict(list)
+    for _ in range(args.runs):
+        report, times = run_once()
+        runs.append(report)
+        for name, us in times.items():
+            modules[name].append(us)
+
+    def median(key: str) -> float:
+        return round(statistics.median(r[key] for r in runs), 1)
+
+    phases = {name: round(statistics.median(r["phases"].get(name, 0) for r in runs), 1) for name in runs[-1]["phases"]}
+    by_module = {name: statistics.median(v) / 1000 for name, v in modules.items()}
+    by_package = defaultdict(float)
+    for name, ms in by_module.items():
+        by_package[name.split(".")[0]] += ms
+    eager = sorted({m for r in runs for m in r["eager"]})
+    summary = {
+        "runs": args.runs,
+        "importMs": median("importMs"),
+        "startupMs": median("startupMs"),
+        "phases": phases,
+        "packages": {k: round(v, 1) for k, v in sorted(by_package.items(), key=lambda kv: -kv[1])[: args.top]},
+        "modules": {k: round(v, 1) for k, v in sorted(by_module.items(), key=lambda kv: -kv[1])[: args.top]},
+        "eagerDeferredImports": eager,
+    }
+
+    print(f"import app.main: {summary['importMs']:.0f} ms   blocking startup: {summary['startupMs']:.0f} ms")
+    print("\nphases (ms, median):")
+    for name, ms in phases.items():
+        print(f"  {name:<28} {ms:8.1f}")
+    print("\nslowest packages (self time, ms):")
+    for name, ms in summary["packages"].items():
+        print(f"  {name:<28} {ms:8.1f}")
+    print("\nslowest modules (self time, ms):")
+    for name, ms in summary["modules"].items():
+        print(f"  {name:<50} {ms:8.1f}")
+
+    failures = []
+    if args.max_import_ms is not None and summary["importMs"] > args.max_import_ms:
+        failures.append(f"import {summary['importMs']:.0f} ms > {args.max_import_ms:.0f} ms")
+    if args.max_startup_ms is not None and summary["startupMs"] > args.max_startup_ms:
+        failures.append(f"startup {summary['startupMs']:.0f} ms > {args.max_startup_ms:.0f} ms")
+    if eager:
+        failures.append(f"imported at startup but meant to be deferred: {', '.join(eager)}")
+    summary["failures"] = failures
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 #!/usr/bin/env sh
 set -e
 
-echo "Running migrations..."
-alembic upgrade head
+# Skip the full Alembic run when a quick revision probe shows the database is already at head.
+if python -m app.db.migrations; then
+  echo "Database already at head, skipping migrations."
+else
+  echo "Running migrations..."
+  alembic upgrade head
+fi
 
 echo "Starting API..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,90 @@
+"""Settings for the test run: a throwaway SQLite database unless DATABASE_URL is already set.
+
+Tests that need Postgres (e.g. test_query_plans.py) skip themselves on SQLite; tests that create
+and drop tables (the `schema` fixture) skip on anything else.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='gearguard-test-')}/primary.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("INIT_DEMO_DATA", "false")
+
+from contextlib import contextmanager  # noqa: E402
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db import session  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+# Teams keep member_ids in JSONB, which SQLite cannot create; tests using `schema` do not touch them.
+TABLES = [t for t in Base.metadata.sorted_tables if t.name != "teams"]
+
+
+def equipment(name: str) -> dict:
+    """Equipment columns (snake_case, which the API accepts too)."""
+    return {
+        "name": name,
+        "serial_number": name,
+        "category": "CNC",
+        "department": "Production",
+        "owner_employee_name": "Jane Doe",
+        "purchase_date": "2024-01-01",
+        "warranty_expiry": "2027-01-01",
+        "location": "Hall A",
+        "maintenance_team_id": "team",
+        "default_technician_id": "technician",
+    }
+
+
+@pytest.fixture
+def schema():
+    """Empty tables on the SQLite test database."""
+    if session.engine.dialect.name != "sqlite":
+        pytest.skip("recreates tables; runs on the SQLite test database only")
+    Base.metadata.drop_all(session.engine, tables=TABLES)
+    Base.metadata.create_all(session.engine, tables=TABLES)
+
+
+def login(name: str, role: UserRole = UserRole.admin) -> dict:
+    """Authorization header of a new user."""
+    with session.SessionLocal() as db:
+        user = User(name=name, email=f"{name}@gearguard.dev", role=role, password_hash="x")
+        db.add(user)
+        db.commit()
+        return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+@pytest.fixture
+def client(schema):
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin(schema) -> dict:
+    return login("admin")
+
+
+@contextmanager
+def statements():
+    """SQL sent to the primary while the block runs, by either the sync or the async engine."""
+    sent: list[str] = []
+
+    def capture(conn, cursor, statement, *args):
+        sent.append(statement)
+
+    engines = [session.engine] + ([session.async_engine.sync_engine] if session.async_engine else [])
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield sent
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture)
@@ -0,0 +1,37 @@
+"""Principal caching in user_from_token when token claims are trusted (AUTH_TRUST_TOKEN_CLAIMS)."""
+
+import asyncio
+
+from app.api import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud.user import principal_cache
+
+CLAIMS = {"name": "Tech", "email": "tech@gearguard.dev", "role": "technician"}
+
+
+def test_claims_principal_is_not_cached_over_a_concurrent_change(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    principal_cache.invalidate()
+
+    async def trusted_until_changed(db, user_id):
+        # The user is updated (and the cache invalidated) while the claims are being checked.
+        principal_cache.invalidate(user_id)
+        return True
+
+    monkeypatch.setattr(deps, "claims_trusted", trusted_until_changed)
+    user = asyncio.run(deps.user_from_token(None, create_access_token("u1", extra=CLAIMS)))
+    assert user.email == "tech@gearguard.dev"
+    assert principal_cache.get("u1") is None
+
+
+def test_claims_principal_is_cached_otherwise(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    principal_cache.invalidate()
+
+    async def trusted(db, user_id):
+        return True
+
+    monkeypatch.setattr(deps, "claims_trusted", trusted)
+    asyncio.run(deps.user_from_token(None, create_access_token("u2", extra=CLAIMS)))
+    assert principal_cache.get("u2")["role"] == "technician"
@@ -0,0 +1,60 @@
+"""PATCH /requests/batch applies the PUT rules to every request, atomically."""
+
+from app.db import session
+from app.models.request import MaintenanceRequest, RequestType
+
+
+def add_requests(*durations: float | None) -> list[str]:
+    with session.SessionLocal() as db:
+        rows = [
+            MaintenanceRequest(
+                type=RequestType.corrective,
+                subject="Repair",
+                description="Repair",
+                equipment_id="equipment",
+                equipment_category="CNC",
+                maintenance_team_id="team",
+                created_by_id="user",
+                duration_hours=hours,
+            )
+            for hours in durations
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [r.id for r in rows]
+
+
+def state() -> list[tuple[str, float | None]]:
+    with session.SessionLocal() as db:
+        return sorted((r.stage.value, r.duration_hours) for r in db.query(MaintenanceRequest))
+
+
+def test_repaired_keeps_existing_durations_when_omitted(client, admin):
+    ids = add_requests(2.0, 3.5)
+    r = client.patch("/api/v1/requests/batch", json={"ids": ids, "stage": "repaired"}, headers=admin)
+    assert r.status_code == 200
+    assert state() == [("repaired", 2.0), ("repaired", 3.5)]
+
+
+def test_repaired_rejects_an_explicit_null_duration(client, admin):
+    ids = add_requests(2.0, 3.5)
+    payload = {"ids": ids, "stage": "repaired", "durationHours": None}
+    r = client.patch("/api/v1/requests/batch", json=payload, headers=admin)
+    assert r.status_code == 400
+    assert state() == [("new", 2.0), ("new", 3.5)]
+
+
+def test_repaired_needs_a_duration_on_every_request(client, admin):
+    ids = add_requests(2.0, None)
+    r = client.patch("/api/v1/requests/batch", json={"ids": ids, "stage": "repaired"}, headers=admin)
+    assert r.status_code == 400 and ids[1] in r.json()["detail"]
+    r = client.patch("/api/v1/requests/batch", json={"ids": ids, "stage": "repaired", "durationHours": 1}, headers=admin)
+    assert r.status_code == 200
+    assert state() == [("repaired", 1.0), ("repaired", 1.0)]
+
+
+def test_put_rejects_an_explicit_null_duration(client, admin):
+    (rid,) = add_requests(2.0)
+    r = client.put(f"/api/v1/requests/{rid}", json={"stage": "repaired", "durationHours": None}, headers=admin)
+    assert r.status_code == 400
+    assert state() == [("new", 2.0)]
@@ -0,0 +1,47 @@
+"""ETag/Last-Modified on list routes: unpaged lists probe a count, pages validate their own rows."""
+
+from app.db import session
+from app.models.equipment import Equipment
+from tests.conftest import equipment, statements
+
+
+def add_equipment(*names: str) -> None:
+    with session.SessionLocal() as db:
+        db.add_all(Equipment(**equipment(n)) for n in names)
+        db.commit()
+
+
+def selects(client, url: str, headers: dict) -> tuple[object, list[str]]:
+    with statements() as sent:
+        r = client.get(url, headers=headers)
+    return r, [s for s in sent if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_pages_do_not_count_the_filtered_set(client, admin):
+    add_equipment("a", "b", "c")
+    r, statements = selects(client, "/api/v1/equipment?limit=2", admin)
+    assert r.status_code == 200 and len(r.json()["items"]) == 2
+    assert statements and not [s for s in statements if "count(" in s.lower()]
+    assert "last-modified" not in r.headers
+
+    etag = r.headers["etag"]
+    assert client.get("/api/v1/equipment?limit=2", headers=admin | {"If-None-Match": etag}).status_code == 304
+
+    # Editing a row on the page changes the page's validator.
+    item = r.json()["items"][0]
+    assert client.put(f"/api/v1/equipment/{item['id']}", json={"location": "Hall B"}, headers=admin).status_code == 200
+    assert client.get("/api/v1/equipment?limit=2", headers=admin | {"If-None-Match": etag}).status_code == 200
+
+
+def test_unpaged_lists_keep_their_validators(client, admin):
+    add_equipment("a")
+    r = client.get("/api/v1/equipment", headers=admin)
+    assert r.headers["etag"] and r.headers["last-modified"]
+    assert client.get("/api/v1/equipment", headers=admin | {"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_exports_skip_the_validators(client, admin):
+    add_equipment("a")
+    r, statements = selects(client, "/api/v1/equipment?stream=ndjson", admin)
+    assert r.status_code == 200 and "etag" not in r.headers
+    assert statements and not [s for s in statements if "count(" in s.lower()]
@@ -0,0 +1,25 @@
+"""The in-flight gauge counts requests per route template, resolved after routing."""
+
+from app.core import metrics
+from app.crud import equipment as crud_equipment
+
+ROUTE = "/api/v1/public/equipment/{equipment_id}"
+
+
+def in_flight(route: str) -> str | None:
+    prefix = f'gearguard_http_requests_in_flight{{route="{route}"}} '
+    return next((line[len(prefix):] for line in metrics.registry.render().splitlines() if line.startswith(prefix)), None)
+
+
+def test_in_flight_is_labeled_by_route(client, monkeypatch):
+    seen = []
+
+    def get_stamp(db, equipment_id):
+        seen.append(in_flight(ROUTE))  # scraped while the request is being served
+        return None
+
+    monkeypatch.setattr(crud_equipment, "get_stamp", get_stamp)
+    assert client.get("/api/v1/public/equipment/some-id").status_code == 404
+    assert seen == ["1"]
+    assert in_flight(ROUTE) == "0"
+    assert in_flight("unmatched") in (None, "0")
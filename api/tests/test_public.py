@@ -0,0 +1,25 @@
+"""Public QR route: a revalidation costs one narrow probe, not a full row load or a render."""
+
+from app.db import session
+from app.models.equipment import Equipment
+from tests.conftest import equipment, statements
+
+
+def test_qr_revalidation_skips_the_row_load(client):
+    with session.SessionLocal() as db:
+        eq = Equipment(**equipment("qr"))
+        db.add(eq)
+        db.commit()
+        url = f"/api/v1/public/equipment/{eq.id}/qr?format=svg"
+
+    r = client.get(url)
+    assert r.status_code == 200 and r.content.startswith(b"<")
+
+    with statements() as sent:
+        r = client.get(url, headers={"If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
+    assert len(sent) == 1 and "serial_number" not in sent[0]
+
+
+def test_qr_of_missing_equipment_is_404(client):
+    assert client.get("/api/v1/public/equipment/missing/qr").status_code == 404
@@ -0,0 +1,66 @@
+"""Every filter combination of the list and search routes is planned without sequential scans of
+large tables (bench/plans.py). The EXPLAIN check needs DATABASE_URL pointing at Postgres migrated
+to head; a database with too little data is seeded with a bench fleet, so use a scratch database."""
+
+import pytest
+
+from app.db.session import SessionLocal, engine
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest
+from app.models.team_member import TeamMember
+from bench import fleet, plans
+
+MIN_ROWS = 10_000
+SEED = dict(equipment=50_000, requests=300_000)
+SAMPLE = dict.fromkeys(("equipment_id", "team_id", "technician", "category", "department"), "sample")
+
+postgres_only = pytest.mark.skipif(engine.dialect.name != "postgresql", reason="query plans are checked on Postgres")
+
+
+@pytest.fixture(scope="module")
+def db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@postgres_only
+def test_no_sequential_scans(db):
+    if min(plans.table_sizes(db).values()) < MIN_ROWS:
+        try:
+            fleet.seed(db, **SEED)
+        except ValueError as e:
+            pytest.skip(f"fewer than {MIN_ROWS} rows and cannot seed: {e}")
+    checked, failures = plans.check(db, MIN_ROWS)
+    assert checked
+    assert not failures, f"{len(failures)} of {checked} plans scan a large table:\n\n" + "\n\n".join(failures)
+
+
+@postgres_only
+def test_active_equipment_pages_use_the_partial_index(db):
+    # The status=active filter must match the index predicate (`is_scrapped = false`) exactly.
+    if plans.table_sizes(db)["equipment"] < MIN_ROWS:
+        pytest.skip(f"fewer than {MIN_ROWS} equipment rows")
+    for label, fn, kwargs, index in plans.required_indexes():
+        assert index in plans.used_indexes(db, fn, **kwargs), label
+
+
+def test_cases_cover_every_route(db):
+    if engine.dialect.name != "postgresql":
+        tables = [m.__table__ for m in (Equipment, MaintenanceRequest, TeamMember)]
+        Equipment.metadata.create_all(engine, tables=tables)
+    cases = list(plans.cases(SAMPLE))
+    routes = {label.split("?")[0] for label, *_ in cases}
+    assert routes == {
+        "GET /requests", "GET /requests (validators)", "GET /requests/search", "GET /requests/calendar",
+        "GET /equipment", "GET /equipment (validators)", "GET /equipment/search",
+        "GET /me/queue", "GET /requests/{id}", "GET /equipment/{id}", "expand=requests",
+    }
+    # Unpaged lists without a selective filter are explained too, not skipped.
+    assert any(label == "GET /requests" and "equipment_id" not in kwargs for label, _, kwargs, _ in cases)
+    assert sum(label == "GET /equipment" for label, *_ in cases) == 8 * 3
+    for label, fn, kwargs, _ in cases:
+        assert plans.captured(db, fn, **kwargs), label
+        db.rollback()
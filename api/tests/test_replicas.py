@@ -0,0 +1,102 @@
+"""Read routing, read-your-writes pinning and failover, with two SQLite files standing in for the
+primary (DATABASE_URL) and a replica."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import async_url, settings
+from app.db import session
+from app.db.base import Base
+from app.db.replicas import PIN_COOKIE, PIN_HEADER, Replica
+from app.main import app
+from app.models.equipment import Equipment
+from tests.conftest import TABLES, equipment, login
+
+
+def make_replica(url: str) -> Replica:
+    # As app.db.session builds them, with the async engine when DB_ASYNC is set.
+    return Replica("replica", create_engine(url), create_async_engine(async_url(url)) if settings.DB_ASYNC else None)
+
+
+@pytest.fixture
+def replica(schema, tmp_path, monkeypatch):
+    replica = make_replica(f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(replica.engine, tables=TABLES)
+    with replica.sessionmaker() as db:
+        db.add(Equipment(**equipment("on-replica")))
+        db.commit()
+    monkeypatch.setattr(session.replicas, "replicas", [replica])
+    monkeypatch.setattr(session.replicas, "_start", lambda: None)  # no health-check thread
+    monkeypatch.setattr(session.replicas, "failovers", 0)
+    monkeypatch.setattr(session.replicas, "pinned_reads", 0)
+    yield replica
+    replica.engine.dispose()
+
+
+def names(client: TestClient, headers: dict) -> list[str]:
+    r = client.get("/api/v1/equipment", headers=headers)
+    assert r.status_code == 200
+    return sorted(e["name"] for e in r.json())
+
+
+def test_reads_go_to_the_replica(replica):
+    auth = login("reader")
+    assert names(TestClient(app), auth) == ["on-replica"]
+    # Writes always go to the primary.
+    assert TestClient(app).post("/api/v1/equipment", json=equipment("on-primary"), headers=auth).status_code == 200
+    with session.SessionLocal() as db:
+        assert [e.name for e in db.query(Equipment)] == ["on-primary"]
+
+
+def test_a_write_pins_the_writers_reads_in_any_worker(replica):
+    auth = login("writer")
+    client = TestClient(app)
+    r = client.post("/api/v1/equipment", json=equipment("on-primary"), headers=auth)
+    assert r.status_code == 200
+    token = r.headers[PIN_HEADER]
+    assert r.cookies[PIN_COOKIE] == token
+
+    # The cookie comes back on the client's next read...
+    assert names(client, auth) == ["on-primary"]
+    # ...and the header pins a client without cookies; nothing is kept server-side.
+    assert names(TestClient(app), auth | {PIN_HEADER: token}) == ["on-primary"]
+    assert names(TestClient(app), auth) == ["on-replica"]
+    assert session.replicas.stats()["pinnedReads"] == 2
+
+
+def test_the_pin_is_bound_to_its_user_and_signed(replica):
+    writer, other = login("writer"), login("other")
+    token = TestClient(app).post("/api/v1/equipment", json=equipment("on-primary"), headers=writer).headers[PIN_HEADER]
+    until, _, signature = token.partition(".")
+
+    assert names(TestClient(app), other | {PIN_HEADER: token}) == ["on-replica"]
+    assert names(TestClient(app), writer | {PIN_HEADER: f"{int(until) + 3600}.{signature}"}) == ["on-replica"]
+    assert names(TestClient(app), writer | {PIN_HEADER: f"{int(until) - 3600}.{signature}"}) == ["on-replica"]
+
+
+def test_failed_requests_do_not_pin(replica):
+    auth = login("writer")
+    r = TestClient(app).post("/api/v1/equipment", json={"name": ""}, headers=auth)
+    assert r.status_code == 422
+    assert PIN_HEADER not in r.headers
+
+
+def test_a_dead_replica_fails_over_to_the_primary(replica, tmp_path, monkeypatch):
+    auth = login("reader")
+    TestClient(app).post("/api/v1/equipment", json=equipment("on-primary"), headers=auth)
+    # A database file in a directory that does not exist cannot be opened.
+    dead = make_replica(f"sqlite:///{tmp_path}/missing/replica.db")
+    monkeypatch.setattr(session.replicas, "replicas", [dead])
+
+    assert names(TestClient(app), auth) == ["on-primary"]
+    assert not dead.healthy and dead.error
+    assert session.replicas.failovers == 1
+    # Skipped without another connection attempt until a health check passes.
+    assert names(TestClient(app), auth) == ["on-primary"]
+    assert session.replicas.failovers == 1
+
+    (tmp_path / "missing").mkdir()
+    session.replicas.check_all()
+    assert dead.healthy and dead.error is None
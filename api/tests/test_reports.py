@@ -0,0 +1,37 @@
+"""Report query parameters are camelCase, like the rest of the API."""
+
+from app.db import session
+from app.models.request import MaintenanceRequest, RequestType
+
+
+def add_requests(*rows: tuple[str, str, float]) -> None:
+    with session.SessionLocal() as db:
+        db.add_all(
+            MaintenanceRequest(
+                type=RequestType.corrective,
+                subject="Repair",
+                description="Repair",
+                equipment_id="equipment",
+                equipment_category=category,
+                maintenance_team_id=team,
+                created_by_id="user",
+                duration_hours=hours,
+            )
+            for team, category, hours in rows
+        )
+        db.commit()
+
+
+def test_counts_take_group_by_and_team_id(client, admin):
+    add_requests(("t1", "CNC", 1), ("t1", "CNC", 2), ("t1", "Pump", 3), ("t2", "HVAC", 4))
+    r = client.get("/api/v1/reports/requests/counts?groupBy=category&teamId=t1", headers=admin)
+    assert r.status_code == 200
+    assert r.json() == {"groupBy": "category", "keys": ["CNC", "Pump"], "counts": [2, 1]}
+
+
+def test_durations_and_timeseries_take_team_id(client, admin):
+    add_requests(("t1", "CNC", 1), ("t1", "CNC", 3), ("t2", "HVAC", 4))
+    r = client.get("/api/v1/reports/requests/durations?groupBy=category&teamId=t1", headers=admin).json()
+    assert (r["groupBy"], r["keys"], r["counts"], r["avg"]) == ("category", ["CNC"], [2], [2.0])
+    r = client.get("/api/v1/reports/requests/timeseries?teamId=t2", headers=admin).json()
+    assert sum(r["counts"]) == 1
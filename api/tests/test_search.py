@@ -0,0 +1,50 @@
+"""Search snippets are HTML: stored text is escaped, only the <mark> tags are markup."""
+
+from app.crud import search as search_
+from app.db import session
+from app.models.equipment import Equipment
+from app.models.request import MaintenanceRequest, RequestType
+from tests.conftest import equipment
+
+SCRIPT = '<script>alert("x")</script> hydraulic leak under <b>press</b> & pump'
+
+
+def add_request(description: str) -> None:
+    with session.SessionLocal() as db:
+        eq = Equipment(**equipment('<img src=x onerror="alert(1)"> leak tester'))
+        db.add(eq)
+        db.flush()
+        db.add(
+            MaintenanceRequest(
+                type=RequestType.corrective,
+                subject="Leak",
+                description=description,
+                equipment_id=eq.id,
+                equipment_category=eq.category,
+                maintenance_team_id="team",
+                created_by_id="user",
+            )
+        )
+        db.commit()
+
+
+def test_request_snippets_escape_the_description(client, admin):
+    add_request(SCRIPT)
+    hits = client.get("/api/v1/requests/search?search=leak", headers=admin).json()
+    snippet = hits[0]["snippet"]
+    assert "<script" not in snippet and "<b>" not in snippet
+    assert "&lt;script&gt;" in snippet and "&amp; pump" in snippet
+    assert "<mark>leak</mark>" in snippet
+
+
+def test_equipment_snippets_escape_the_name(client, admin):
+    add_request("leak")
+    snippet = client.get("/api/v1/equipment/search?search=leak", headers=admin).json()[0]["snippet"]
+    assert snippet == "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>leak</mark> tester"
+
+
+def test_postgres_headlines_are_escaped():
+    # ts_headline output: the raw description with hits between the private-use markers.
+    raw = f"<script>x</script> hydraulic {search_.HEADLINE_START}leak{search_.HEADLINE_STOP} & more"
+    assert search_.headline(raw) == "&lt;script&gt;x&lt;/script&gt; hydraulic <mark>leak</mark> &amp; more"
+    assert search_.headline("<script>no hit</script>") is None